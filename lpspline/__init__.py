@@ -5,6 +5,9 @@ from .spline import PiecewiseLinear as pwl
 from .spline import BSpline as bs
 from .spline import CyclicSpline as cs
 from .spline import Factor as f
+from .spline import CrossedFactor as cf
 from .spline import Constant as c
+from .spline import TensorSpline as te
+from .spline import StepSpline as st
 
 from .link import Link, Log, Sigmoid, Exp
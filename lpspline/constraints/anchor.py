@@ -1,7 +1,7 @@
-import cvxpy as cp
 import numpy as np
-from typing import List
-from .base import Constraint
+import scipy.sparse as sp
+from typing import List, Tuple
+from .base import Constraint, _by_blocks
 
 class Anchor(Constraint):
     """
@@ -31,9 +31,9 @@ class Anchor(Constraint):
                 raise ValueError("Each point must be a tuple of (x, y)")
             
 
-    def build_constraint(self, s) -> list:
+    def build_matrix(self, s) -> Tuple[sp.csr_matrix, np.ndarray, np.ndarray]:
         """
-        Constructs CVXPY equality conditions restricting basis sums at anchoring points.
+        Constructs the stacked equality system `basis(x) @ v == y` over all anchoring points and classes.
 
         Parameters
         ----------
@@ -42,17 +42,25 @@ class Anchor(Constraint):
 
         Returns
         -------
-        list
-            A list specifying `basis @ variable == y` strict equalities.
+        Tuple[sp.csr_matrix, np.ndarray, np.ndarray]
+            The anchoring basis rows, one block per `by` class, with equal lower and upper bounds.
         """
-        constraints = []
         basis = s._build_basis(np.array([x for x, _ in self.xy]))
-        variables = s._build_variables()
-        M = len(s._by_classes) if getattr(s, 'by', None) is not None else 1
-        
-        for c in range(M):
-            v_chunk = variables[:, c] if getattr(s, 'by', None) is not None else variables
-            for i in range(len(self.xy)):
-                constraints.append(basis[i] @ v_chunk == self.xy[i][1])
-            
-        return constraints
+        y = np.tile(np.array([y for _, y in self.xy], dtype=float), s.n_by_classes)
+        return _by_blocks(s, basis), y, y.copy()
+
+    def size(self, s) -> int:
+        """
+        Returns the number of anchoring equalities, one per point and `by` class.
+
+        Parameters
+        ----------
+        s : Spline
+            The initialized Spline instance the constraint applies to.
+
+        Returns
+        -------
+        int
+            The number of scalar constraint rows.
+        """
+        return len(self.xy) * s.n_by_classes
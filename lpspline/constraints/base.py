@@ -1,10 +1,43 @@
 import abc
+import numpy as np
+import cvxpy as cp
+import scipy.sparse as sp
+from typing import Tuple
 
 class Constraint(abc.ABC):
     """
     Abstract base class defining the shape constraint interface.
+
+    Constraints are assembled as a single sparse linear system `lower <= A @ vec(coefs) <= upper`
+    over the column-major flattening of the spline coefficients, covering all `by` classes.
+    Subclasses implement `build_matrix`, which every engine uses; subclasses that only override
+    `build_constraint` keep working with the `cvxpy` and `suffstat` engines.
     """
-    @abc.abstractmethod
+    def build_matrix(self, s) -> Tuple[sp.csr_matrix, np.ndarray, np.ndarray]:
+        """
+        Builds the sparse constraint system for the given spline.
+
+        Parameters
+        ----------
+        s : Spline
+            The initialized Spline instance to construct constraints upon.
+
+        Returns
+        -------
+        Tuple[sp.csr_matrix, np.ndarray, np.ndarray]
+            The matrix `A` of shape `(n_rows, n_basis * n_by_classes)` and the row-wise `lower` and
+            `upper` bounds. Missing sides are infinite; equalities have `lower == upper`.
+
+        Raises
+        ------
+        NotImplementedError
+            If the subclass only implements `build_constraint`, as required by the matrix based engines.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not implement build_matrix, required by the qp, irls and backfit engines, "
+            f"the identifiability reparameterization and the time limit fallback. Use engine='cvxpy'."
+        )
+
     def build_constraint(self, s) -> list:
         """
         Builds CVXPY constraints functionally mapping to the given spline structure.
@@ -17,6 +50,217 @@ class Constraint(abc.ABC):
         Returns
         -------
         list
-            A list containing CVXPY constraint objects.
+            At most one stacked equality and one stacked inequality CVXPY constraint.
+        """
+        A, lower, upper = self.build_matrix(s)
+        return _to_cvxpy(A, lower, upper, s._coef_vector())
+
+    def refine(self, s) -> int:
         """
-        pass
+        Adds the rows of a lazily generated constraint violated by the fitted spline.
+
+        Constraints built in full have nothing to add.
+
+        Parameters
+        ----------
+        s : Spline
+            The fitted Spline instance the constraint applies to.
+
+        Returns
+        -------
+        int
+            The number of rows added, 0 when the fitted spline satisfies the constraint.
+        """
+        return 0
+
+    def size(self, s) -> int:
+        """
+        Returns the number of scalar constraint rows `build_constraint` produces.
+
+        The built-in constraints count the rows from the basis dimensions without building them. This
+        default builds the system, so custom constraints used with `plan` on large models should override it.
+
+        Parameters
+        ----------
+        s : Spline
+            The initialized Spline instance the constraint applies to.
+
+        Returns
+        -------
+        int
+            The number of scalar constraint rows across all `by` classes.
+        """
+        try:
+            _, lower, upper = self.build_matrix(s)
+        except NotImplementedError:
+            return int(sum(c.size for c in self.build_constraint(s)))
+        eq = lower == upper
+        return int(eq.sum() + (np.isfinite(lower) & ~eq).sum() + (np.isfinite(upper) & ~eq).sum())
+
+
+def _to_cvxpy(A: sp.csr_matrix, lower: np.ndarray, upper: np.ndarray, v: cp.Expression) -> list:
+    """
+    Converts a sparse constraint system into stacked CVXPY constraints.
+
+    Parameters
+    ----------
+    A : sp.csr_matrix
+        The constraint matrix.
+    lower : np.ndarray
+        Row lower bounds, `-inf` when absent.
+    upper : np.ndarray
+        Row upper bounds, `inf` when absent.
+    v : cp.Expression
+        The flattened coefficient expression.
+
+    Returns
+    -------
+    list
+        At most one equality and one inequality constraint.
+    """
+    constraints = []
+    eq = lower == upper
+    if eq.any():
+        constraints.append(A[eq] @ v == lower[eq])
+    lo = np.isfinite(lower) & ~eq
+    up = np.isfinite(upper) & ~eq
+    if lo.any() or up.any():
+        G = sp.vstack([A[lo], -A[up]], format='csr')
+        h = np.concatenate([lower[lo], -upper[up]])
+        constraints.append(G @ v >= h)
+    return constraints
+
+
+def _by_blocks(s, rows) -> sp.csr_matrix:
+    """
+    Replicates per-class constraint rows over all `by` classes as a block diagonal matrix.
+
+    Parameters
+    ----------
+    s : Spline
+        The spline the rows refer to.
+    rows : array_like
+        Constraint rows over the coefficients of a single class, shape `(n_rows, n_basis)`.
+
+    Returns
+    -------
+    sp.csr_matrix
+        Matrix of shape `(n_rows * n_by_classes, n_basis * n_by_classes)`.
+    """
+    rows = sp.csr_matrix(rows)
+    k = s.n_by_classes
+    if k == 1:
+        return rows
+    return sp.kron(sp.identity(k, format='csr'), rows, format='csr')
+
+
+def _difference_matrix(p: int, order: int) -> sp.csr_matrix:
+    """
+    Returns the sparse finite difference operator of the given order.
+
+    Parameters
+    ----------
+    p : int
+        Number of coefficients.
+    order : int
+        Difference order, 1 for `v[i+1] - v[i]`, 2 for `v[i+2] - 2 v[i+1] + v[i]`.
+
+    Returns
+    -------
+    sp.csr_matrix
+        Matrix of shape `(p - order, p)`.
+    """
+    D = sp.identity(p, format='csr')
+    for _ in range(order):
+        D = (D[1:] - D[:-1]).tocsr()
+    return D
+
+
+def _hat_slope_changes(knots: np.ndarray) -> sp.csr_matrix:
+    """
+    Returns the slope change at every interior knot of a hat basis, whose coefficients are knot values.
+
+    Parameters
+    ----------
+    knots : np.ndarray
+        The sorted unique knots.
+
+    Returns
+    -------
+    sp.csr_matrix
+        Matrix of shape `(len(knots) - 2, len(knots))`; row `j` is the change of slope at knot `j + 1`.
+        It reduces to scaled second differences for evenly spaced knots.
+    """
+    knots = np.asarray(knots, dtype=float)
+    m = len(knots)
+    if m < 3:
+        return sp.csr_matrix((0, m))
+    slopes = sp.diags(1.0 / np.diff(knots)) @ _difference_matrix(m, order=1)
+    return (_difference_matrix(m - 1, order=1) @ slopes).tocsr()
+
+
+def _curvature_rows(s, start: float = None, end: float = None) -> np.ndarray:
+    """
+    Returns the second order rows of one class a convexity or concavity constraint keeps.
+
+    The rows index the second differences of a `BSpline`, the slope changes `_hat_slope_changes` of a
+    hat `PiecewiseLinear`, or its hinge coefficients for the truncated basis.
+
+    Parameters
+    ----------
+    s : Union[BSpline, PiecewiseLinear]
+        The parent Spline applying the restriction.
+    start : float, default=None
+        The domain starting coordinate of the constrained region.
+    end : float, default=None
+        The domain ending coordinate of the constrained region.
+
+    Returns
+    -------
+    np.ndarray
+        The indices of the kept rows.
+    """
+    from ..spline import BSpline
+
+    if isinstance(s, BSpline):
+        n_rows = s.n_basis - 2
+    elif s.basis == "hat":
+        n_rows = max(len(s.basis_knots) - 2, 0)
+    else:
+        n_rows = s.n_basis - 2
+    if start is None or end is None:
+        return np.arange(n_rows)
+    if isinstance(s, BSpline):
+        knots = np.array(s.knots)
+        indices = np.where((knots >= start) & (knots <= end))[0]
+        return indices[indices <= len(knots) - 3]
+    if s.basis == "hat":
+        inner = np.array(s.basis_knots)[1:-1]
+        return np.where((inner >= start) & (inner <= end))[0]
+    knots = np.array(s.knots)
+    return np.where((knots >= start) & (knots <= end))[0]
+
+
+def _inequality(A, lower: float = None, upper: float = None) -> Tuple[sp.csr_matrix, np.ndarray, np.ndarray]:
+    """
+    Pairs a constraint matrix with constant row bounds.
+
+    Parameters
+    ----------
+    A : array_like
+        The constraint matrix.
+    lower : float, default=None
+        Lower bound of every row, None for no bound.
+    upper : float, default=None
+        Upper bound of every row, None for no bound.
+
+    Returns
+    -------
+    Tuple[sp.csr_matrix, np.ndarray, np.ndarray]
+        The constraint system.
+    """
+    A = sp.csr_matrix(A)
+    n = A.shape[0]
+    lo = np.full(n, -np.inf if lower is None else float(lower))
+    up = np.full(n, np.inf if upper is None else float(upper))
+    return A, lo, up
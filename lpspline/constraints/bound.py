@@ -1,13 +1,32 @@
-import cvxpy as cp
 import numpy as np
-from .base import Constraint
+import scipy.sparse as sp
+from typing import Optional, Tuple
+from .base import Constraint, _by_blocks, _inequality
+
+MODES = ("auto", "grid", "exact", "sufficient")
+
 
 class Bound(Constraint):
     """
-    Constraint enforcing lower and upper bounds on the spline output values
-    using a grid-based discretization approach.
+    Constraint enforcing lower and upper bounds on the spline output values.
+
+    The bound is discretized on a grid, or built from the structure of the basis when requested:
+
+    - `grid` (default): the basis is evaluated on `n` evenly spaced points, approximate with `O(n * p)` rows.
+    - `exact`: piecewise linear splines (`PiecewiseLinear`, degree-1 `BSpline`) are bounded at the knots
+      and interval endpoints only, which is exact.
+    - `sufficient`: B-spline coefficients active on the interval are bounded, one sparse row each.
+      A B-spline lies in the convex hull of its coefficients, so the bound holds but may be tighter
+      than needed. For a `StepSpline` the coefficients are the bin values, so this is exact.
+    - `auto`: `exact` for piecewise linear splines, `sufficient` for periodic B-splines, `grid` otherwise.
+
+    Grid bounds can be generated lazily: the model is first solved with a coarse subset of the grid, then
+    the fitted spline is evaluated on the full grid and only the violated points are added before solving
+    again, until the grid is feasible. The active points are kept on the constraint, so a refit starts
+    from them.
     """
-    def __init__(self, lower: float = None, upper: float = None, n: int = 100, start: float = None, end: float = None):
+    def __init__(self, lower: float = None, upper: float = None, n: int = 100, start: float = None, end: float = None,
+                 mode: str = "grid", lazy: bool = False, tol: float = 1e-6):
         """
         Initialize the Bound constraint.
 
@@ -23,16 +42,46 @@ class Bound(Constraint):
             The domain starting coordinate to bound the constraint enforcement region.
         end : float, default=None
             The domain ending coordinate for the constraint region.
+        mode : str, default="grid"
+            How the bound is built, trading tightness for speed: `grid`, `exact`, `sufficient` or `auto`.
+        lazy : bool, default=False
+            Whether grid bounds are generated lazily from the violated grid points. Ignored by the other modes.
+        tol : float, default=1e-6
+            Violation above which a lazy grid point is added to the active set.
+
+        Raises
+        ------
+        ValueError
+            If the mode is unknown.
         """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}'. Available modes: {MODES}")
         self.lower = lower
         self.upper = upper
         self.n = n
         self.start = start
         self.end = end
+        self.mode = mode
+        self.lazy = lazy
+        self.tol = tol
+        self._active = None
+
+    @property
+    def active(self) -> Optional[np.ndarray]:
+        """
+        Returns the grid points of a lazy bound currently enforced.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The sorted indices of the active points in the grid of `n` points, or None before the
+            first fit or if the bound is not lazy.
+        """
+        return getattr(self, '_active', None)
 
-    def build_constraint(self, s) -> list:
+    def build_matrix(self, s) -> Tuple[sp.csr_matrix, np.ndarray, np.ndarray]:
         """
-        Constructs the CVXPY bound constraints by evaluating the spline basis on a grid.
+        Constructs the bound system for all classes at once.
 
         Parameters
         ----------
@@ -41,39 +90,208 @@ class Bound(Constraint):
 
         Returns
         -------
-        list
-            A list containing CVXPY constraint objects.
-        """
-        from ..spline import BSpline, PiecewiseLinear, CyclicSpline, Linear
-        
-        # Determine the default domain range for the grid
-        if isinstance(s, BSpline):
-            x_min_default, x_max_default = np.min(s.knots), np.max(s.knots) # TODO This is a proxy of spline domain, to improve
-        elif isinstance(s, PiecewiseLinear):
-            x_min_default, x_max_default = np.min(s.knots), np.max(s.knots) # TODO This is a proxy of spline domain, to improve
-        elif isinstance(s, CyclicSpline):
-            x_min_default, x_max_default = 0, s.period
+        Tuple[sp.csr_matrix, np.ndarray, np.ndarray]
+            The bounded rows, one block per `by` class, with the requested lower and upper bounds.
+
+        Raises
+        ------
+        ValueError
+            If the spline type or the mode is not supported for this spline.
+        """
+        mode = self._resolve_mode(s)
+        if mode == "sufficient":
+            rows = sp.identity(s.n_basis, format='csr')[self._active_coefficients(s)]
         else:
+            rows = s._build_basis(self._points(s, mode))
+        return _inequality(_by_blocks(s, rows), lower=self.lower, upper=self.upper)
+
+    def size(self, s) -> int:
+        """
+        Returns the number of bounded rows across all `by` classes, counted from the points or coefficients.
+
+        Parameters
+        ----------
+        s : Spline
+            The initialized Spline instance the constraint applies to.
+
+        Returns
+        -------
+        int
+            The number of scalar constraint rows, two per point for a two-sided bound.
+
+        Raises
+        ------
+        ValueError
+            If the spline type or the mode is not supported for this spline.
+        """
+        mode = self._resolve_mode(s)
+        n_rows = len(self._active_coefficients(s)) if mode == "sufficient" else len(self._points(s, mode))
+        if self.lower is not None and self.upper is not None and self.lower != self.upper:
+            n_rows *= 2
+        elif self.lower is None and self.upper is None:
+            n_rows = 0
+        return n_rows * s.n_by_classes
+
+    def _points(self, s, mode: str) -> np.ndarray:
+        """
+        Returns the points where the spline value is bounded in the `exact` and `grid` modes.
+
+        Parameters
+        ----------
+        s : Spline
+            The parent Spline applying this restriction.
+        mode : str
+            The resolved mode, `exact` or `grid`.
+
+        Returns
+        -------
+        np.ndarray
+            The interval endpoints and inner knots (`exact`), or the active grid points (`grid`).
+        """
+        x_min, x_max = self._domain(s)
+        if mode == "exact":
+            knots = np.asarray(getattr(s, 'basis_knots', s.knots), dtype=float)
+            return np.unique(np.concatenate([[x_min, x_max], knots[(knots > x_min) & (knots < x_max)]]))
+        points = np.linspace(x_min, x_max, self.n)
+        if getattr(self, 'lazy', False):
+            points = points[self._active_points()]
+        return points
+
+    def refine(self, s) -> int:
+        """
+        Adds the grid points where the fitted spline violates the bound to the active set.
+
+        Parameters
+        ----------
+        s : Spline
+            The fitted Spline instance the constraint applies to.
+
+        Returns
+        -------
+        int
+            The number of grid points added, 0 if the bound is not lazy or holds on the whole grid.
+        """
+        if not getattr(self, 'lazy', False) or self._resolve_mode(s) != "grid" or s.coefficients is None:
+            return 0
+        x_min, x_max = self._domain(s)
+        values = np.reshape(s.eval(np.linspace(x_min, x_max, self.n)), (self.n, -1))
+        violated = np.zeros(self.n, dtype=bool)
+        if self.lower is not None:
+            violated |= np.any(values < self.lower - self.tol, axis=1)
+        if self.upper is not None:
+            violated |= np.any(values > self.upper + self.tol, axis=1)
+        active = self._active_points()
+        added = np.setdiff1d(np.flatnonzero(violated), active)
+        self._active = np.union1d(active, added)
+        return len(added)
+
+    def _active_points(self) -> np.ndarray:
+        """
+        Returns the active grid points, starting from a coarse evenly spaced subset.
+
+        Returns
+        -------
+        np.ndarray
+            The sorted indices of the enforced points in the grid of `n` points.
+        """
+        active = getattr(self, '_active', None)
+        if active is None or (len(active) and active.max() >= self.n):
+            active = np.unique(np.linspace(0, self.n - 1, max(2, self.n // 10)).astype(int))
+            self._active = active
+        return active
+
+    def _resolve_mode(self, s) -> str:
+        """
+        Resolves `auto` and checks the mode is available for the spline.
+
+        Parameters
+        ----------
+        s : Spline
+            The parent Spline applying this restriction.
+
+        Returns
+        -------
+        str
+            `grid`, `exact` or `sufficient`.
+        """
+        from ..spline import BSpline, PiecewiseLinear, CyclicSpline, StepSpline
+
+        if not isinstance(s, (BSpline, PiecewiseLinear, CyclicSpline, StepSpline)):
             raise ValueError(f"Bound constraint not supported for spline of type '{type(s).__name__}'")
+        mode = getattr(self, 'mode', "grid")
+        if isinstance(s, StepSpline):
+            return "grid" if mode == "grid" else "sufficient"
+        piecewise_linear = isinstance(s, PiecewiseLinear) or (isinstance(s, BSpline) and s.degree == 1)
+        b_spline = isinstance(s, BSpline) or (isinstance(s, CyclicSpline) and s.basis == "bspline")
+
+        if mode == "auto":
+            if piecewise_linear:
+                return "exact"
+            return "sufficient" if isinstance(s, CyclicSpline) and b_spline else "grid"
+        if mode == "exact" and not piecewise_linear:
+            raise ValueError(f"Bound mode 'exact' requires a piecewise linear spline, got '{type(s).__name__}'.")
+        if mode == "sufficient" and not piecewise_linear and not b_spline:
+            raise ValueError(f"Bound mode 'sufficient' requires a B-spline or piecewise linear spline, got '{type(s).__name__}'.")
+        if mode == "sufficient" and isinstance(s, PiecewiseLinear):
+            return "exact"
+        return mode
+
+    def _domain(self, s) -> Tuple[float, float]:
+        """
+        Returns the interval the bound applies to.
+
+        Parameters
+        ----------
+        s : Spline
+            The parent Spline applying this restriction.
+
+        Returns
+        -------
+        Tuple[float, float]
+            `start` and `end` when provided, the knot range or the period otherwise.
+        """
+        from ..spline import CyclicSpline, StepSpline
+
+        if isinstance(s, CyclicSpline):
+            x_min_default, x_max_default = 0, s.period
+        elif isinstance(s, StepSpline):
+            x_min_default, x_max_default = np.min(s.edges), np.max(s.edges)
+        else:
+            knots = getattr(s, 'basis_knots', s.knots)
+            x_min_default, x_max_default = np.min(knots), np.max(knots) # TODO This is a proxy of spline domain, to improve
 
-        # Use explicitly provided start/end if available
         x_min = self.start if self.start is not None else x_min_default
         x_max = self.end if self.end is not None else x_max_default
+        return x_min, x_max
+
+    def _active_coefficients(self, s) -> np.ndarray:
+        """
+        Returns the B-spline coefficients (or bins) whose basis functions are non-zero on the interval.
+
+        Parameters
+        ----------
+        s : Union[BSpline, CyclicSpline, StepSpline]
+            B-spline or step component.
+
+        Returns
+        -------
+        np.ndarray
+            The sorted coefficient indices.
+        """
+        from ..spline import CyclicSpline, StepSpline
+
+        if isinstance(s, StepSpline):
+            x_min, x_max = self._domain(s)
+            bins = s.bin_index(np.array([x_min, x_max]))
+            return np.arange(bins[0], bins[1] + 1)
+
+        if isinstance(s, CyclicSpline):
+            K, d = s.n_basis, s.degree
+            cells = s._support_cells(self.start, self.end)
+            return np.unique(np.mod(cells[:, None] - d + np.arange(d + 1), K).ravel())
 
-        grid = np.linspace(x_min, x_max, self.n)
-        basis = s._build_basis(grid)
-        variables = s._build_variables()
-        
-        constraints = []
-        M = len(s._by_classes) if (getattr(s, 'by', None) is not None and s._by_classes is not None) else 1
-        
-        for c in range(M):
-            v_chunk = variables[:, c] if (M > 1) else variables
-            expr = basis @ v_chunk
-            
-            if self.lower is not None:
-                constraints.append(expr >= self.lower)
-            if self.upper is not None:
-                constraints.append(expr <= self.upper)
-                
-        return constraints
+        # basis j is supported on [t_j, t_{j+degree+1}] of the padded knots
+        x_min, x_max = self._domain(s)
+        t = s._pad_knots(np.asarray(s.knots, dtype=float), s.degree)
+        j = np.arange(s.n_basis)
+        return j[(t[j] <= x_max) & (t[j + s.degree + 1] >= x_min)]
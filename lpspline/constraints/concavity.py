@@ -1,6 +1,7 @@
-import cvxpy as cp
 import numpy as np
-from .base import Constraint
+import scipy.sparse as sp
+from typing import Tuple
+from .base import Constraint, _by_blocks, _curvature_rows, _difference_matrix, _hat_slope_changes, _inequality
 
 class Concave(Constraint):
     """
@@ -21,9 +22,9 @@ class Concave(Constraint):
         self.start = start
         self.end = end
 
-    def build_constraint(self, s) -> list:
+    def build_matrix(self, s) -> Tuple[sp.csr_matrix, np.ndarray, np.ndarray]:
         """
-        Constructs the appropriate CVXPY concave formulations according to the basis type.
+        Constructs the appropriate concavity system according to the basis type.
 
         Parameters
         ----------
@@ -32,28 +33,53 @@ class Concave(Constraint):
 
         Returns
         -------
-        list
-            A sequence containing formulation rules as CVXPY boolean expressions.
+        Tuple[sp.csr_matrix, np.ndarray, np.ndarray]
+            Second order rows, one block per `by` class, with the negative sign enforced.
 
         Raises
         ------
         NotImplementedError
             If the supplied Spline instance functionally lacks concavity restrictions.
         """
-        from ..spline import Linear, PiecewiseLinear, BSpline
-        
-        variables = s._build_variables()
+        from ..spline import PiecewiseLinear, BSpline
 
         if isinstance(s, BSpline):
-            return self._constraint_BSpline(s)
+            rows = self._matrix_BSpline(s)
         elif isinstance(s, PiecewiseLinear):
-            return self._constraint_PiecewiseLinear(s)
+            rows = self._matrix_PiecewiseLinear(s)
         else:
-            raise NotImplementedError(f"Concavity constraint not implemented for spline type '{type(s).__name__}'")    
+            raise NotImplementedError(f"Concavity constraint not implemented for spline type '{type(s).__name__}'")
 
-    def _constraint_BSpline(self, s):
+        return _inequality(_by_blocks(s, rows), upper=0)
+
+    def size(self, s) -> int:
         """
-        Bounds sequential B-Splines evaluating directly on the recursive knot control points natively.
+        Returns the number of second order rows across all `by` classes, counted from the basis dimensions.
+
+        Parameters
+        ----------
+        s : Spline
+            The initialized Spline instance the constraint applies to.
+
+        Returns
+        -------
+        int
+            The number of scalar constraint rows.
+
+        Raises
+        ------
+        NotImplementedError
+            If the supplied Spline instance functionally lacks concavity restrictions.
+        """
+        from ..spline import PiecewiseLinear, BSpline
+
+        if not isinstance(s, (BSpline, PiecewiseLinear)):
+            raise NotImplementedError(f"Concavity constraint not implemented for spline type '{type(s).__name__}'")
+        return len(_curvature_rows(s, self.start, self.end)) * s.n_by_classes
+
+    def _matrix_BSpline(self, s) -> sp.csr_matrix:
+        """
+        Builds the second differences of the B-spline control points.
 
         Parameters
         ----------
@@ -62,31 +88,16 @@ class Concave(Constraint):
 
         Returns
         -------
-        list
-            Resultant list enforcing sequential second-order numerical negative bounds.
+        sp.csr_matrix
+            One second difference row per constrained control point triplet of one class.
         """
-        variables = s._build_variables()
-        constraints = []
-        M = len(s._by_classes) if s.by is not None else 1
-        dim_base = len(s.knots) + s.degree - 1
-
-        for c in range(M):
-            v_chunk = variables[:, c] if s.by is not None else variables
-            if self.start is not None and self.end is not None:
-                knots = np.array(s.knots)
-                indices = np.where((knots >= self.start) & (knots <= self.end))[0]
-                max_idx = len(knots) - 3
-                indices = indices[indices <= max_idx]
-                
-                if len(indices) > 0:
-                    constraints.extend([v_chunk[indices+2] - 2 * v_chunk[indices+1] + v_chunk[indices] <= 0])
-            else:
-                constraints.extend([v_chunk[2:] - 2 * v_chunk[1:-1] + v_chunk[:-2] <= 0])
-        return constraints
-
-    def _constraint_PiecewiseLinear(self, s):
+        return _difference_matrix(s.n_basis, order=2)[_curvature_rows(s, self.start, self.end)]
+
+    def _matrix_PiecewiseLinear(self, s) -> sp.csr_matrix:
         """
-        Enforces piecewise linear negative second differences tracking changes in slopes natively.
+        Selects the hinge coefficients, i.e. the slope changes at the knots.
+
+        For the hat basis the slope changes are the weighted second differences of the knot values.
 
         Parameters
         ----------
@@ -95,22 +106,10 @@ class Concave(Constraint):
 
         Returns
         -------
-        list
-            Formulations targeting piecewise basis differences targeting negative knot adjustments.
+        sp.csr_matrix
+            One row per constrained knot of one class.
         """
-        variables = s._build_variables()
-        constraints = []
-        M = len(s._by_classes) if s.by is not None else 1
-        dim_base = 2 + len(s.knots)
-        
-        for c in range(M):
-            v_chunk = variables[:, c] if s.by is not None else variables
-            if self.start is not None and self.end is not None:
-                knots = np.array(s.knots)
-                indices = np.where((knots >= self.start) & (knots <= self.end))[0]
-                
-                if len(indices) > 0:
-                    constraints.extend([v_chunk[indices+2] <= 0])
-            else:
-                constraints.extend([v_chunk[2:] <= 0])
-        return constraints
+        rows = _curvature_rows(s, self.start, self.end)
+        if s.basis == "hat":
+            return _hat_slope_changes(s.basis_knots)[rows]
+        return sp.identity(s.n_basis, format='csr')[2:][rows]
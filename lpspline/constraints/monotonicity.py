@@ -1,12 +1,13 @@
-import cvxpy as cp
 import numpy as np
-from .base import Constraint
+import scipy.sparse as sp
+from typing import Tuple
+from .base import Constraint, _by_blocks, _difference_matrix, _inequality
 
 class Monotonic(Constraint):
     """
     Monotonicity constraint enforcing strictly non-decreasing or non-increasing slopes.
     """
-    def __init__(self, start: float = None, end: float = None, decreasing: bool = False):
+    def __init__(self, start: float = None, end: float = None, decreasing: bool = False, axis: int = None):
         """
         Initialize the Monotonic constraint.
 
@@ -18,14 +19,18 @@ class Monotonic(Constraint):
             The domain ending coordinate for the constraint region.
         decreasing : bool, default=False
             If True, enforces a monotonically decreasing behavior. Otherwise, non-decreasing.
+        axis : int, default=None
+            For a `TensorSpline`, the marginal (0 or 1) along which the spline is monotonic;
+            `start` and `end` then refer to that feature.
         """
         self.start = start
         self.end = end
         self.decreasing = decreasing
+        self.axis = axis
         
-    def build_constraint(self, s) -> list:
+    def build_matrix(self, s) -> Tuple[sp.csr_matrix, np.ndarray, np.ndarray]:
         """
-        Constructs the appropriate CVXPY monotonic formulations according to the basis type.
+        Constructs the appropriate monotonic slope system according to the basis type.
 
         Parameters
         ----------
@@ -34,124 +39,353 @@ class Monotonic(Constraint):
 
         Returns
         -------
-        list
-            A sequence containing formulation rules as CVXPY boolean expressions.
+        Tuple[sp.csr_matrix, np.ndarray, np.ndarray]
+            Sign adjusted slope rows, one block per `by` class, bounded below by zero.
 
         Raises
         ------
         ValueError
             If the supplied Spline instance is functionally unsupported.
         """
-        from ..spline import Linear, PiecewiseLinear, BSpline
-        variables = s._build_variables()
-        constraints = []
+        from ..spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, TensorSpline, StepSpline
         
         sign = -1 if self.decreasing else 1
         
         if isinstance(s, Linear):
-            return self._constraint_Linear(s=s, sign=sign)
+            rows = self._matrix_Linear(s=s)
             
         elif isinstance(s, PiecewiseLinear):
-            return self._constraint_PiecewiseLinear(s=s, sign=sign)
+            rows = self._matrix_PiecewiseLinear(s=s)
                 
         elif isinstance(s, BSpline):
-            return self._constraint_BSpline(s=s, sign=sign)
+            rows = self._matrix_BSpline(s=s)
+
+        elif isinstance(s, CyclicSpline) and s.basis == "bspline":
+            rows = self._matrix_CyclicSpline(s=s)
+
+        elif isinstance(s, TensorSpline):
+            rows = self._matrix_TensorSpline(s=s)
+
+        elif isinstance(s, StepSpline):
+            rows = self._matrix_StepSpline(s=s)
 
         else:
             raise ValueError(f"Monotonic constraint not supported for spline of type '{type(s).__name__}'")
 
-    def _constraint_Linear(self, s, sign: int):
+        return _inequality(sign * _by_blocks(s, rows), lower=0)
+
+    def size(self, s) -> int:
         """
-        Generates linear derivative slope restrictions evaluating global trend constants natively.
+        Returns the number of slope rows across all `by` classes, counted from the basis dimensions.
+
+        Parameters
+        ----------
+        s : Spline
+            The initialized Spline instance the constraint applies to.
+
+        Returns
+        -------
+        int
+            The number of scalar constraint rows.
+        """
+        return self._n_rows(s) * s.n_by_classes
+
+    def _n_rows(self, s) -> int:
+        """
+        Returns the number of slope rows of one class, mirroring the dispatch of `build_matrix`.
+
+        Parameters
+        ----------
+        s : Spline
+            The parent Spline applying this restriction.
+
+        Returns
+        -------
+        int
+            The number of rows of one class.
+
+        Raises
+        ------
+        ValueError
+            If the supplied Spline instance is functionally unsupported.
+        """
+        from ..spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, TensorSpline, StepSpline
+
+        if isinstance(s, Linear):
+            return 1
+        if isinstance(s, PiecewiseLinear):
+            return len(self._segments_PiecewiseLinear(s))
+        if isinstance(s, BSpline):
+            return len(self._pairs_BSpline(s))
+        if isinstance(s, CyclicSpline) and s.basis == "bspline":
+            return len(self._pairs_CyclicSpline(s))
+        if isinstance(s, TensorSpline):
+            marginal, other = self._tensor_marginals(s)
+            return self._n_rows(marginal) * other.n_basis
+        if isinstance(s, StepSpline):
+            return len(self._edges_StepSpline(s))
+        raise ValueError(f"Monotonic constraint not supported for spline of type '{type(s).__name__}'")
+
+    def _matrix_Linear(self, s) -> sp.csr_matrix:
+        """
+        Selects the slope coefficient of the linear expansion.
 
         Parameters
         ----------
         s : Linear
             Linear spline component to limit.
-        sign : int
-            Slope mapping multiplier.
 
         Returns
         -------
-        list
-            Linear domain formulations bounded by grouping iterations.
+        sp.csr_matrix
+            A single row picking the slope coefficient of one class.
         """
-        variables = s._build_variables()
         slope_idx = 1 if s.bias else 0
-        if getattr(s, '_by_classes', None) is not None:
-            return [sign * variables[slope_idx, :] >= 0]
-        return [sign * variables[slope_idx] >= 0]
+        row = np.zeros((1, s.n_basis))
+        row[0, slope_idx] = 1.0
+        return sp.csr_matrix(row)
 
-    def _constraint_PiecewiseLinear(self, s, sign):
+    def _matrix_PiecewiseLinear(self, s) -> sp.csr_matrix:
         """
-        Enforces piecewise linear monotonic differences utilizing strictly sequential differencing.
+        Builds the cumulative slope rows of the truncated power basis.
+
+        For the hat basis the coefficients are knot values, so the slope signs are their first differences.
+
+        The slope of the segment ending at knot `i` is the sum of the linear coefficient and the hinge
+        coefficients of all previous knots.
 
         Parameters
         ----------
         s : PiecewiseLinear
             Approximation basis component.
-        sign : int
-            Directionality multiplier.
 
         Returns
         -------
-        list
-            Formulations targeting piecewise basis differences tracking knot gaps.
+        sp.csr_matrix
+            One row per constrained segment slope of one class.
         """
-        variables = s._build_variables()
-        constraints = []
-        M = len(s._by_classes) if s.by is not None else 1
-        dim_base = 2 + len(s.knots)
-        
-        for c in range(M):
-            v_chunk = variables[:, c] if s.by is not None else variables
-            if self.start is not None and self.end is not None:
-                knots = np.array(s.knots)
-                indices = np.where((knots >= self.start) & (knots <= self.end))[0]
-                
-                if len(indices) > 0:
-                    for i in indices:
-                        constraints.append(sign * cp.sum(v_chunk[1:i+2]) >= 0)
-            else:
-                constraints.append(sign * v_chunk[1] >= 0)
-                for i in range(2, dim_base):
-                    constraints.append(sign * cp.sum(v_chunk[1:i+1]) >= 0)
-                
-        return constraints
+        segments = self._segments_PiecewiseLinear(s)
+        if s.basis == "hat":
+            return _difference_matrix(s.n_basis, order=1)[segments]
+
+        dim_base = s.n_basis
+        # cumulative[r] sums coefficients 1..r+1: the slope of the segment ending at knot r
+        cumulative = np.zeros((dim_base - 1, dim_base))
+        cumulative[:, 1:] = np.tril(np.ones((dim_base - 1, dim_base - 1)))
+        return sp.csr_matrix(cumulative[segments])
+
+    def _segments_PiecewiseLinear(self, s) -> np.ndarray:
+        """
+        Returns the constrained segments of a piecewise linear spline.
+
+        Parameters
+        ----------
+        s : PiecewiseLinear
+            Approximation basis component.
+
+        Returns
+        -------
+        np.ndarray
+            The indices of the constrained segment slopes, all `n_basis - 1` without `start` and `end`.
+        """
+        if self.start is None or self.end is None:
+            return np.arange(s.n_basis - 1)
+        if s.basis == "hat":
+            # as for the truncated basis, constrain the segments ending at the selected knots
+            knots = np.array(s.basis_knots)
+            indices = np.where((knots >= self.start) & (knots <= self.end))[0]
+            return np.unique(np.clip(indices - 1, 0, s.n_basis - 2))
+        knots = np.array(s.knots)
+        return np.where((knots >= self.start) & (knots <= self.end))[0]
 
-    def _constraint_BSpline(self, s, sign):
+    def _matrix_BSpline(self, s) -> sp.csr_matrix:
         """
-        Bounds sequential B-Splines evaluating directly on the recursive knot control points natively.
+        Builds the first differences of the B-spline control points.
 
         Parameters
         ----------
         s : BSpline
             B-spline formulation component.
-        sign : int
-            Direction factor logic sign.
 
         Returns
         -------
-        list
-            Resultant lists expressing bounds sequentially matching sequential control constraints.
+        sp.csr_matrix
+            One difference row per constrained pair of control points of one class.
         """
-        variables = s._build_variables()
-        constraints = []
-        M = len(s._by_classes) if s.by is not None else 1
-        dim_base = len(s.knots) + s.degree - 1
-        
-        for c in range(M):
-            # Select variables for current group spline
-            v_chunk = variables[:, c] if s.by is not None else variables
-
-            if self.start is not None and self.end is not None:
-                knots = np.array(s.knots)
-                indices = np.where((knots >= self.start) & (knots <= self.end))[0]
-                max_idx = len(knots) - 2
-                indices = indices[indices <= max_idx]
-                
-                if len(indices) > 0:
-                    constraints.extend([sign * (v_chunk[indices+1] - v_chunk[indices]) >= 0])
-            else:
-                constraints.extend([sign * (v_chunk[1:] - v_chunk[:-1]) >= 0])
-        return constraints
+        return _difference_matrix(s.n_basis, order=1)[self._pairs_BSpline(s)]
+
+    def _pairs_BSpline(self, s) -> np.ndarray:
+        """
+        Returns the constrained pairs of consecutive B-spline control points.
+
+        Parameters
+        ----------
+        s : BSpline
+            B-spline formulation component.
+
+        Returns
+        -------
+        np.ndarray
+            The indices of the first difference rows, all `n_basis - 1` without `start` and `end`.
+        """
+        if self.start is None or self.end is None:
+            return np.arange(s.n_basis - 1)
+        knots = np.array(s.knots)
+        indices = np.where((knots >= self.start) & (knots <= self.end))[0]
+        max_idx = len(knots) - 2
+        return indices[indices <= max_idx]
+
+    def _matrix_StepSpline(self, s) -> sp.csr_matrix:
+        """
+        Builds the first differences of adjacent bin values.
+
+        Parameters
+        ----------
+        s : StepSpline
+            Piecewise constant component.
+
+        Returns
+        -------
+        sp.csr_matrix
+            One difference row per constrained inner edge of one class.
+        """
+        return _difference_matrix(s.n_basis, order=1)[self._edges_StepSpline(s)]
+
+    def _edges_StepSpline(self, s) -> np.ndarray:
+        """
+        Returns the constrained inner edges of a step spline.
+
+        Parameters
+        ----------
+        s : StepSpline
+            Piecewise constant component.
+
+        Returns
+        -------
+        np.ndarray
+            The indices of the first difference rows, all `n_basis - 1` without `start` and `end`.
+        """
+        if self.start is None or self.end is None:
+            return np.arange(s.n_basis - 1)
+        # row i steps across the inner edge i + 1
+        inner = np.asarray(s.edges)[1:-1]
+        return np.where((inner >= self.start) & (inner <= self.end))[0]
+
+    def _matrix_TensorSpline(self, s) -> sp.csr_matrix:
+        """
+        Applies the monotonic rows of the marginal along `axis` to every slice of the coefficient grid.
+
+        The partial derivative along `axis` is a combination of the marginal derivatives weighted by the
+        other marginal basis, so monotone slices imply a monotone surface when that basis is non-negative.
+
+        Parameters
+        ----------
+        s : TensorSpline
+            Tensor product component.
+
+        Returns
+        -------
+        sp.csr_matrix
+            The marginal rows repeated over the functions of the other marginal, for one class.
+
+        Raises
+        ------
+        ValueError
+            If `axis` is not set, or the other marginal basis can be negative (Fourier, truncated
+            `PiecewiseLinear`).
+        """
+        from ..spline import BSpline, PiecewiseLinear
+
+        marginal, other = self._tensor_marginals(s)
+        if isinstance(marginal, PiecewiseLinear):
+            rows = self._matrix_PiecewiseLinear(s=marginal)
+        elif isinstance(marginal, BSpline):
+            rows = self._matrix_BSpline(s=marginal)
+        else:
+            rows = self._matrix_CyclicSpline(s=marginal)
+
+        identity = sp.identity(other.n_basis, format='csr')
+        if self.axis == 0:
+            return sp.kron(rows, identity, format='csr')
+        return sp.kron(identity, rows, format='csr')
+
+    def _tensor_marginals(self, s) -> Tuple:
+        """
+        Returns the marginal along `axis` and the other marginal of a tensor product, checking both.
+
+        Parameters
+        ----------
+        s : TensorSpline
+            Tensor product component.
+
+        Returns
+        -------
+        Tuple[Spline, Spline]
+            The constrained marginal and the other marginal.
+
+        Raises
+        ------
+        ValueError
+            If `axis` is not set, the other marginal basis can be negative, or the constrained marginal
+            is not supported.
+        """
+        from ..spline import BSpline, CyclicSpline, PiecewiseLinear
+
+        axis = getattr(self, 'axis', None)
+        if axis not in (0, 1):
+            raise ValueError("Monotonic constraint on a TensorSpline requires axis=0 or axis=1.")
+        marginal, other = s.marginals[axis], s.marginals[1 - axis]
+        nonnegative = isinstance(other, BSpline) or getattr(other, 'basis', None) in ("hat", "bspline")
+        if not nonnegative:
+            raise ValueError(
+                f"Monotonic constraint along axis {axis} requires a non-negative basis on the other marginal "
+                "(BSpline, hat PiecewiseLinear or B-spline CyclicSpline)."
+            )
+        supported = isinstance(marginal, (PiecewiseLinear, BSpline)) or (
+            isinstance(marginal, CyclicSpline) and marginal.basis == "bspline")
+        if not supported:
+            raise ValueError(f"Monotonic constraint not supported along a marginal of type '{type(marginal).__name__}'")
+        return marginal, other
+
+    def _matrix_CyclicSpline(self, s) -> sp.csr_matrix:
+        """
+        Builds the wrapped first differences of the periodic B-spline coefficients acting on the interval.
+
+        In every knot cell of `[start, end]` the derivative is a B-spline of degree `degree - 1` whose
+        coefficients are the differences `v[j] - v[j-1]` of the `degree` last active functions.
+
+        Parameters
+        ----------
+        s : CyclicSpline
+            Periodic B-spline component.
+
+        Returns
+        -------
+        sp.csr_matrix
+            One difference row per constrained pair of consecutive coefficients of one class.
+        """
+        K = s.n_basis
+        j = self._pairs_CyclicSpline(s)
+        n = len(j)
+        data = np.concatenate([np.ones(n), -np.ones(n)])
+        rows = np.concatenate([np.arange(n), np.arange(n)])
+        cols = np.concatenate([j, np.mod(j - 1, K)])
+        return sp.csr_matrix((data, (rows, cols)), shape=(n, K))
+
+    def _pairs_CyclicSpline(self, s) -> np.ndarray:
+        """
+        Returns the periodic B-spline coefficients whose difference with their predecessor is constrained.
+
+        Parameters
+        ----------
+        s : CyclicSpline
+            Periodic B-spline component.
+
+        Returns
+        -------
+        np.ndarray
+            The sorted coefficient indices `j` of the rows `v[j] - v[j-1]`.
+        """
+        K, d = s.n_basis, s.degree
+        cells = s._support_cells(self.start, self.end)
+        return np.unique(np.mod(cells[:, None] - d + 1 + np.arange(d), K).ravel())
@@ -0,0 +1,316 @@
+import bisect
+import threading
+import time
+import numpy as np
+import polars as pl
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+_on_span_start: Optional[Callable[["Span"], None]] = None
+_on_span_end: Optional[Callable[["Span"], None]] = None
+
+
+def set_hooks(on_span_start: Optional[Callable[["Span"], None]] = None,
+              on_span_end: Optional[Callable[["Span"], None]] = None) -> None:
+    """
+    Install the global tracing hooks invoked around lpspline hot paths.
+
+    Spans are emitted around `fit`, `predict`, every spline `init_spline`, `_build_basis`
+    and `eval`, expression, constraint and penalty building, and the optimization `solve`.
+    Each hook receives the `Span` instance, whose `tags` carry the spline tag, the number
+    of rows and the number of parameters when they are known.
+
+    Parameters
+    ----------
+    on_span_start : Optional[Callable[[Span], None]], default=None
+        Called when a span is entered.
+    on_span_end : Optional[Callable[[Span], None]], default=None
+        Called when a span exits, with `duration` available.
+    """
+    global _on_span_start, _on_span_end
+    _on_span_start = on_span_start
+    _on_span_end = on_span_end
+
+
+def clear_hooks() -> None:
+    """
+    Remove any installed tracing hooks.
+    """
+    set_hooks(None, None)
+
+
+def hooks_enabled() -> bool:
+    """
+    Returns whether at least one tracing hook is installed.
+
+    Returns
+    -------
+    bool
+        True if spans are currently being reported.
+    """
+    return _on_span_start is not None or _on_span_end is not None
+
+
+class Span:
+    """
+    A timed section of lpspline work reported to the installed hooks.
+    """
+    __slots__ = ("name", "tags", "start", "end")
+
+    def __init__(self, name: str, tags: Dict[str, Any]):
+        """
+        Initialize the Span.
+
+        Parameters
+        ----------
+        name : str
+            The instrumented operation, e.g. `fit` or `build_basis`.
+        tags : Dict[str, Any]
+            Attributes describing the operation (spline tag, rows, params...).
+        """
+        self.name = name
+        self.tags = tags
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        Returns the wall time of the span in seconds.
+
+        Returns
+        -------
+        Optional[float]
+            The elapsed time, or None while the span is still open.
+        """
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+    def set_tag(self, key: str, value: Any) -> None:
+        """
+        Attach an attribute discovered while the span is running.
+
+        Parameters
+        ----------
+        key : str
+            The tag name.
+        value : Any
+            The tag value.
+        """
+        self.tags[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        hook = _on_span_start
+        if hook is not None:
+            hook(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end = time.perf_counter()
+        hook = _on_span_end
+        if hook is not None:
+            hook(self)
+        return False
+
+    def __repr__(self):
+        return f"Span(name='{self.name}', tags={self.tags}, duration={self.duration})"
+
+
+class _NoopSpan:
+    """
+    Shared span returned when no hook is installed.
+    """
+    __slots__ = ()
+
+    def set_tag(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **tags) -> Span:
+    """
+    Create a span for the given operation.
+
+    When no hook is installed a shared no-op context manager is returned, so instrumented
+    code pays a single global lookup.
+
+    Parameters
+    ----------
+    name : str
+        The instrumented operation name.
+    **tags : dict
+        Attributes attached to the span.
+
+    Returns
+    -------
+    Span
+        A context manager reporting to the installed hooks.
+    """
+    if _on_span_start is None and _on_span_end is None:
+        return _NOOP_SPAN
+    return Span(name, tags)
+
+
+class HistogramCollector:
+    """
+    In-process collector aggregating span durations into log-spaced histograms.
+
+    Durations are grouped by span name and spline tag, so the terms dominating
+    fitting or scoring latency can be identified directly.
+    """
+    def __init__(self, min_duration: float = 1e-6, max_duration: float = 1e3, buckets_per_decade: int = 4):
+        """
+        Initialize the HistogramCollector.
+
+        Parameters
+        ----------
+        min_duration : float, default=1e-6
+            Upper edge of the first histogram bucket, in seconds.
+        max_duration : float, default=1e3
+            Upper edge of the last finite bucket, in seconds.
+        buckets_per_decade : int, default=4
+            Number of log-spaced buckets per power of ten.
+        """
+        n_edges = int(round(np.log10(max_duration / min_duration) * buckets_per_decade)) + 1
+        self._edges: List[float] = list(np.geomspace(min_duration, max_duration, n_edges))
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+    @property
+    def edges(self) -> List[float]:
+        """
+        Returns the upper edges of the histogram buckets in seconds.
+
+        Returns
+        -------
+        List[float]
+            Bucket edges; a final overflow bucket collects longer durations.
+        """
+        return self._edges
+
+    def install(self) -> "HistogramCollector":
+        """
+        Install the collector as the global `on_span_end` hook.
+
+        Returns
+        -------
+        HistogramCollector
+            The collector instance to allow chaining.
+        """
+        set_hooks(on_span_end=self.record)
+        return self
+
+    def record(self, span: Span) -> None:
+        """
+        Add a finished span to the histograms.
+
+        Parameters
+        ----------
+        span : Span
+            The finished span.
+        """
+        duration = span.duration
+        key = (span.name, span.tags.get("spline"))
+        bucket = bisect.bisect_left(self._edges, duration)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = {"count": 0, "total": 0.0, "max": 0.0, "rows": 0, "buckets": [0] * (len(self._edges) + 1)}
+                self._stats[key] = stats
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            stats["rows"] += span.tags.get("rows") or 0
+            stats["buckets"][bucket] += 1
+
+    def histogram(self, name: str, spline: Optional[str] = None) -> np.ndarray:
+        """
+        Returns the bucket counts recorded for a span name and spline tag.
+
+        Parameters
+        ----------
+        name : str
+            The span name.
+        spline : Optional[str], default=None
+            The spline tag, or None for model-wide spans.
+
+        Returns
+        -------
+        np.ndarray
+            Counts per bucket, aligned with `edges` plus a final overflow bucket.
+        """
+        stats = self._stats.get((name, spline))
+        if stats is None:
+            return np.zeros(len(self._edges) + 1, dtype=int)
+        return np.array(stats["buckets"])
+
+    def quantile(self, name: str, q: float, spline: Optional[str] = None) -> Optional[float]:
+        """
+        Estimate a duration quantile from the histogram as the upper edge of the matching bucket.
+
+        Parameters
+        ----------
+        name : str
+            The span name.
+        q : float
+            The quantile in [0, 1].
+        spline : Optional[str], default=None
+            The spline tag, or None for model-wide spans.
+
+        Returns
+        -------
+        Optional[float]
+            The estimated quantile in seconds, or None if nothing was recorded.
+        """
+        stats = self._stats.get((name, spline))
+        if stats is None or stats["count"] == 0:
+            return None
+        cum = np.cumsum(stats["buckets"])
+        idx = int(np.searchsorted(cum, q * stats["count"]))
+        return self._edges[idx] if idx < len(self._edges) else stats["max"]
+
+    def summary(self) -> pl.DataFrame:
+        """
+        Returns the aggregated statistics for every recorded span name and spline tag.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per (span, spline) pair sorted by total time, with count, total,
+            mean, p50, p95 and max durations in seconds and the number of processed rows.
+        """
+        rows = []
+        for (name, spline), stats in list(self._stats.items()):
+            rows.append({
+                "span": name,
+                "spline": spline,
+                "count": stats["count"],
+                "rows": stats["rows"],
+                "total": stats["total"],
+                "mean": stats["total"] / stats["count"],
+                "p50": self.quantile(name, 0.5, spline),
+                "p95": self.quantile(name, 0.95, spline),
+                "max": stats["max"],
+            })
+        schema = {
+            "span": pl.Utf8, "spline": pl.Utf8, "count": pl.Int64, "rows": pl.Int64, "total": pl.Float64,
+            "mean": pl.Float64, "p50": pl.Float64, "p95": pl.Float64, "max": pl.Float64,
+        }
+        return pl.DataFrame(rows, schema=schema).sort("total", descending=True)
+
+    def reset(self) -> None:
+        """
+        Drop all recorded statistics.
+        """
+        with self._lock:
+            self._stats = {}
@@ -1,6 +1,6 @@
 import numpy as np
 import polars as pl
-from typing import Callable, Optional, Union
+from typing import Callable, Dict, Optional, Union
 from ..optimizer import LpRegressor
 
 def sigmoid(x):
@@ -16,12 +16,15 @@ class Link(LpRegressor):
     during fitting and an inverse link function to the predictions.
     
     This allows for generalized additive models such as log-linear or logistic regression.
+    With a `family` the wrapped regressor is instead fitted by maximum likelihood (IRLS) on the raw target.
     """
     def __init__(
         self, 
         regressor: LpRegressor, 
         link: Optional[Callable] = None, 
-        inv_link: Optional[Callable] = None
+        inv_link: Optional[Callable] = None,
+        family: Optional[str] = None,
+        glm_link: Optional[str] = None,
     ):
         """
         Initialize the Link wrapper.
@@ -36,6 +39,11 @@ class Link(LpRegressor):
         inv_link : Callable, optional
             The inverse link function to apply to predictions (e.g., np.exp).
             Defaults to identity if not provided.
+        family : str, optional
+            The distribution of the target, one of `FAMILIES`. When given, `fit` passes the untransformed
+            target to the `irls` engine instead of fitting least squares on the transformed target.
+        glm_link : str, optional
+            The name of the link in `LINKS` matching `link`, used together with `family`.
         """
         self.regressor = regressor
         self.splines = regressor.splines
@@ -44,9 +52,13 @@ class Link(LpRegressor):
         self.problem = getattr(regressor, 'problem', None)
         self._summary_data = getattr(regressor, '_summary_data', None)
         self._status = getattr(regressor, '_status', None)
+        self._fallback = getattr(regressor, '_fallback', None)
+        self._fit_report = getattr(regressor, '_fit_report', None)
         
         self._link = link if link is not None else lambda x: x
         self._inv_link = inv_link if inv_link is not None else lambda x: x
+        self._glm_family = family
+        self._glm_link = glm_link
 
     def link(self, x):
         """Apply the link function."""
@@ -58,20 +70,26 @@ class Link(LpRegressor):
 
     def fit(self, X: pl.DataFrame, y: pl.Series, **kwargs) -> "Link":
         """
-        Fit the model by transforming the target using the link function.
+        Fit the model by transforming the target using the link function, or by IRLS on the raw target when a family is set.
         """
-        y_val = y.to_numpy()
-        y_transformed = self.link(y_val)
-        
-        # LpRegressor.fit expects a pl.Series
-        y_series = pl.Series(y.name, y_transformed)
-        
-        self.regressor.fit(X, y_series, **kwargs)
+        family = getattr(self, '_glm_family', None)
+        if family is not None:
+            self.regressor.fit(X, y, family=family, link=getattr(self, '_glm_link', None), **kwargs)
+        else:
+            y_val = y.to_numpy()
+            y_transformed = self.link(y_val)
+
+            # LpRegressor.fit expects a pl.Series
+            y_series = pl.Series(y.name, y_transformed)
+
+            self.regressor.fit(X, y_series, **kwargs)
         
         # Sync state
         self.problem = self.regressor.problem
         self._summary_data = self.regressor._summary_data
         self._status = getattr(self.regressor, '_status', None)
+        self._fallback = getattr(self.regressor, '_fallback', None)
+        self._fit_report = getattr(self.regressor, '_fit_report', None)
         
         return self
 
@@ -87,6 +105,27 @@ class Link(LpRegressor):
         
         return self.inv_link(res)
 
+    def predict_quantiles(self, X: pl.DataFrame) -> np.ndarray:
+        """
+        Predict every quantile curve by applying the (monotone) inverse link to the quantiles of the linear predictor.
+        """
+        return self.inv_link(self.regressor.predict_quantiles(X))
+
+    def predict_grid(self, axes: Dict[str, np.ndarray], as_frame: bool = False) -> Union[np.ndarray, pl.LazyFrame]:
+        """
+        Predict on the Cartesian product of feature values by applying the inverse link to the grid of the linear predictor.
+        """
+        res = self.inv_link(self.regressor.predict_grid(axes))
+        if as_frame:
+            return self._grid_frame({name: np.asarray(v).ravel() for name, v in axes.items()}, res)
+        return res
+
+    def predict_derivative(self, X: pl.DataFrame, term: str, derivative: int = 1) -> np.ndarray:
+        """
+        Predict the derivative of the linear predictor, before the inverse link, with respect to one feature.
+        """
+        return self.regressor.predict_derivative(X, term=term, derivative=derivative)
+
     def __getattr__(self, name):
         """Delegate attribute access to the wrapped regressor."""
         return getattr(self.regressor, name)
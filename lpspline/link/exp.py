@@ -1,8 +1,20 @@
 import numpy as np
+from typing import Optional
 from ..optimizer import LpRegressor
 from .base import Link
 
 class Exp(Link):
     """Exp link function (y = log(Xb))."""
-    def __init__(self, regressor: LpRegressor):
-        super().__init__(regressor, link=np.exp, inv_link=np.log)
+    def __init__(self, regressor: LpRegressor, family: Optional[str] = None):
+        """
+        Initialize the Exp link.
+
+        Parameters
+        ----------
+        regressor : LpRegressor
+            The regressor instance to wrap.
+        family : str, optional
+            The distribution of the target (e.g. `gaussian`) to fit by IRLS with the exp link.
+            Defaults to least squares on the transformed target.
+        """
+        super().__init__(regressor, link=np.exp, inv_link=np.log, family=family, glm_link="exp")
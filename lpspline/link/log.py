@@ -1,8 +1,20 @@
 import numpy as np
+from typing import Optional
 from ..optimizer import LpRegressor
 from .base import Link
 
 class Log(Link):
     """Log link function (y = exp(Xb))."""
-    def __init__(self, regressor: LpRegressor):
-        super().__init__(regressor, link=np.log, inv_link=np.exp)
+    def __init__(self, regressor: LpRegressor, family: Optional[str] = None):
+        """
+        Initialize the Log link.
+
+        Parameters
+        ----------
+        regressor : LpRegressor
+            The regressor instance to wrap.
+        family : str, optional
+            The distribution of the target (`poisson` or `gamma`) to fit by IRLS with the log link.
+            Defaults to least squares on the transformed target.
+        """
+        super().__init__(regressor, link=np.log, inv_link=np.exp, family=family, glm_link="log")
@@ -1,7 +1,19 @@
+from typing import Optional
 from ..optimizer import LpRegressor
 from .base import Link, logit, sigmoid
 
 class Sigmoid(Link):
     """Sigmoid/Logit link function (y = sigmoid(Xb))."""
-    def __init__(self, regressor: LpRegressor):
-        super().__init__(regressor, link=logit, inv_link=sigmoid)
+    def __init__(self, regressor: LpRegressor, family: Optional[str] = None):
+        """
+        Initialize the Sigmoid link.
+
+        Parameters
+        ----------
+        regressor : LpRegressor
+            The regressor instance to wrap.
+        family : str, optional
+            The distribution of the target (`binomial`) to fit by IRLS with the logit link.
+            Defaults to least squares on the transformed target.
+        """
+        super().__init__(regressor, link=logit, inv_link=sigmoid, family=family, glm_link="logit")
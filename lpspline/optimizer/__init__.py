@@ -1,2 +1,3 @@
 from .regressor import LpRegressor
 from .summary import print_summary
+from .report import FitReport
@@ -0,0 +1,412 @@
+import warnings
+import numpy as np
+import scipy.linalg as la
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.sparse.csgraph import connected_components
+from typing import Any, Dict, List, Optional
+from .identify import _constant_direction
+from .qp import QPProblem, compile_qp, penalty_system, solve_qp
+
+# Sweep budget and relative objective tolerance of the block coordinate descent.
+MAX_BACKFIT_ITER = 200
+BACKFIT_TOL = 1e-8
+
+# Ridge added to the block Gram matrices, relative to their largest diagonal entry, so that basis
+# functions without training rows keep the factorization positive definite.
+_JITTER = 1e-10
+
+# Ridge added to the level system, relative to its largest diagonal entry; exactly shared levels (e.g. a
+# factor and the constant of a Fourier basis, both unpenalized) leave it singular.
+_LEVEL_RIDGE = 1e-10
+
+
+class BlockSolver:
+    """
+    Minimizer of the penalized least-squares loss of one spline against a partial residual.
+
+    Unconstrained blocks with L2 penalties solve the normal equations `(D'D + sum alpha W'W) b = D'r`
+    with a factorization computed once: diagonal (e.g. factors), banded Cholesky (e.g. B-splines, whose
+    Gram matrix has `degree` off-diagonals) or dense Cholesky. Blocks with constraints or L1 penalties
+    solve the same loss as a small QP, warm-started from their previous solution.
+
+    The `levels` of the block are the coefficient moves adding a constant to its fit on a group of rows
+    (e.g. one class of a `by` spline or one level of a factor) that its constraints and L1 penalties ignore.
+    """
+    def __init__(self, spline: "Spline", design: sp.csr_matrix, solver: str = "OSQP", settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the BlockSolver and factorize its normal equations.
+
+        Parameters
+        ----------
+        spline : Spline
+            The initialized spline of the block.
+        design : sp.csr_matrix
+            The design of the spline on the training rows.
+        solver : str, default="OSQP"
+            The QP solver of constrained blocks, see `solve_qp`.
+        settings : Optional[Dict[str, Any]], default=None
+            Settings of the QP solver.
+        """
+        self.D = design
+        self.DT = design.T.tocsr()
+        self.n_coefs = design.shape[1]
+        self.solver = solver
+        self.settings = settings or {}
+        self.penalties = penalty_system([spline], [slice(0, self.n_coefs)], self.n_coefs)
+        self._warm_start: Optional[Dict[str, np.ndarray]] = None
+        self.levels = _level_directions(spline, design, self.penalties)
+
+        structure = compile_qp([spline], [design[:0]], np.zeros(0))
+        gram = (self.DT @ self.D).tocsc()
+        if structure.n_constraints:
+            n_aux = structure.n_variables - self.n_coefs
+            P = structure.P + sp.block_diag([2.0 * gram, sp.csc_matrix((n_aux, n_aux))], format='csc')
+            self.qp = QPProblem(P=sp.csc_matrix(P), q=structure.q, A=structure.A, l=structure.l, u=structure.u,
+                                blocks=structure.blocks)
+            self.kind = "qp"
+        else:
+            self.qp = None
+            self._factorize(sp.csc_matrix(gram + 0.5 * structure.P))
+
+    def _factorize(self, G: sp.csc_matrix) -> None:
+        """
+        Factorize the symmetric Gram matrix with the cheapest structure it has.
+
+        The matrix is only densified when it has no diagonal or banded structure, so a factor with many
+        levels keeps `O(n_coefs)` memory.
+
+        Parameters
+        ----------
+        G : sp.csc_matrix
+            The penalized Gram matrix of shape `(n_coefs, n_coefs)`.
+        """
+        p = G.shape[0]
+        G = (G + _JITTER * max(float(G.diagonal().max(initial=0.0)), 1.0) * sp.identity(p, format='csc')).tocoo()
+        nonzero = G.data != 0
+        bandwidth = int(np.max(np.abs(G.row[nonzero] - G.col[nonzero]), initial=0))
+        G = G.tocsc()
+        if bandwidth == 0:
+            self.kind = "diagonal"
+            self._factor = G.diagonal()
+        elif 2 * bandwidth < p:
+            # upper banded storage: ab[bandwidth + i - j, j] = G[i, j]
+            ab = np.zeros((bandwidth + 1, p))
+            for k in range(bandwidth + 1):
+                ab[bandwidth - k, k:] = G.diagonal(k)
+            self.kind = "banded"
+            self._factor = la.cholesky_banded(ab)
+        else:
+            self.kind = "dense"
+            self._factor = la.cho_factor(G.toarray())
+
+    def solve(self, residual: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Minimize the block loss `||D b - r||^2 + penalties` subject to the block constraints.
+
+        Parameters
+        ----------
+        residual : np.ndarray
+            The partial residual `r`, the target minus the fit of every other block.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The block coefficients, or None if the block QP failed.
+        """
+        rhs = self.DT @ residual
+        if self.kind == "diagonal":
+            return rhs / self._factor
+        if self.kind == "banded":
+            return la.cho_solve_banded((self._factor, False), rhs)
+        if self.kind == "dense":
+            return la.cho_solve(self._factor, rhs)
+
+        q = self.qp.q.copy()
+        q[:self.n_coefs] -= 2.0 * rhs
+        problem = QPProblem(P=self.qp.P, q=q, A=self.qp.A, l=self.qp.l, u=self.qp.u, blocks=self.qp.blocks)
+        result = solve_qp(problem, solver=self.solver, warm_start=self._warm_start, **self.settings)
+        self.last_result = result
+        if result.x is None:
+            return None
+        self._warm_start = {"x": result.x, "y": result.y}
+        return result.x[:self.n_coefs]
+
+    def penalty(self, coefs: np.ndarray) -> float:
+        """
+        Evaluate the block penalties.
+
+        Parameters
+        ----------
+        coefs : np.ndarray
+            The block coefficients.
+
+        Returns
+        -------
+        float
+            The sum of `alpha ||W b||^2` and `alpha ||W b||_1` over the penalties of the spline.
+        """
+        total = 0.0
+        for norm, alpha, W in self.penalties:
+            Wb = W @ coefs
+            total += alpha * (float(Wb @ Wb) if norm == "l2" else float(np.abs(Wb).sum()))
+        return total
+
+    def __repr__(self):
+        return f"BlockSolver(kind='{self.kind}', n_coefs={self.n_coefs})"
+
+
+class BackfitResult:
+    """
+    Outcome of a backfitting run.
+    """
+    def __init__(self, coefs: Optional[List[np.ndarray]], status: str, stats: Dict[str, Any], convergence: Dict[str, Any]):
+        """
+        Initialize the BackfitResult.
+
+        Parameters
+        ----------
+        coefs : Optional[List[np.ndarray]]
+            The coefficients of every block, or None if a block QP failed.
+        status : str
+            Status in the CVXPY vocabulary; `optimal_inaccurate` when the sweep budget ran out.
+        stats : Dict[str, Any]
+            Statistics of the block QP solves in the `FitReport.solver` layout, empty without constrained blocks.
+        convergence : Dict[str, Any]
+            Convergence statistics in the `FitReport.convergence` layout.
+        """
+        self.coefs = coefs
+        self.status = status
+        self.stats = stats
+        self.convergence = convergence
+
+    def __repr__(self):
+        return f"BackfitResult(status='{self.status}', iterations={self.convergence.get('iterations')})"
+
+
+def backfit(blocks: List[BlockSolver], y: np.ndarray, initial: Optional[List[np.ndarray]] = None,
+            max_iter: int = MAX_BACKFIT_ITER, tol: float = BACKFIT_TOL) -> BackfitResult:
+    """
+    Fit an additive model by block coordinate descent (backfitting).
+
+    Every sweep updates each block in turn against the partial residual `y - sum_{k != j} D_k b_k`. Only the
+    total residual is kept, so the working memory is `O(n)` on top of the designs and the block factorizations.
+    The constraints and penalties are separable over the blocks, so every sweep decreases the penalized loss;
+    the sweeps stop when its relative change `|obj - obj_old| / (|obj| + 0.1)` falls below `tol`.
+
+    Blocks sharing a level, e.g. a `by` spline and a factor of the same column both fitting the class means,
+    make plain sweeps crawl along the directions only the penalties tell apart. After every sweep the levels
+    of all blocks are therefore shifted jointly to minimize the penalized loss, see `_LevelShift`; the
+    constraints ignore these moves, so the iterates stay feasible and the optimum is unchanged. When the
+    sweep budget runs out the status is `optimal_inaccurate` and a `RuntimeWarning` is issued.
+
+    Parameters
+    ----------
+    blocks : List[BlockSolver]
+        The block of every spline.
+    y : np.ndarray
+        The target values.
+    initial : Optional[List[np.ndarray]], default=None
+        Starting coefficients of every block, e.g. from a previous fit. Zero when None.
+    max_iter : int, default=MAX_BACKFIT_ITER
+        Maximum number of sweeps.
+    tol : float, default=BACKFIT_TOL
+        Convergence tolerance on the relative objective change.
+
+    Returns
+    -------
+    BackfitResult
+        The coefficients, block solver statistics and convergence history.
+    """
+    coefs = [np.zeros(block.n_coefs) for block in blocks] if initial is None else [np.array(c, dtype=float) for c in initial]
+    residual = np.asarray(y, dtype=float).copy()
+    for block, b in zip(blocks, coefs):
+        residual -= block.D @ b
+
+    shift = _LevelShift(blocks)
+    objective, history = None, []
+    status, converged = None, False
+    qp_stats: List[Dict[str, Any]] = []
+    for _ in range(max_iter):
+        for j, block in enumerate(blocks):
+            residual += block.D @ coefs[j]
+            b = block.solve(residual)
+            if block.kind == "qp":
+                qp_stats.append(block.last_result.stats)
+            if b is None:
+                status = block.last_result.status
+                break
+            coefs[j] = b
+            residual -= block.D @ b
+        if status is not None:
+            coefs = None
+            break
+        shift(coefs, residual)
+
+        value = float(residual @ residual) + sum(block.penalty(b) for block, b in zip(blocks, coefs))
+        history.append(value)
+        if objective is not None and abs(objective - value) / (abs(value) + 0.1) < tol:
+            objective, converged = value, True
+            break
+        objective = value
+
+    if status is None:
+        status = "optimal" if converged else "optimal_inaccurate"
+        if not converged:
+            warnings.warn(f"Backfitting did not converge in {max_iter} sweeps; the solution may be inaccurate.",
+                          RuntimeWarning)
+    kinds = [block.kind for block in blocks]
+    convergence = {
+        "method": "backfit",
+        "iterations": len(history),
+        "converged": converged,
+        "objective": objective,
+        "history": history,
+        "blocks": {kind: kinds.count(kind) for kind in ("diagonal", "banded", "dense", "qp") if kind in kinds},
+    }
+    return BackfitResult(coefs=coefs, status=status, stats=_merge_stats(qp_stats), convergence=convergence)
+
+
+class _LevelShift:
+    """
+    Joint minimization of the penalized loss over the levels of all blocks.
+
+    With the level moves `W_j` of every block stacked into `W` and their fits into `E = [D_j W_j]`, shifting
+    the coefficients by `W t` changes the loss by the quadratic `||r - E t||^2 + sum alpha ||P (b + W t)||^2`
+    over the L2 penalties `P`. Its Hessian depends on the designs only and is factored once; every call costs
+    one product with `E` and `E'` and a sparse solve. A factor contributes one move per level, so the Hessian
+    is kept sparse: the moves of one block share no rows and only couple through the other blocks.
+    """
+    def __init__(self, blocks: List[BlockSolver]):
+        """
+        Initialize the _LevelShift and factor the Hessian of the level system.
+
+        Parameters
+        ----------
+        blocks : List[BlockSolver]
+            The block of every spline.
+        """
+        self.blocks = blocks
+        self.slices = []
+        start = 0
+        for block in blocks:
+            self.slices.append(slice(start, start + block.levels.shape[1]))
+            start += block.levels.shape[1]
+        # a single block already minimizes over its own levels
+        self.active = sum(block.levels.shape[1] > 0 for block in blocks) > 1
+        if not self.active:
+            return
+
+        self.E = sp.hstack([block.D @ block.levels for block in blocks], format='csc')
+        H = self.E.T @ self.E
+        penalty = [sp.csc_matrix((sl.stop - sl.start, sl.stop - sl.start)) for sl in self.slices]
+        for j, block in enumerate(blocks):
+            for norm, alpha, W in block.penalties:
+                if norm == "l2":
+                    PW = sp.csc_matrix(W @ block.levels)
+                    penalty[j] = penalty[j] + alpha * (PW.T @ PW)
+        H = sp.csc_matrix(H + sp.block_diag(penalty, format='csc'))
+        ridge = _LEVEL_RIDGE * max(H.diagonal().max(), 1.0)
+        self._solve = spla.splu(H + ridge * sp.identity(H.shape[0], format='csc')).solve
+
+    def __call__(self, coefs: List[np.ndarray], residual: np.ndarray) -> None:
+        """
+        Shift the coefficients and the residual in place to the minimizer over the levels.
+
+        Parameters
+        ----------
+        coefs : List[np.ndarray]
+            The coefficients of every block.
+        residual : np.ndarray
+            The residual `y - sum_j D_j b_j`.
+        """
+        if not self.active:
+            return
+        g = self.E.T @ residual
+        for block, sl, b in zip(self.blocks, self.slices, coefs):
+            for norm, alpha, W in block.penalties:
+                if norm == "l2":
+                    g[sl] -= alpha * (W @ block.levels).T @ (W @ b)
+        t = self._solve(g)
+        for j, (block, sl) in enumerate(zip(self.blocks, self.slices)):
+            coefs[j] = coefs[j] + block.levels @ t[sl]
+        residual -= self.E @ t
+
+
+def _level_directions(spline: "Spline", design: sp.csr_matrix, penalties: list, tol: float = 1e-8) -> sp.csr_matrix:
+    """
+    Find the level moves of a block, see `BlockSolver`.
+
+    The columns of the design are split into groups sharing no rows, e.g. the classes of a `by` spline or the
+    levels of a factor, and every group contributes the move adding 1 to its rows, if any. Single column
+    groups, such as the levels of a factor, are handled at once: the move exists when the column is
+    constant on its rows and no constraint or L1 penalty sees it.
+
+    Parameters
+    ----------
+    spline : Spline
+        The initialized spline of the block.
+    design : sp.csr_matrix
+        The design of the spline on the training rows.
+    penalties : list
+        The penalties of the block, see `penalty_system`.
+    tol : float, default=1e-8
+        Relative tolerance used to decide whether a group represents constants.
+
+    Returns
+    -------
+    sp.csr_matrix
+        Matrix of shape `(n_coefs, n_levels)`, one move per column.
+    """
+    rows = [sp.csr_matrix(c.build_matrix(spline)[0]) for c in spline.constraints]
+    rows += [W for norm, _, W in penalties if norm == "l1"]
+    rows = [r for r in rows if r.shape[0]]
+    K = sp.vstack(rows, format='csc') if rows else None
+
+    gram = (design.T @ design).tocsr()
+    n_groups, labels = connected_components(gram != 0, directed=False)
+    design = design.tocsc()
+    p = design.shape[1]
+    sizes = np.bincount(labels, minlength=n_groups)
+    counts = np.diff(design.indptr)
+
+    # single columns: constant on their rows and unseen by the constraint rows
+    single = (sizes[labels] == 1) & (counts > 0)
+    columns = np.repeat(np.arange(p), counts)
+    low = np.full(p, np.inf)
+    high = np.full(p, -np.inf)
+    np.minimum.at(low, columns, design.data)
+    np.maximum.at(high, columns, design.data)
+    single &= (high - low <= np.sqrt(tol) * np.abs(high)) & (high != 0)
+    if K is not None:
+        single &= np.diff(K.indptr) == 0
+    move_rows = [np.flatnonzero(single)]
+    move_values = [1.0 / high[single]]
+
+    for group in np.flatnonzero(sizes > 1):
+        cols = np.flatnonzero(labels == group)
+        D = design[:, cols]
+        D = D.tocsr()[np.unique(D.indices)]
+        w = _constant_direction(D, K[:, cols] if K is not None else None, tol)
+        if w is not None:
+            move_rows.append(cols)
+            move_values.append(w)
+
+    n_moves = len(move_rows[0]) + len(move_rows) - 1
+    move_cols = np.concatenate([np.arange(len(move_rows[0]))]
+                               + [np.full(len(r), len(move_rows[0]) + i) for i, r in enumerate(move_rows[1:])])
+    return sp.csr_matrix((np.concatenate(move_values), (np.concatenate(move_rows), move_cols)), shape=(p, n_moves))
+
+
+def _merge_stats(stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Sum the iterations and times of the block QP solves in the `FitReport.solver` layout.
+    """
+    if not stats:
+        return {}
+    merged = dict(stats[-1])
+    for key in ("num_iters", "setup_time", "solve_time"):
+        values = [s[key] for s in stats if isinstance(s.get(key), (int, float))]
+        merged[key] = sum(values) if values else None
+    merged["num_solves"] = len(stats)
+    return merged
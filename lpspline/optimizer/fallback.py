@@ -0,0 +1,131 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import lsqr
+from typing import Optional, Tuple
+from .qp import QPProblem, solve_qp
+
+# Status of a solve aborted by an error of the solver, e.g. OSQP failing when its time budget runs out.
+SOLVER_ERROR = "solver_error"
+
+# Statuses of a solve interrupted by its time or iteration budget, or failed in the solver.
+BUDGET_STATUSES = ("user_limit", SOLVER_ERROR)
+
+# Fallbacks in the order they are tried.
+FALLBACKS = ("best_iterate", "projected_least_squares", "previous")
+
+
+def is_feasible(A: sp.csr_matrix, lower: np.ndarray, upper: np.ndarray, x: np.ndarray, tol: float = 1e-4) -> bool:
+    """
+    Check whether `x` satisfies `lower <= A x <= upper` up to a relative tolerance.
+
+    Parameters
+    ----------
+    A : sp.csr_matrix
+        The constraint matrix.
+    lower : np.ndarray
+        Row lower bounds, `-inf` when absent.
+    upper : np.ndarray
+        Row upper bounds, `inf` when absent.
+    x : np.ndarray
+        The candidate coefficients.
+    tol : float, default=1e-4
+        Violation allowed per row, scaled by `1 + |bound|`.
+
+    Returns
+    -------
+    bool
+        True if every row is satisfied.
+    """
+    if A.shape[0] == 0:
+        return True
+    Ax = A @ x
+    with np.errstate(invalid='ignore'):
+        ok_lower = ~(Ax < lower - tol * (1 + np.abs(lower)))
+        ok_upper = ~(Ax > upper + tol * (1 + np.abs(upper)))
+    return bool(np.all(ok_lower & ok_upper))
+
+
+def projected_least_squares(D: sp.csr_matrix, y: np.ndarray, A: sp.csr_matrix, lower: np.ndarray,
+                            upper: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Solve the unconstrained least-squares problem and project it onto the constraint set.
+
+    The projection `min ||b - b_ls||^2  s.t.  lower <= A b <= upper` only involves the
+    coefficients, so it is cheap whatever the number of rows.
+
+    Parameters
+    ----------
+    D : sp.csr_matrix
+        The stacked sparse design matrix.
+    y : np.ndarray
+        The target values.
+    A : sp.csr_matrix
+        The constraint matrix over the coefficients.
+    lower : np.ndarray
+        Row lower bounds.
+    upper : np.ndarray
+        Row upper bounds.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The projected coefficients, or None if the projection failed (e.g. infeasible constraints).
+    """
+    b_ls = lsqr(D, np.asarray(y, dtype=float), atol=1e-10, btol=1e-10)[0]
+    if A.shape[0] == 0:
+        return b_ls
+
+    n = len(b_ls)
+    projection = QPProblem(
+        P=2.0 * sp.identity(n, format='csc'), q=-2.0 * b_ls, A=sp.csc_matrix(A), l=lower, u=upper,
+        blocks=[slice(0, n)], constant=float(b_ls @ b_ls),
+    )
+    result = solve_qp(projection, eps_abs=1e-7, eps_rel=1e-7)
+    if result.x is None or result.status != "optimal":
+        return None
+    return result.x
+
+
+def resolve_fallback(
+    x: Optional[np.ndarray],
+    A: sp.csr_matrix,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    D: Optional[sp.csr_matrix],
+    y: np.ndarray,
+    previous: Optional[np.ndarray] = None,
+) -> Tuple[Optional[np.ndarray], str]:
+    """
+    Pick the coefficients of a fit interrupted by its budget, trying `FALLBACKS` in order.
+
+    Parameters
+    ----------
+    x : Optional[np.ndarray]
+        The last solver iterate over the coefficients, or None if not available.
+    A : sp.csr_matrix
+        The constraint matrix over the coefficients.
+    lower : np.ndarray
+        Row lower bounds.
+    upper : np.ndarray
+        Row upper bounds.
+    D : Optional[sp.csr_matrix]
+        The stacked sparse design matrix, or None to skip `projected_least_squares`, e.g. for losses other
+        than least squares.
+    y : np.ndarray
+        The target values.
+    previous : Optional[np.ndarray], default=None
+        The coefficients of the previous fit, when compatible with the current problem.
+
+    Returns
+    -------
+    Tuple[Optional[np.ndarray], str]
+        The coefficients and the fallback used, `none` when all of them failed.
+    """
+    if x is not None and is_feasible(A, lower, upper, x):
+        return x, "best_iterate"
+    b = projected_least_squares(D, y, A, lower, upper) if D is not None else None
+    if b is not None:
+        return b, "projected_least_squares"
+    if previous is not None:
+        return previous, "previous"
+    return None, "none"
@@ -0,0 +1,315 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import expit, xlogy
+from typing import Any, Callable, Dict, Optional, Tuple
+from .qp import QPProblem, solve_qp
+
+# Bounds keeping the mean inside the domain of the variance and link functions.
+_EPS = 1e-10
+
+# Iteration budget and relative deviance tolerance of the IRLS loop, as in R's `glm.control`.
+MAX_IRLS_ITER = 25
+IRLS_TOL = 1e-8
+MAX_STEP_HALVINGS = 10
+
+# Smallest inner time limit in seconds, so that an exhausted budget still bounds the first solve.
+_MIN_TIME_LIMIT = 1e-3
+
+
+class LinkFunction:
+    """
+    Link `g` mapping the mean `mu` to the linear predictor `eta = g(mu)` of a generalized additive model.
+    """
+    def __init__(self, name: str, link: Callable, inv_link: Callable, mu_eta: Callable, valid_eta: Optional[Callable] = None):
+        """
+        Initialize the LinkFunction.
+
+        Parameters
+        ----------
+        name : str
+            The link name, a key of `LINKS`.
+        link : Callable
+            The link `eta = g(mu)`.
+        inv_link : Callable
+            The inverse link `mu = g^-1(eta)`.
+        mu_eta : Callable
+            The derivative `d mu / d eta` of the inverse link.
+        valid_eta : Optional[Callable], default=None
+            Whether every linear predictor lies in the domain of the inverse link, None when unrestricted.
+        """
+        self.name = name
+        self.link = link
+        self.inv_link = inv_link
+        self.mu_eta = mu_eta
+        self.valid_eta = valid_eta if valid_eta is not None else lambda eta: True
+
+    def __repr__(self):
+        return f"LinkFunction('{self.name}')"
+
+
+class Family:
+    """
+    Exponential family distribution of the target of a generalized additive model.
+    """
+    def __init__(self, name: str, variance: Callable, deviance: Callable, initialize: Callable, valid_y: Callable,
+                 default_link: str, mu_bounds: Tuple[float, float] = (-np.inf, np.inf)):
+        """
+        Initialize the Family.
+
+        Parameters
+        ----------
+        name : str
+            The family name, a key of `FAMILIES`.
+        variance : Callable
+            The variance function `V(mu)`.
+        deviance : Callable
+            The total deviance `dev(y, mu)`.
+        initialize : Callable
+            The starting mean computed from the targets.
+        valid_y : Callable
+            Whether every target lies in the support of the distribution.
+        default_link : str
+            The link used when none is requested.
+        mu_bounds : Tuple[float, float], default=(-inf, inf)
+            The mean is clipped into these bounds before evaluating the variance and deviance.
+        """
+        self.name = name
+        self.variance = variance
+        self.deviance = deviance
+        self.initialize = initialize
+        self.valid_y = valid_y
+        self.default_link = default_link
+        self.mu_bounds = mu_bounds
+
+    def clip(self, mu: np.ndarray) -> np.ndarray:
+        """Clip the mean into `mu_bounds`."""
+        return np.clip(mu, *self.mu_bounds)
+
+    def __repr__(self):
+        return f"Family('{self.name}')"
+
+
+LINKS: Dict[str, LinkFunction] = {
+    "identity": LinkFunction("identity", lambda mu: mu, lambda eta: eta, np.ones_like),
+    "log": LinkFunction("log", np.log, np.exp, np.exp),
+    "logit": LinkFunction("logit", lambda mu: np.log(mu / (1 - mu)), expit, lambda eta: expit(eta) * (1 - expit(eta))),
+    "exp": LinkFunction("exp", np.exp, np.log, lambda eta: 1 / eta, valid_eta=lambda eta: bool(np.all(eta > 0))),
+}
+
+FAMILIES: Dict[str, Family] = {
+    "gaussian": Family(
+        "gaussian",
+        variance=np.ones_like,
+        deviance=lambda y, mu: float(np.sum((y - mu) ** 2)),
+        initialize=lambda y: y,
+        valid_y=lambda y: True,
+        default_link="identity",
+    ),
+    "poisson": Family(
+        "poisson",
+        variance=lambda mu: mu,
+        deviance=lambda y, mu: float(2 * np.sum(xlogy(y, y / mu) - (y - mu))),
+        initialize=lambda y: y + 0.1,
+        valid_y=lambda y: bool(np.all(y >= 0)),
+        default_link="log",
+        mu_bounds=(_EPS, np.inf),
+    ),
+    "binomial": Family(
+        "binomial",
+        variance=lambda mu: mu * (1 - mu),
+        deviance=lambda y, mu: float(2 * np.sum(xlogy(y, y / mu) + xlogy(1 - y, (1 - y) / (1 - mu)))),
+        initialize=lambda y: (y + 0.5) / 2,
+        valid_y=lambda y: bool(np.all((y >= 0) & (y <= 1))),
+        default_link="logit",
+        mu_bounds=(_EPS, 1 - _EPS),
+    ),
+    "gamma": Family(
+        "gamma",
+        variance=lambda mu: mu ** 2,
+        deviance=lambda y, mu: float(2 * np.sum((y - mu) / mu - np.log(y / mu))),
+        initialize=lambda y: y,
+        valid_y=lambda y: bool(np.all(y > 0)),
+        default_link="log",
+        mu_bounds=(_EPS, np.inf),
+    ),
+}
+
+
+def resolve_family(family: str, link: Optional[str] = None) -> Tuple[Family, LinkFunction]:
+    """
+    Look up a family and its link.
+
+    Parameters
+    ----------
+    family : str
+        One of `FAMILIES`.
+    link : Optional[str], default=None
+        One of `LINKS`, or None for the default link of the family.
+
+    Returns
+    -------
+    Tuple[Family, LinkFunction]
+        The family and the link.
+
+    Raises
+    ------
+    ValueError
+        If the family or the link is unknown.
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown family '{family}'. Available families: {tuple(FAMILIES)}")
+    family = FAMILIES[family]
+    link = family.default_link if link is None else link
+    if link not in LINKS:
+        raise ValueError(f"Unknown link '{link}'. Available links: {tuple(LINKS)}")
+    return family, LINKS[link]
+
+
+class IRLSResult:
+    """
+    Outcome of an IRLS fit.
+    """
+    def __init__(self, x: Optional[np.ndarray], y: Optional[np.ndarray], status: str, stats: Dict[str, Any],
+                 convergence: Dict[str, Any]):
+        """
+        Initialize the IRLSResult.
+
+        Parameters
+        ----------
+        x : Optional[np.ndarray]
+            Primal solution of the last inner QP, or None if it failed.
+        y : Optional[np.ndarray]
+            Dual solution of the last inner QP, or None if not available.
+        status : str
+            Status in the CVXPY vocabulary; `user_limit` when the iteration budget ran out.
+        stats : Dict[str, Any]
+            Solver statistics of the last inner QP in the `FitReport.solver` layout.
+        convergence : Dict[str, Any]
+            Convergence statistics in the `FitReport.convergence` layout.
+        """
+        self.x = x
+        self.y = y
+        self.status = status
+        self.stats = stats
+        self.convergence = convergence
+
+    def __repr__(self):
+        return f"IRLSResult(status='{self.status}', iterations={self.convergence.get('iterations')})"
+
+
+def irls(structure: QPProblem, D: sp.csr_matrix, y: np.ndarray, family: Family, link: LinkFunction,
+         solver: str = "OSQP", warm_start: Optional[Dict[str, np.ndarray]] = None, max_iter: int = MAX_IRLS_ITER,
+         tol: float = IRLS_TOL, time_limit: Optional[float] = None, **settings) -> IRLSResult:
+    """
+    Fit a penalized, shape constrained generalized additive model by iteratively reweighted least squares.
+
+    Every iteration solves the weighted least-squares QP `min ||W^1/2 (D b - z)||^2 + penalties` subject to the
+    constraints, with weights `w = mu_eta^2 / V(mu)` and working response `z = eta + (y - mu) / mu_eta` taken at
+    the current fit. The penalties and constraints in `structure` and the design `D` are compiled once; only the
+    weighted Gram matrix and linear term are rebuilt, and the inner solve is warm-started from the previous
+    iterate. A step giving a non-finite deviance or leaving the domain of the link is halved towards the previous
+    coefficients, which stay feasible because the constraints are linear.
+
+    Parameters
+    ----------
+    structure : QPProblem
+        The penalties and constraints compiled without data rows, see `compile_qp`.
+    D : sp.csr_matrix
+        The stacked design of shape `(n_samples, n_coefs)`.
+    y : np.ndarray
+        The target values.
+    family : Family
+        The distribution of the target.
+    link : LinkFunction
+        The link of the linear predictor.
+    solver : str, default="OSQP"
+        The inner QP solver, see `solve_qp`.
+    warm_start : Optional[Dict[str, np.ndarray]], default=None
+        Previous primal `x` and dual `y` iterates of the inner QP.
+    max_iter : int, default=MAX_IRLS_ITER
+        Maximum number of IRLS iterations.
+    tol : float, default=IRLS_TOL
+        Convergence tolerance on the relative deviance change `|dev - dev_old| / (|dev| + 0.1)`.
+    time_limit : Optional[float], default=None
+        Wall time budget in seconds of the whole loop. Every inner solve is limited to the remaining time and
+        the loop stops with status `user_limit` at the last accepted iterate once it is used up.
+    **settings : dict
+        Settings of the inner solver.
+
+    Returns
+    -------
+    IRLSResult
+        The coefficients, solver statistics and convergence history.
+    """
+    n_coefs = D.shape[1]
+    n_aux = structure.n_variables - n_coefs
+    mu = family.clip(family.initialize(y))
+    eta = link.link(mu)
+    deviance, history = None, []
+    x, result, inner_iters = None, None, 0
+    status, converged = None, False
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    for _ in range(max_iter):
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 and x is not None:
+                status = "user_limit"
+                break
+            # a zero time limit disables the limit in OSQP and Clarabel
+            settings["time_limit"] = max(remaining, _MIN_TIME_LIMIT)
+        mu_eta = np.maximum(np.abs(link.mu_eta(eta)), _EPS)
+        weights = mu_eta ** 2 / np.maximum(family.variance(mu), _EPS)
+        z = eta + (y - mu) / mu_eta
+        DW = D.multiply(weights[:, None]).tocsr()
+        gram = sp.block_diag([2.0 * (D.T @ DW), sp.csc_matrix((n_aux, n_aux))], format='csc')
+        q = np.concatenate([-2.0 * (DW.T @ z), np.zeros(n_aux)])
+        problem = QPProblem(P=sp.csc_matrix(structure.P + gram), q=structure.q + q, A=structure.A,
+                            l=structure.l, u=structure.u, blocks=structure.blocks)
+
+        result = solve_qp(problem, solver=solver, warm_start=warm_start, **settings)
+        inner_iters += result.stats.get("num_iters") or 0
+        if result.x is None:
+            status = result.status
+            break
+        warm_start = {"x": result.x, "y": result.y}
+
+        x_new = result.x
+        for _ in range(MAX_STEP_HALVINGS + 1):
+            eta_new = D @ x_new[:n_coefs]
+            if link.valid_eta(eta_new):
+                mu_new = family.clip(link.inv_link(eta_new))
+                dev_new = family.deviance(y, mu_new)
+                if np.isfinite(dev_new):
+                    break
+            if x is None:
+                dev_new = np.nan
+                break
+            x_new = (x_new + x) / 2
+        if not np.isfinite(dev_new):
+            status = "numerical_error"
+            break
+
+        x, eta, mu = x_new, eta_new, mu_new
+        history.append(dev_new)
+        if deviance is not None and abs(dev_new - deviance) / (abs(dev_new) + 0.1) < tol:
+            deviance, converged = dev_new, True
+            break
+        deviance = dev_new
+
+    if status is None:
+        status = result.status if converged else "user_limit"
+    stats = result.stats if result is not None else {}
+    convergence = {
+        "method": "irls",
+        "family": family.name,
+        "link": link.name,
+        "iterations": len(history),
+        "converged": converged,
+        "deviance": deviance,
+        "history": history,
+        "inner_iterations": inner_iters,
+    }
+    y_dual = warm_start.get("y") if warm_start is not None and x is not None else None
+    return IRLSResult(x=x, y=y_dual, status=status, stats=stats, convergence=convergence)
@@ -0,0 +1,282 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Optional
+from .qp import QPProblem, expand_solution
+
+# Largest design for which the constant is searched with a dense eigendecomposition of `D'D`, and
+# centered by eliminating a single coefficient, see `_null_space`.
+DENSE_MAX_COEFS = 500
+
+
+class Reparameterization:
+    """
+    Linear map `b = M z` from reduced to full spline coefficients removing redundant intercepts.
+
+    Every spline whose columns can represent a constant carries its own intercept. One of them
+    (preferably a `Constant` term) keeps its full basis and holds the single global intercept; the
+    others are centered, i.e. their fitted values sum to zero over the training rows. The centering
+    row `c b = 0` is absorbed into a sparse null-space basis `Z`, so a centered spline with `p`
+    coefficients is optimized over `p - 1` free parameters.
+    """
+    def __init__(self, maps: List[sp.csr_matrix], centered: List[str], intercept: Optional[str]):
+        """
+        Initialize the Reparameterization.
+
+        Parameters
+        ----------
+        maps : List[sp.csr_matrix]
+            Per spline matrices mapping reduced to full coefficients.
+        centered : List[str]
+            Tags of the centered splines.
+        intercept : Optional[str]
+            Tag of the spline carrying the global intercept, None if no spline can represent a constant.
+        """
+        self.maps = maps
+        self.M = sp.block_diag(maps, format='csr')
+        self.centered = centered
+        self.intercept = intercept
+
+    @property
+    def n_removed(self) -> int:
+        """
+        Returns the number of redundant parameters removed.
+
+        Returns
+        -------
+        int
+            `n_coefs - n_reduced`.
+        """
+        return self.M.shape[0] - self.M.shape[1]
+
+    def reduce(self, qp: QPProblem) -> QPProblem:
+        """
+        Rewrite a compiled QP over the reduced coefficients, see `QPProblem.substitute`.
+
+        Parameters
+        ----------
+        qp : QPProblem
+            The problem over the full coefficients.
+
+        Returns
+        -------
+        QPProblem
+            The problem over `z`.
+        """
+        return qp.substitute(self.M)
+
+    def expand(self, z: Optional[np.ndarray], n_variables: int) -> Optional[np.ndarray]:
+        """
+        Map a reduced solution back to the full coefficients.
+
+        Parameters
+        ----------
+        z : Optional[np.ndarray]
+            Solution of the reduced problem, or None.
+        n_variables : int
+            Number of variables of the full problem, including auxiliary variables.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The full solution, or None if `z` is None.
+        """
+        return expand_solution(self.M, z, n_variables)
+
+    def __repr__(self):
+        return f"Reparameterization(centered={self.centered}, intercept={self.intercept}, n_removed={self.n_removed})"
+
+
+def identify(splines: List["Spline"], designs: List[sp.csr_matrix], tol: float = 1e-8) -> Reparameterization:
+    """
+    Build the identifiability reparameterization of an additive model.
+
+    A spline takes part when a constant lies in the span of its design and its constraints and
+    penalties do not see that constant (e.g. `Monotonic`, `Convex`, `Smooth`). Splines with `Anchor`,
+    `Bound`, `Ridge` or `Lasso` acting on their level keep their full basis, so the optimum is unchanged.
+
+    Parameters
+    ----------
+    splines : List[Spline]
+        The initialized model splines.
+    designs : List[sp.csr_matrix]
+        The sparse design matrix of every spline on the training rows.
+    tol : float, default=1e-8
+        Relative tolerance used to decide whether a spline represents constants.
+
+    Returns
+    -------
+    Reparameterization
+        The map from reduced to full coefficients.
+    """
+    candidates = []
+    for i, (spline, D) in enumerate(zip(splines, designs)):
+        if _shift_direction(spline, D, tol) is not None:
+            candidates.append(i)
+
+    host = None
+    if candidates:
+        constants = [i for i in candidates if type(splines[i]).__name__ == "Constant"]
+        host = constants[0] if constants else candidates[0]
+
+    maps = []
+    centered = []
+    for i, D in enumerate(designs):
+        p = D.shape[1]
+        if i in candidates and i != host and p > 1:
+            maps.append(_null_space(np.asarray(D.mean(axis=0)).ravel()))
+            centered.append(splines[i].tag)
+        else:
+            maps.append(sp.identity(p, format='csr'))
+
+    return Reparameterization(maps, centered, splines[host].tag if host is not None else None)
+
+
+def _shift_direction(spline: "Spline", D: sp.csr_matrix, tol: float) -> Optional[np.ndarray]:
+    """
+    Find coefficients `w` with `D w = 1` that the constraints and penalties of the spline ignore.
+
+    Designs may be rank deficient (e.g. a `PiecewiseLinear` hinge at the minimum of `x` duplicates the
+    linear column), so the constant can have several representations; the one minimizing the
+    constraint and penalty rows is searched in the null space of `D`.
+
+    Parameters
+    ----------
+    spline : Spline
+        The initialized spline.
+    D : sp.csr_matrix
+        The spline design.
+    tol : float
+        Relative tolerance on the residuals.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The coefficients representing the constant 1, or None if the design cannot represent it
+        or every representation is seen by a constraint or penalty.
+    """
+    rows = [c.build_matrix(spline)[0] for c in spline.constraints]
+    rows += [p.build_matrix(spline) for p in getattr(spline, 'penalties', [])]
+    rows = [sp.csr_matrix(r) for r in rows if r.shape[0]]
+    return _constant_direction(D, sp.vstack(rows, format='csr') if rows else None, tol)
+
+
+def _constant_direction(D: sp.csr_matrix, K: Optional[sp.csr_matrix], tol: float) -> Optional[np.ndarray]:
+    """
+    Find coefficients `w` with `D w = 1` and `K w = 0`, see `_shift_direction`.
+
+    The closed form candidates of `_closed_form_directions` are tried first. Otherwise the minimum norm
+    solution is corrected in the null space of `D`, which needs a dense eigendecomposition of `D'D`; it is
+    only attempted for designs of at most `DENSE_MAX_COEFS` columns, larger ones are treated as unable to
+    represent the constant.
+
+    Parameters
+    ----------
+    D : sp.csr_matrix
+        The design.
+    K : Optional[sp.csr_matrix]
+        The rows that must not see the constant, None if there are none.
+    tol : float
+        Relative tolerance on the residuals.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The coefficients representing the constant 1, or None if there are none.
+    """
+    n, p = D.shape
+    if n == 0:
+        return None
+    ones = np.ones(n)
+    for w in _closed_form_directions(D):
+        if np.linalg.norm(D @ w - ones) <= np.sqrt(tol) * np.sqrt(n):
+            if K is None or K.shape[0] == 0 or np.abs(K @ w).max() <= np.sqrt(tol):
+                return w
+    if p > DENSE_MAX_COEFS:
+        return None
+
+    gram = (D.T @ D).toarray()
+    lam, U = np.linalg.eigh(gram)
+    keep = lam > max(lam.max(), 0.0) * tol
+    w = U[:, keep] @ ((U[:, keep].T @ (D.T @ ones)) / lam[keep])
+    if np.linalg.norm(D @ w - ones) > np.sqrt(tol) * np.sqrt(n):
+        return None
+
+    if K is None or K.shape[0] == 0:
+        return w
+    N = U[:, ~keep]
+    if N.shape[1]:
+        t = np.linalg.lstsq(K @ N, -(K @ w), rcond=None)[0]
+        w = w + N @ t
+    if np.abs(K @ w).max() > np.sqrt(tol):
+        return None
+    return w
+
+
+def _closed_form_directions(D: sp.csr_matrix) -> List[np.ndarray]:
+    """
+    Candidate representations of the constant read off the structure of the design.
+
+    - all ones: the basis is a partition of unity (one-hot `Factor` and `StepSpline`, B-spline, periodic
+      B-spline and hat bases), also when it is replicated over `by` classes.
+    - the indicator of the columns whose non-zeros all equal 1: an intercept column, or one intercept
+      per `by` class.
+
+    Parameters
+    ----------
+    D : sp.csr_matrix
+        The design.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The candidates, to be checked against `D w = 1`.
+    """
+    D = sp.csc_matrix(D)
+    p = D.shape[1]
+    candidates = [np.ones(p)]
+    counts = np.diff(D.indptr)
+    columns = np.repeat(np.arange(p), counts)
+    binary = (counts > 0) & (np.bincount(columns[D.data != 1.0], minlength=p) == 0)
+    if binary.any() and not binary.all():
+        candidates.append(binary.astype(float))
+    return candidates
+
+
+def _null_space(c: np.ndarray) -> sp.csr_matrix:
+    """
+    Sparse basis of the null space of the row vector `c`.
+
+    Up to `DENSE_MAX_COEFS` coefficients, the coefficient `k` with the largest `|c_k|` is eliminated:
+    `b_k = -sum_{j != k} c_j b_j / c_k`, the others are free. This couples `b_k` to all others, which would
+    densify the Gram matrix of a large factor, so larger blocks chain consecutive coefficients `i < j` with
+    non-zero `c` by the columns `c_j e_i - c_i e_j` (scaled to a largest entry of 1) instead, keeping at most
+    two non-zeros per column at the price of a worse conditioning; coefficients with `c_k = 0` stay free.
+
+    Parameters
+    ----------
+    c : np.ndarray
+        The centering row of length `p`, with at least one non-zero.
+
+    Returns
+    -------
+    sp.csr_matrix
+        Matrix `Z` of shape `(p, p - 1)` with `c Z = 0`.
+    """
+    p = len(c)
+    if p <= DENSE_MAX_COEFS:
+        k = int(np.argmax(np.abs(c)))
+        free = np.delete(np.arange(p), k)
+        rows = np.concatenate([free, np.full(p - 1, k)])
+        cols = np.concatenate([np.arange(p - 1), np.arange(p - 1)])
+        data = np.concatenate([np.ones(p - 1), -c[free] / c[k]])
+        return sp.csr_matrix((data, (rows, cols)), shape=(p, p - 1))
+
+    nonzero = np.flatnonzero(c)
+    free = np.flatnonzero(c == 0)
+    i, j = nonzero[:-1], nonzero[1:]
+    scale = np.maximum(np.abs(c[i]), np.abs(c[j]))
+    m = len(i)
+    rows = np.concatenate([i, j, free])
+    cols = np.concatenate([np.arange(m), np.arange(m), m + np.arange(len(free))])
+    data = np.concatenate([c[j] / scale, -c[i] / scale, np.ones(len(free))])
+    return sp.csr_matrix((data, (rows, cols)), shape=(p, p - 1))
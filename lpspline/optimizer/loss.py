@@ -0,0 +1,196 @@
+import numpy as np
+import cvxpy as cp
+import scipy.sparse as sp
+from typing import List, Optional, Sequence, Tuple, Union
+
+LOSSES = ("squared", "quantile", "huber", "l1")
+
+
+def check_quantiles(quantiles: Optional[Sequence[float]]) -> np.ndarray:
+    """
+    Validate the quantile levels of a quantile fit.
+
+    Parameters
+    ----------
+    quantiles : Optional[Sequence[float]]
+        The quantile levels, e.g. `(0.1, 0.5, 0.9)`.
+
+    Returns
+    -------
+    np.ndarray
+        The sorted unique levels.
+
+    Raises
+    ------
+    ValueError
+        If no level is given or a level is outside `(0, 1)`.
+    """
+    if quantiles is None:
+        raise ValueError("The quantile loss requires `quantiles`, e.g. quantiles=(0.1, 0.5, 0.9).")
+    levels = np.unique(np.atleast_1d(np.asarray(quantiles, dtype=float)))
+    if len(levels) == 0 or levels[0] <= 0 or levels[-1] >= 1:
+        raise ValueError(f"Quantiles must lie in (0, 1), got {list(quantiles)}.")
+    return levels
+
+
+def pinball_loss(residuals: cp.Expression, quantiles: Union[np.ndarray, cp.Parameter]) -> cp.Expression:
+    """
+    Sum of the pinball losses `tau * max(r, 0) + (1 - tau) * max(-r, 0)` of every quantile column.
+
+    Written as `(tau - 1/2) r + |r| / 2`, which is affine in `tau`: the levels can be a CVXPY parameter
+    and the problem re-solved for another level without being compiled again.
+
+    Parameters
+    ----------
+    residuals : cp.Expression
+        The residuals `y - f` of shape `(n_samples, n_quantiles)`.
+    quantiles : Union[np.ndarray, cp.Parameter]
+        The quantile level `tau` of every column.
+
+    Returns
+    -------
+    cp.Expression
+        The scalar loss, piecewise linear in the residuals.
+    """
+    return cp.sum(residuals @ (quantiles - 0.5)) + 0.5 * cp.sum(cp.abs(residuals))
+
+
+def quantile_problem(D: sp.csr_matrix, y: np.ndarray, quantiles: Union[np.ndarray, cp.Parameter], A: sp.csr_matrix,
+                     lower: np.ndarray, upper: np.ndarray, penalties: List[Tuple[str, float, sp.csr_matrix]],
+                     non_crossing: bool = False) -> Tuple[cp.Problem, cp.Variable]:
+    """
+    Build the problem of one or several quantile curves over a shared design.
+
+    Every quantile has its own column of the coefficient matrix `B`; the design, the constraint
+    system and the penalty matrices apply to all columns. With `non_crossing` adjacent curves are
+    ordered on the rows of the design, `D B[:, k + 1] >= D B[:, k]`.
+
+    Parameters
+    ----------
+    D : sp.csr_matrix
+        The stacked design of shape `(n_samples, n_coefs)`.
+    y : np.ndarray
+        The target values.
+    quantiles : Union[np.ndarray, cp.Parameter]
+        The sorted quantile levels, or a parameter of shape `(1,)` to solve one level at a time.
+    A : sp.csr_matrix
+        The constraint matrix over the coefficients, see `constraint_system`.
+    lower : np.ndarray
+        The row-wise lower bounds of the constraints.
+    upper : np.ndarray
+        The row-wise upper bounds of the constraints.
+    penalties : List[Tuple[str, float, sp.csr_matrix]]
+        The penalties, see `penalty_system`.
+    non_crossing : bool, default=False
+        Whether to order the curves of adjacent quantiles.
+
+    Returns
+    -------
+    Tuple[cp.Problem, cp.Variable]
+        The problem and the coefficient matrix `B` of shape `(n_coefs, n_quantiles)`.
+    """
+    K = quantiles.shape[0]
+    B = cp.Variable((D.shape[1], K), name="quantile_coefficients")
+    fitted = D @ B
+    objective = pinball_loss(np.repeat(y[:, None], K, axis=1) - fitted, quantiles) + _penalty_terms(B, penalties)
+    constraints = _constraint_terms(B, A, lower, upper)
+    if non_crossing and K > 1:
+        constraints.append(fitted[:, 1:] >= fitted[:, :-1])
+    return cp.Problem(cp.Minimize(objective), constraints), B
+
+
+def check_delta(delta: float) -> float:
+    """
+    Validate the threshold of the Huber loss.
+
+    Parameters
+    ----------
+    delta : float
+        The residual size where the loss turns from quadratic to linear.
+
+    Returns
+    -------
+    float
+        The threshold.
+
+    Raises
+    ------
+    ValueError
+        If the threshold is not positive.
+    """
+    if delta is None or not delta > 0:
+        raise ValueError(f"The Huber loss requires a positive `delta`, got {delta}.")
+    return float(delta)
+
+
+def robust_problem(D: sp.csr_matrix, y: np.ndarray, loss: str, A: sp.csr_matrix, lower: np.ndarray, upper: np.ndarray,
+                   penalties: List[Tuple[str, float, sp.csr_matrix]], delta: float = 1.0) -> Tuple[cp.Problem, cp.Variable]:
+    """
+    Build the problem of a robust loss over the stacked design.
+
+    The loss is one vectorized atom over all residuals: `sum(huber(r, delta))`, quadratic `r^2` up to `delta`
+    and linear `2 delta |r| - delta^2` beyond, or `||r||_1`. Both bound the influence of outlying rows,
+    which the squared loss does not.
+
+    Parameters
+    ----------
+    D : sp.csr_matrix
+        The stacked design of shape `(n_samples, n_coefs)`.
+    y : np.ndarray
+        The target values.
+    loss : str
+        `huber` or `l1`.
+    A : sp.csr_matrix
+        The constraint matrix over the coefficients, see `constraint_system`.
+    lower : np.ndarray
+        The row-wise lower bounds of the constraints.
+    upper : np.ndarray
+        The row-wise upper bounds of the constraints.
+    penalties : List[Tuple[str, float, sp.csr_matrix]]
+        The penalties, see `penalty_system`.
+    delta : float, default=1.0
+        The threshold of the Huber loss, in units of the target.
+
+    Returns
+    -------
+    Tuple[cp.Problem, cp.Variable]
+        The problem and the coefficient vector `b` of shape `(n_coefs,)`.
+
+    Raises
+    ------
+    ValueError
+        If the loss is not a robust loss.
+    """
+    b = cp.Variable(D.shape[1], name="robust_coefficients")
+    residuals = y - D @ b
+    if loss == "huber":
+        objective = cp.sum(cp.huber(residuals, check_delta(delta)))
+    elif loss == "l1":
+        objective = cp.norm1(residuals)
+    else:
+        raise ValueError(f"Unknown robust loss '{loss}'. Use 'huber' or 'l1'.")
+    objective += _penalty_terms(b, penalties)
+    return cp.Problem(cp.Minimize(objective), _constraint_terms(b, A, lower, upper)), b
+
+
+def _penalty_terms(B: cp.Variable, penalties: List[Tuple[str, float, sp.csr_matrix]]) -> cp.Expression:
+    """Sum the penalties of `penalty_system` applied to every column of the coefficients."""
+    objective = cp.Constant(0.0)
+    for norm, alpha, W in penalties:
+        objective += alpha * (cp.sum_squares(W @ B) if norm == "l2" else cp.sum(cp.abs(W @ B)))
+    return objective
+
+
+def _constraint_terms(B: cp.Variable, A: sp.csr_matrix, lower: np.ndarray, upper: np.ndarray) -> List[cp.Constraint]:
+    """Build the finite sides of `lower <= A B <= upper` for a coefficient vector or every column of a matrix."""
+    def bound(values: np.ndarray) -> np.ndarray:
+        return values if B.ndim == 1 else np.repeat(values[:, None], B.shape[1], axis=1)
+
+    constraints = []
+    if A.shape[0]:
+        has_lower, has_upper = np.isfinite(lower), np.isfinite(upper)
+        if has_lower.any():
+            constraints.append(A[has_lower] @ B >= bound(lower[has_lower]))
+        if has_upper.any():
+            constraints.append(A[has_upper] @ B <= bound(upper[has_upper]))
+    return constraints
@@ -0,0 +1,151 @@
+import copy
+import polars as pl
+from typing import List, Optional
+
+# Bytes of one sparse non-zero: float64 value plus int32 index.
+_BYTES_PER_NNZ = 12
+# Rough number of copies CVXPY keeps of each coefficient matrix while canonicalizing.
+_CVXPY_OVERHEAD = 3
+
+ENGINES = ("cvxpy", "qp", "suffstat", "backfit")
+
+
+def plan_splines(splines: List["Spline"], X: pl.DataFrame, initialized: bool = False) -> pl.DataFrame:
+    """
+    Estimate the optimization problem size contributed by every spline, without building CVXPY objects.
+
+    Parameters
+    ----------
+    splines : List[Spline]
+        The model splines.
+    X : pl.DataFrame
+        The training feature frame.
+    initialized : bool, default=False
+        Whether the splines were already initialized on `X`. Otherwise copies are initialized,
+        leaving the model untouched.
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per spline with the number of variables, constraint rows and design non-zeros,
+        and the estimated peak memory in bytes for every engine (`memory_<engine>` columns).
+    """
+    n = len(X)
+    rows = []
+    for spline in splines:
+        if not initialized:
+            spline = copy.deepcopy(spline)
+            x = X[spline.term].to_numpy()
+            if spline.by is not None:
+                spline.init_spline(x, by=X[spline.by].to_numpy())
+            else:
+                spline.init_spline(x)
+
+        p = spline.n_basis
+        k = spline.n_by_classes
+        n_constraints = sum(c.size(spline) for c in spline.constraints)
+        design_nnz = n * spline._basis_nnz_per_row()
+        rows.append({
+            "tag": spline.tag,
+            "spline": type(spline).__name__,
+            "variables": p * k,
+            "constraints": n_constraints,
+            "design_nnz": design_nnz,
+            "_basis_bytes": n * p * 8,
+            "_constraint_nnz": n_constraints * p,
+            "_by_classes": k,
+        })
+
+    # Columns of D'D coupled to a coefficient: one basis block per spline (by classes do not mix)
+    coupled = sum(r["variables"] // r["_by_classes"] for r in rows)
+    for r in rows:
+        basis_bytes = r.pop("_basis_bytes")
+        constraint_bytes = r.pop("_constraint_nnz") * _BYTES_PER_NNZ * _CVXPY_OVERHEAD
+        k = r.pop("_by_classes")
+        # The expression path multiplies the basis with every by class column before masking.
+        by_bytes = n * k * 8 * 2 if k > 1 else 0
+        r["memory_cvxpy"] = int(
+            basis_bytes + by_bytes + constraint_bytes
+            + r["design_nnz"] * k * _BYTES_PER_NNZ * _CVXPY_OVERHEAD
+        )
+        # The direct QP keeps the sparse design, its transpose and the sparse D'D.
+        r["memory_qp"] = int(
+            basis_bytes + constraint_bytes / _CVXPY_OVERHEAD
+            + 2 * r["design_nnz"] * _BYTES_PER_NNZ
+            + r["variables"] * coupled * _BYTES_PER_NNZ
+        )
+        # Sufficient statistics only keep the sparse design and this term's rows of the sparse Gram matrix.
+        r["memory_suffstat"] = int(
+            basis_bytes + constraint_bytes
+            + r["design_nnz"] * _BYTES_PER_NNZ
+            + r["variables"] * coupled * _BYTES_PER_NNZ * _CVXPY_OVERHEAD
+        )
+        # Backfitting keeps the sparse design, its transpose and one dense Gram block per term.
+        r["memory_backfit"] = int(
+            basis_bytes + constraint_bytes / _CVXPY_OVERHEAD
+            + 2 * r["design_nnz"] * _BYTES_PER_NNZ
+            + r["variables"] ** 2 * 8
+        )
+
+    schema = {
+        "tag": pl.Utf8, "spline": pl.Utf8, "variables": pl.Int64, "constraints": pl.Int64,
+        "design_nnz": pl.Int64, "memory_cvxpy": pl.Int64, "memory_qp": pl.Int64, "memory_suffstat": pl.Int64,
+        "memory_backfit": pl.Int64,
+    }
+    return pl.DataFrame(rows, schema=schema)
+
+
+def estimate_memory(plan: pl.DataFrame, engine: str, n_samples: int) -> int:
+    """
+    Estimate the peak memory of solving the planned problem with the given engine.
+
+    Parameters
+    ----------
+    plan : pl.DataFrame
+        The output of `plan_splines`.
+    engine : str
+        The engine name, one of `ENGINES`.
+    n_samples : int
+        The number of training rows.
+
+    Returns
+    -------
+    int
+        The estimated peak memory in bytes.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Available engines: {ENGINES}")
+    # Target, residual and prediction vectors.
+    return int(plan[f"memory_{engine}"].sum() + 3 * n_samples * 8)
+
+
+def format_plan(plan: pl.DataFrame, engine: str, n_samples: int, max_memory: Optional[float] = None) -> str:
+    """
+    Render the per term breakdown of a plan for error messages.
+
+    Parameters
+    ----------
+    plan : pl.DataFrame
+        The output of `plan_splines`.
+    engine : str
+        The engine whose memory estimate is reported.
+    n_samples : int
+        The number of training rows.
+    max_memory : Optional[float], default=None
+        The memory budget in bytes, reported when provided.
+
+    Returns
+    -------
+    str
+        A multi-line human readable breakdown.
+    """
+    lines = [f"{'Tag':<15} | {'Spline':<16} | {'Variables':>10} | {'Constraints':>12} | {'Design nnz':>12} | {'Memory [MB]':>12}"]
+    for r in plan.iter_rows(named=True):
+        lines.append(
+            f"{str(r['tag']):<15} | {r['spline']:<16} | {r['variables']:>10} | {r['constraints']:>12} | "
+            f"{r['design_nnz']:>12} | {r[f'memory_{engine}'] / 1e6:>12.1f}"
+        )
+    total = estimate_memory(plan, engine, n_samples)
+    budget = f" (budget {max_memory / 1e6:.1f} MB)" if max_memory is not None else ""
+    lines.append(f"Estimated peak memory with engine '{engine}': {total / 1e6:.1f} MB{budget}")
+    return "\n".join(lines)
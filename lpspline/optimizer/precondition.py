@@ -0,0 +1,113 @@
+import numpy as np
+import polars as pl
+import scipy.sparse as sp
+from typing import List
+from .qp import QPProblem
+
+
+class Preconditioner:
+    """
+    Diagonal-plus-centering change of variables `b = M z` improving the conditioning of a QP.
+
+    Within every spline block holding a constant column (the intercept of `Linear`, `PiecewiseLinear`,
+    `CyclicSpline`...) the other columns are centered on that column, then every column is scaled to unit
+    root mean square. The map is invertible, so the optimum is unchanged; only the solver sees better
+    scaled columns.
+    """
+    def __init__(self, maps: List[sp.csr_matrix], scalings: pl.DataFrame):
+        """
+        Initialize the Preconditioner.
+
+        Parameters
+        ----------
+        maps : List[sp.csr_matrix]
+            Per spline square matrices mapping the preconditioned to the original coefficients.
+        scalings : pl.DataFrame
+            The applied shift and scale of every column, see `precondition`.
+        """
+        self.maps = maps
+        self.M = sp.block_diag(maps, format='csr')
+        self.scalings = scalings
+
+    def apply(self, qp: QPProblem) -> QPProblem:
+        """
+        Rewrite a compiled QP over the preconditioned variables and equilibrate its constraint rows.
+
+        Parameters
+        ----------
+        qp : QPProblem
+            The problem over the original coefficients.
+
+        Returns
+        -------
+        QPProblem
+            The preconditioned problem, see `QPProblem.substitute`.
+        """
+        pre = qp.substitute(self.M)
+        if pre.n_constraints == 0:
+            return pre
+        A = sp.csr_matrix(pre.A)
+        row_norm = np.zeros(A.shape[0])
+        np.maximum.at(row_norm, np.repeat(np.arange(A.shape[0]), np.diff(A.indptr)), np.abs(A.data))
+        row_norm[row_norm == 0] = 1.0
+        D = sp.diags(1.0 / row_norm)
+        return QPProblem(
+            P=pre.P, q=pre.q, A=sp.csc_matrix(D @ A), l=pre.l / row_norm, u=pre.u / row_norm,
+            blocks=pre.blocks, constant=pre.constant,
+        )
+
+    def __repr__(self):
+        return f"Preconditioner(n_columns={self.M.shape[0]})"
+
+
+def precondition(splines: List["Spline"], designs: List[sp.csr_matrix], tol: float = 1e-12) -> Preconditioner:
+    """
+    Compute the column centering and scaling of every design block.
+
+    Parameters
+    ----------
+    splines : List[Spline]
+        The initialized model splines.
+    designs : List[sp.csr_matrix]
+        The design of every spline, in the coordinates the preconditioner applies to.
+    tol : float, default=1e-12
+        Relative variance under which a column is considered constant.
+
+    Returns
+    -------
+    Preconditioner
+        The change of variables and a frame with one row per column: the spline `tag`, the column
+        index, the `shift` subtracted from the column and the `scale` it was divided by.
+    """
+    maps = []
+    tags, columns, shifts, scales = [], [], [], []
+    for spline, D in zip(splines, designs):
+        D = sp.csc_matrix(D)
+        p = D.shape[1]
+        mean = np.asarray(D.mean(axis=0)).ravel()
+        mean_sq = np.asarray(D.multiply(D).mean(axis=0)).ravel()
+        var = np.maximum(mean_sq - mean ** 2, 0.0)
+        constant = (var <= tol * mean_sq) & (mean != 0)
+
+        shift = np.zeros(p)
+        rms = np.sqrt(mean_sq)
+        C = sp.identity(p, format='csr')
+        if constant.any():
+            j0 = int(np.flatnonzero(constant)[0])
+            shift[~constant] = mean[~constant]
+            rms[~constant] = np.sqrt(var[~constant])
+            # column k becomes d_k - shift_k = d_k - (shift_k / value_j0) d_j0
+            C = C - sp.csr_matrix((shift / mean[j0], (np.full(p, j0), np.arange(p))), shape=(p, p))
+        scale = np.where(rms > 0, rms, 1.0)
+        maps.append(sp.csr_matrix(C @ sp.diags(1.0 / scale)))
+
+        tags += [spline.tag] * p
+        columns += list(range(p))
+        shifts += list(shift)
+        scales += list(scale)
+
+    scalings = pl.DataFrame(
+        {"tag": tags, "column": columns, "shift": shifts, "scale": scales},
+        schema={"tag": pl.Utf8, "column": pl.Int64, "shift": pl.Float64, "scale": pl.Float64},
+    )
+    return Preconditioner(maps, scalings)
@@ -0,0 +1,450 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Any, Dict, List, Optional, Tuple
+
+# Defaults matching the OSQP settings CVXPY uses, so both engines reach the same accuracy.
+OSQP_DEFAULTS = {"eps_abs": 1e-5, "eps_rel": 1e-5, "max_iter": 10000, "polishing": True, "verbose": False}
+
+# OSQP status strings mapped to the CVXPY status vocabulary used by the model summary.
+_OSQP_STATUS = {
+    "solved": "optimal",
+    "solved inaccurate": "optimal_inaccurate",
+    "primal infeasible": "infeasible",
+    "primal infeasible inaccurate": "infeasible_inaccurate",
+    "dual infeasible": "unbounded",
+    "dual infeasible inaccurate": "unbounded_inaccurate",
+    "maximum iterations reached": "user_limit",
+    "run time limit reached": "user_limit",
+}
+
+_CLARABEL_STATUS = {
+    "Solved": "optimal",
+    "AlmostSolved": "optimal_inaccurate",
+    "PrimalInfeasible": "infeasible",
+    "AlmostPrimalInfeasible": "infeasible_inaccurate",
+    "DualInfeasible": "unbounded",
+    "AlmostDualInfeasible": "unbounded_inaccurate",
+    "MaxIterations": "user_limit",
+    "MaxTime": "user_limit",
+}
+
+
+class QPProblem:
+    """
+    Sparse quadratic program `min 1/2 x'Px + q'x  s.t.  l <= Ax <= u` compiled from an additive model.
+
+    The first entries of `x` are the flattened spline coefficients, one slice per spline in `blocks`;
+    auxiliary variables (e.g. for L1 penalties) follow.
+    """
+    def __init__(self, P: sp.csc_matrix, q: np.ndarray, A: sp.csc_matrix, l: np.ndarray, u: np.ndarray,
+                 blocks: List[slice], constant: float = 0.0):
+        """
+        Initialize the QPProblem.
+
+        Parameters
+        ----------
+        P : sp.csc_matrix
+            Symmetric positive semi-definite quadratic cost matrix.
+        q : np.ndarray
+            Linear cost vector.
+        A : sp.csc_matrix
+            Constraint matrix.
+        l : np.ndarray
+            Constraint lower bounds, `-inf` when absent.
+        u : np.ndarray
+            Constraint upper bounds, `inf` when absent.
+        blocks : List[slice]
+            Position of every spline coefficient vector in `x`.
+        constant : float, default=0.0
+            Constant objective term, so that the objective equals the original loss.
+        """
+        self.P = P
+        self.q = q
+        self.A = A
+        self.l = l
+        self.u = u
+        self.blocks = blocks
+        self.constant = constant
+
+    @property
+    def n_variables(self) -> int:
+        """
+        Returns the number of optimization variables.
+
+        Returns
+        -------
+        int
+            The length of `x`.
+        """
+        return self.P.shape[0]
+
+    @property
+    def n_constraints(self) -> int:
+        """
+        Returns the number of constraint rows.
+
+        Returns
+        -------
+        int
+            The number of rows of `A`.
+        """
+        return self.A.shape[0]
+
+    def objective(self, x: np.ndarray) -> float:
+        """
+        Evaluates the objective at `x`.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The optimization variables.
+
+        Returns
+        -------
+        float
+            `1/2 x'Px + q'x + constant`.
+        """
+        return float(0.5 * x @ (self.P @ x) + self.q @ x + self.constant)
+
+    def substitute(self, M: sp.spmatrix) -> "QPProblem":
+        """
+        Rewrite the problem for the change of variables `b = M z` of the spline coefficients.
+
+        Auxiliary variables following the coefficients are kept unchanged.
+
+        Parameters
+        ----------
+        M : sp.spmatrix
+            Matrix of shape `(n_coefs, n_new)` mapping the new variables to the coefficients.
+
+        Returns
+        -------
+        QPProblem
+            The problem over `z`. Its `blocks` still locate the splines in the original coefficients.
+        """
+        n_aux = self.n_variables - M.shape[0]
+        T = sp.block_diag([M, sp.identity(n_aux)], format='csc') if n_aux else sp.csc_matrix(M)
+        return QPProblem(
+            P=sp.csc_matrix(T.T @ self.P @ T), q=T.T @ self.q, A=sp.csc_matrix(self.A @ T), l=self.l, u=self.u,
+            blocks=self.blocks, constant=self.constant,
+        )
+
+    def __repr__(self):
+        return f"QPProblem(n_variables={self.n_variables}, n_constraints={self.n_constraints})"
+
+
+def compile_qp(splines: List["Spline"], designs: List[sp.csr_matrix], y: np.ndarray) -> QPProblem:
+    """
+    Compile splines, penalties and constraints straight into sparse QP matrices.
+
+    The squared loss `||D b - y||^2` contributes `P = 2 D'D` and `q = -2 D'y`. L2 penalties add
+    `2 alpha W'W` to `P`; L1 penalties `alpha ||W b||_1` introduce auxiliary variables `t >= |W b|`.
+
+    Parameters
+    ----------
+    splines : List[Spline]
+        The initialized model splines.
+    designs : List[sp.csr_matrix]
+        The sparse design matrix of every spline, see `Spline._build_design`.
+    y : np.ndarray
+        The target values.
+
+    Returns
+    -------
+    QPProblem
+        The compiled problem.
+    """
+    y = np.asarray(y, dtype=float)
+    sizes = [d.shape[1] for d in designs]
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    blocks = [slice(int(offsets[i]), int(offsets[i + 1])) for i in range(len(sizes))]
+    n_coefs = int(offsets[-1])
+
+    D = sp.hstack(designs, format='csr')
+    P_blocks = [2.0 * (D.T @ D)]
+    q_parts = [-2.0 * (D.T @ y)]
+
+    A_c, l_c, u_c = constraint_system(splines, blocks, n_coefs)
+    rows, lower, upper = ([A_c], [l_c], [u_c]) if A_c.shape[0] else ([], [], [])
+    l1_rows, l1_alphas = [], []
+
+    for norm, alpha, W in penalty_system(splines, blocks, n_coefs):
+        if norm == "l2":
+            P_blocks.append(2.0 * alpha * (W.T @ W))
+        else:
+            l1_rows.append(W)
+            l1_alphas.append(np.full(W.shape[0], alpha))
+
+    P = sp.csc_matrix(sum(P_blocks[1:], P_blocks[0]))
+    q = np.concatenate(q_parts)
+
+    n_aux = sum(W.shape[0] for W in l1_rows)
+    if n_aux:
+        # t - W b >= 0 and t + W b >= 0, with cost alpha * t
+        W_all = sp.vstack(l1_rows, format='csr')
+        I = sp.identity(n_aux, format='csr')
+        rows = [sp.hstack([r, sp.csr_matrix((r.shape[0], n_aux))]) for r in rows]
+        rows += [sp.hstack([-W_all, I]), sp.hstack([W_all, I])]
+        lower += [np.zeros(n_aux), np.zeros(n_aux)]
+        upper += [np.full(n_aux, np.inf), np.full(n_aux, np.inf)]
+        P = sp.block_diag([P, sp.csc_matrix((n_aux, n_aux))], format='csc')
+        q = np.concatenate([q, np.concatenate(l1_alphas)])
+
+    n_vars = n_coefs + n_aux
+    A = sp.vstack(rows, format='csc') if rows else sp.csc_matrix((0, n_vars))
+    l = np.concatenate(lower) if lower else np.zeros(0)
+    u = np.concatenate(upper) if upper else np.zeros(0)
+    return QPProblem(P=P, q=q, A=A, l=l, u=u, blocks=blocks, constant=float(y @ y))
+
+
+def constraint_system(splines: List["Spline"], blocks: List[slice], n_coefs: int):
+    """
+    Stack the constraints of all splines into one system over the global coefficient vector.
+
+    Parameters
+    ----------
+    splines : List[Spline]
+        The initialized model splines.
+    blocks : List[slice]
+        Position of every spline coefficient vector in the global vector.
+    n_coefs : int
+        Total number of coefficients.
+
+    Returns
+    -------
+    Tuple[sp.csr_matrix, np.ndarray, np.ndarray]
+        The matrix `A` of shape `(n_rows, n_coefs)` and the row-wise `lower` and `upper` bounds.
+    """
+    rows, lower, upper = [], [], []
+    for spline, block in zip(splines, blocks):
+        for c in spline.constraints:
+            A_c, l_c, u_c = c.build_matrix(spline)
+            rows.append(_embed(A_c, block.start, n_coefs))
+            lower.append(l_c)
+            upper.append(u_c)
+    if not rows:
+        return sp.csr_matrix((0, n_coefs)), np.zeros(0), np.zeros(0)
+    return sp.vstack(rows, format='csr'), np.concatenate(lower), np.concatenate(upper)
+
+
+def penalty_system(splines: List["Spline"], blocks: List[slice], n_coefs: int) -> List[Tuple[str, float, sp.csr_matrix]]:
+    """
+    Collect the penalties of all splines as matrices over the global coefficient vector.
+
+    Parameters
+    ----------
+    splines : List[Spline]
+        The initialized model splines.
+    blocks : List[slice]
+        Position of every spline coefficient vector in the global vector.
+    n_coefs : int
+        Total number of coefficients.
+
+    Returns
+    -------
+    List[Tuple[str, float, sp.csr_matrix]]
+        The `norm`, `alpha` and matrix `W` of shape `(n_rows, n_coefs)` of every penalty, whose cost is
+        `alpha ||W b||_2^2` for `l2` and `alpha ||W b||_1` for `l1`.
+    """
+    penalties = []
+    for spline, block in zip(splines, blocks):
+        for p in getattr(spline, 'penalties', []):
+            penalties.append((p.norm, float(p.alpha), _embed(p.build_matrix(spline), block.start, n_coefs)))
+    return penalties
+
+
+def expand_solution(M: sp.spmatrix, z: Optional[np.ndarray], n_variables: int) -> Optional[np.ndarray]:
+    """
+    Map the solution of a problem rewritten by `QPProblem.substitute` back to the original variables.
+
+    Parameters
+    ----------
+    M : sp.spmatrix
+        The substitution matrix of shape `(n_coefs, n_new)`.
+    z : Optional[np.ndarray]
+        Solution of the rewritten problem, or None.
+    n_variables : int
+        Number of variables of the original problem, including auxiliary variables.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The original solution, or None if `z` is None.
+    """
+    if z is None:
+        return None
+    n_coefs, n_new = M.shape
+    x = np.empty(n_variables)
+    x[:n_coefs] = M @ z[:n_new]
+    x[n_coefs:] = z[n_new:]
+    return x
+
+
+def _embed(M, start: int, n_cols: int) -> sp.csr_matrix:
+    """
+    Shift the columns of a block matrix into the global coefficient space.
+
+    Parameters
+    ----------
+    M : array_like
+        Matrix over the coefficients of a single spline.
+    start : int
+        Offset of the spline coefficients in the global vector.
+    n_cols : int
+        Total number of coefficients.
+
+    Returns
+    -------
+    sp.csr_matrix
+        The zero-padded matrix of shape `(M.shape[0], n_cols)`.
+    """
+    M = sp.coo_matrix(M)
+    return sp.csr_matrix((M.data, (M.row, M.col + start)), shape=(M.shape[0], n_cols))
+
+
+class QPResult:
+    """
+    Outcome of a direct QP solve.
+    """
+    def __init__(self, x: Optional[np.ndarray], y: Optional[np.ndarray], status: str, stats: Dict[str, Any]):
+        """
+        Initialize the QPResult.
+
+        Parameters
+        ----------
+        x : Optional[np.ndarray]
+            Primal solution, or None if not available.
+        y : Optional[np.ndarray]
+            Dual solution, or None if not available.
+        status : str
+            Status in the CVXPY vocabulary (`optimal`, `infeasible`...).
+        stats : Dict[str, Any]
+            Solver statistics in the `FitReport.solver` layout.
+        """
+        self.x = x
+        self.y = y
+        self.status = status
+        self.stats = stats
+
+    def __repr__(self):
+        return f"QPResult(status='{self.status}')"
+
+
+def solve_qp(qp: QPProblem, solver: str = "OSQP", warm_start: Optional[Dict[str, np.ndarray]] = None, **settings) -> QPResult:
+    """
+    Solve a compiled QP directly with OSQP or Clarabel.
+
+    Parameters
+    ----------
+    qp : QPProblem
+        The compiled problem.
+    solver : str, default="OSQP"
+        The solver to call, `OSQP` or `CLARABEL`.
+    warm_start : Optional[Dict[str, np.ndarray]], default=None
+        Previous primal `x` and dual `y` iterates. Ignored when their sizes do not match the problem
+        or the solver does not support warm starts (Clarabel).
+    **settings : dict
+        Solver settings; for OSQP they override `OSQP_DEFAULTS`.
+
+    Returns
+    -------
+    QPResult
+        The solution and solver statistics.
+
+    Raises
+    ------
+    ValueError
+        If the solver is not supported by the direct QP engine.
+    """
+    solver = solver.upper()
+    if solver == "OSQP":
+        return _solve_osqp(qp, warm_start=warm_start, **settings)
+    if solver == "CLARABEL":
+        return _solve_clarabel(qp, **settings)
+    raise ValueError(f"Solver '{solver}' is not supported by the qp engine. Use 'OSQP' or 'CLARABEL'.")
+
+
+def _solve_osqp(qp: QPProblem, warm_start: Optional[Dict[str, np.ndarray]] = None, **settings) -> QPResult:
+    """
+    Solve a compiled QP with OSQP, see `solve_qp`.
+    """
+    import osqp
+
+    # polishing refines the active set, there is none without constraint rows; with rows OSQP may print
+    # a polishing notice even with `verbose=False`
+    opts = {**OSQP_DEFAULTS, **({"polishing": False} if not qp.n_constraints else {}), **settings}
+    solver = osqp.OSQP()
+    solver.setup(P=sp.triu(qp.P, format='csc'), q=qp.q, A=qp.A, l=qp.l, u=qp.u, **opts)
+
+    warm = False
+    if warm_start is not None:
+        x0, y0 = warm_start.get("x"), warm_start.get("y")
+        if x0 is not None and len(x0) == qp.n_variables:
+            if y0 is not None and len(y0) == qp.n_constraints:
+                solver.warm_start(x=x0, y=y0)
+            else:
+                solver.warm_start(x=x0)
+            warm = True
+
+    try:
+        res = solver.solve(raise_error=False)
+    except osqp.OSQPException:
+        return QPResult(x=None, y=None, status="solver_error", stats=_stats(qp, "OSQP", 0, None, None, warm))
+    status = _OSQP_STATUS.get(res.info.status, res.info.status)
+    solved = status in ("optimal", "optimal_inaccurate", "user_limit")
+    stats = _stats(qp, "OSQP", res.info.iter, res.info.setup_time, res.info.solve_time, warm)
+    x = np.array(res.x) if solved else None
+    y = np.array(res.y) if solved else None
+    return QPResult(x=x, y=y, status=status, stats=stats)
+
+
+def _solve_clarabel(qp: QPProblem, **settings) -> QPResult:
+    """
+    Solve a compiled QP with Clarabel, see `solve_qp`.
+
+    The two-sided rows `l <= Ax <= u` are split into a zero cone for equalities and a
+    non-negative cone for the finite lower and upper sides.
+    """
+    import clarabel
+
+    A = sp.csr_matrix(qp.A)
+    eq = qp.l == qp.u
+    lo = np.isfinite(qp.l) & ~eq
+    up = np.isfinite(qp.u) & ~eq
+    A_cl = sp.vstack([A[eq], -A[lo], A[up]], format='csc')
+    b_cl = np.concatenate([qp.u[eq], -qp.l[lo], qp.u[up]])
+    cones = []
+    if eq.any():
+        cones.append(clarabel.ZeroConeT(int(eq.sum())))
+    if lo.any() or up.any():
+        cones.append(clarabel.NonnegativeConeT(int(lo.sum() + up.sum())))
+
+    opts = clarabel.DefaultSettings()
+    opts.verbose = False
+    for key, value in settings.items():
+        setattr(opts, key, value)
+
+    sol = clarabel.DefaultSolver(sp.triu(qp.P, format='csc'), qp.q, A_cl, b_cl, cones, opts).solve()
+    status = _CLARABEL_STATUS.get(str(sol.status), str(sol.status))
+    solved = status in ("optimal", "optimal_inaccurate", "user_limit")
+    stats = _stats(qp, "CLARABEL", sol.iterations, None, sol.solve_time, False)
+    x = np.array(sol.x) if solved else None
+    return QPResult(x=x, y=None, status=status, stats=stats)
+
+
+def _stats(qp: QPProblem, solver: str, num_iters: int, setup_time: Optional[float], solve_time: Optional[float], warm: bool) -> Dict[str, Any]:
+    """
+    Collect solver statistics in the `FitReport.solver` layout.
+    """
+    return {
+        "solver_name": solver,
+        "num_iters": num_iters,
+        "setup_time": setup_time,
+        "solve_time": solve_time,
+        "compilation_time": None,
+        "num_variables": qp.n_variables,
+        "num_eq_constraints": int(np.sum(qp.l == qp.u)),
+        "num_leq_constraints": int(np.sum(qp.l != qp.u)),
+        "num_data": int(qp.P.nnz + qp.A.nnz),
+        "warm_start": warm,
+    }
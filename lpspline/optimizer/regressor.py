@@ -2,19 +2,38 @@
 import polars as pl
 import cvxpy as cp
 import numpy as np
+import scipy.sparse as sp
 import pickle
 import pathlib
 import copy
-from typing import List, Optional, Union, Dict, Any, Tuple
+import warnings
+import time
+from typing import List, Optional, Sequence, Union, Dict, Any, Tuple
 from ..spline import base as base_spline
+from .. import instrument
 from .summary import print_summary
+from .report import FitReport
+from .plan import ENGINES, plan_splines, estimate_memory, format_plan
+from .qp import compile_qp, constraint_system, expand_solution, penalty_system, solve_qp
+from .backfit import BlockSolver, backfit
+from .fallback import BUDGET_STATUSES, SOLVER_ERROR, resolve_fallback
+from .glm import Family, LinkFunction, irls, resolve_family
+from .identify import Reparameterization, identify
+from .loss import LOSSES, check_delta, check_quantiles, quantile_problem, robust_problem
+from .precondition import precondition as build_preconditioner
+from .solver import QP_ENGINE_SOLVERS, problem_class, select_solver, solver_options
+
+MAX_REFINEMENTS = 20
+
+# Engines solving their QPs directly with OSQP or Clarabel rather than through CVXPY.
+_DIRECT_ENGINES = ("qp", "irls", "backfit")
 
 class LpRegressor:
     """
     Algorithmic LpRegressor class fitting generalized additive spline models using convex optimization.
     """
 
-    def __init__(self, splines: Union["base_spline.Spline", List["base_spline.Spline"]]):
+    def __init__(self, splines: Union["base_spline.Spline", List["base_spline.Spline"]], identifiable: bool = False):
         """
         Initialize the localized LpRegressor.
 
@@ -22,15 +41,32 @@ class LpRegressor:
         ----------
         splines : Union[Spline, List[Spline]]
             A standalone Spline definition object or iterable combinations spanning the predictive framework.
+        identifiable : bool, default=False
+            Whether to remove the redundant intercepts of the additive model before solving. All terms able to
+            represent a constant are centered over the training rows except one carrying the global intercept
+            (a `Constant` term when present). The centering is absorbed into a reduced basis and the coefficients
+            are mapped back after the fit, so `eval` and `predict` are unchanged. Requires the `qp` engine.
         """
         if isinstance(splines, base_spline.Spline):
             self.splines = [splines]
         else:
             self.splines = splines
         
+        self.identifiable = identifiable
         self._check_tags()
         self.problem: Optional[cp.Problem] = None
         self._summary_data = None
+        self._fit_report: Optional[FitReport] = None
+        self._engine: Optional[str] = None
+        self._qp_warm_start: Optional[Dict[str, np.ndarray]] = None
+        self._solver: Optional[str] = None
+        self._status: Optional[str] = None
+        self._fallback: Optional[str] = None
+        self._reparameterization: Optional[Reparameterization] = None
+        self._preconditioning: Optional[pl.DataFrame] = None
+        self._quantiles: Optional[np.ndarray] = None
+        self._family: Optional[str] = None
+        self._quantile_coefficients: Optional[np.ndarray] = None
 
     def _check_tags(self):
         """
@@ -66,12 +102,245 @@ class LpRegressor:
         raise ValueError(f"Spline with tag '{tag}' not found.")
         
 
-    def fit(self, X: pl.DataFrame, y: pl.Series, summary: bool = True) -> None:
+    @property
+    def fit_report(self) -> Optional[FitReport]:
+        """
+        Returns the timing and memory report collected during the last fit.
+
+        Returns
+        -------
+        Optional[FitReport]
+            The report of the last fit, or None if the model has not been fitted.
+            Use `fit_report.to_dict()` or `fit_report.to_frame()` for structured access.
+        """
+        return getattr(self, '_fit_report', None)
+
+    def plan(self, X: pl.DataFrame) -> pl.DataFrame:
+        """
+        Estimate the size of the optimization problem before fitting.
+
+        Splines are initialized on copies, so the model is left untouched and no CVXPY object is built.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per spline with the number of variables, constraint rows, design non-zeros
+            and the estimated peak memory in bytes for each engine (`memory_cvxpy`, `memory_qp`, `memory_suffstat`,
+            `memory_backfit`).
+        """
+        self._validate_input(X)
+        for spline in self.splines:
+            self._validate_term_in_dataframe(spline.term, X)
+        return plan_splines(self.splines, X)
+
+    def _select_engine(self, X: pl.DataFrame, engine: str, max_memory: Optional[float]) -> str:
+        """
+        Resolve the fitting engine and enforce the memory budget on initialized splines.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        engine : str
+            The requested engine, `auto` or one of `ENGINES`.
+        max_memory : Optional[float]
+            The memory budget in bytes, or None to skip the check.
+
+        Returns
+        -------
+        str
+            The engine to fit with.
+
+        Raises
+        ------
+        ValueError
+            If the engine is unknown, or does not support `identifiable`.
+        MemoryError
+            If the estimated peak memory of the engine exceeds `max_memory`.
+        """
+        if engine != "auto" and engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Available engines: {('auto',) + ENGINES}")
+        if getattr(self, 'identifiable', False):
+            if engine not in ("auto", "qp"):
+                raise ValueError(f"identifiable=True requires the 'qp' engine, got '{engine}'.")
+            engine = "qp"
+        if max_memory is None:
+            return "cvxpy" if engine == "auto" else engine
+
+        plan = plan_splines(self.splines, X, initialized=True)
+        candidates = ENGINES if engine == "auto" else (engine,)
+        for candidate in candidates:
+            if estimate_memory(plan, candidate, len(X)) <= max_memory:
+                return candidate
+        raise MemoryError(
+            "Estimated problem size exceeds max_memory.\n" + format_plan(plan, candidates[-1], len(X), max_memory)
+        )
+
+    def _select_solver(self, solver: Optional[str], precision: Optional[str], quadratic_loss: bool = True) -> str:
+        """
+        Resolve the solver for the selected engine.
+
+        Parameters
+        ----------
+        solver : Optional[str]
+            The requested solver, or None to choose it from the problem class.
+        precision : Optional[str]
+            The tolerance preset.
+        quadratic_loss : bool, default=True
+            Whether the data loss is quadratic. Other losses are solved by Clarabel by default.
+
+        Returns
+        -------
+        str
+            The solver name in CVXPY notation.
+
+        Raises
+        ------
+        ValueError
+            If the solver is not available for the selected engine.
+        """
+        if solver is None:
+            if not quadratic_loss:
+                # linear data losses are solved as LPs (or QPs with L2 penalties) by Clarabel, see `select_solver`
+                return select_solver("LP", engine=self._engine, precision=precision)
+            return select_solver(problem_class(self.splines), engine="qp" if self._engine in _DIRECT_ENGINES else self._engine, precision=precision)
+        solver = solver.upper()
+        if self._engine in _DIRECT_ENGINES and solver not in QP_ENGINE_SOLVERS:
+            raise ValueError(f"Solver '{solver}' is not supported by the {self._engine} engine. Available solvers: {QP_ENGINE_SOLVERS}")
+        if self._engine not in _DIRECT_ENGINES and solver not in cp.installed_solvers():
+            raise ValueError(f"Solver '{solver}' is not installed. Available solvers: {cp.installed_solvers()}")
+        return solver
+
+    @property
+    def solver(self) -> Optional[str]:
+        """
+        Returns the solver used in the last fit.
+
+        Returns
+        -------
+        Optional[str]
+            The solver name, or None if the model has not been fitted.
+            Its statistics are available in `fit_report.solver`.
+        """
+        return getattr(self, '_solver', None)
+
+    @property
+    def status(self) -> Dict[str, Optional[str]]:
+        """
+        Returns the outcome of the last fit.
+
+        Returns
+        -------
+        Dict[str, Optional[str]]
+            `status` is the solver status (as `problem.status`); `fallback` names the fallback whose
+            coefficients were kept when the solver ran out of budget (`best_iterate`,
+            `projected_least_squares`, `previous` or `none`), None otherwise.
+        """
+        return {"status": getattr(self, '_status', None), "fallback": getattr(self, '_fallback', None)}
+
+    @property
+    def reparameterization(self) -> Optional[Reparameterization]:
+        """
+        Returns the identifiability reparameterization of the last fit.
+
+        Returns
+        -------
+        Optional[Reparameterization]
+            The centered spline tags, the tag carrying the global intercept and the number of removed
+            parameters, or None if the model is not `identifiable`.
+        """
+        return getattr(self, '_reparameterization', None)
+
+    @property
+    def preconditioning(self) -> Optional[pl.DataFrame]:
+        """
+        Returns the column scalings applied before the last solve.
+
+        Returns
+        -------
+        Optional[pl.DataFrame]
+            One row per design column with the spline `tag`, the `column` index, the `shift` subtracted
+            from the column and the `scale` it was divided by, or None if no preconditioning was applied.
+        """
+        return getattr(self, '_preconditioning', None)
+
+    @property
+    def quantiles(self) -> Optional[np.ndarray]:
+        """
+        Returns the quantile levels of the last fit.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The sorted levels fitted with `loss="quantile"`, or None for other losses.
+            Their predictions are available from `predict_quantiles`.
+        """
+        return getattr(self, '_quantiles', None)
+
+    @property
+    def family(self) -> Optional[str]:
+        """
+        Returns the family of the last fit.
+
+        Returns
+        -------
+        Optional[str]
+            The family the model was fitted with by the `irls` engine, or None for least-squares and quantile fits.
+        """
+        return getattr(self, '_family', None)
+
+    @property
+    def active_constraints(self) -> pl.DataFrame:
+        """
+        Returns the active sets of the lazily generated constraints.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per lazy constraint with the spline `tag`, the `constraint` type, the number of `active`
+            grid points enforced in the last fit and the `grid` size they are taken from.
+        """
+        rows = []
+        for spline in self.splines:
+            for c in spline.constraints:
+                if getattr(c, 'lazy', False):
+                    active = c.active
+                    rows.append({"tag": spline.tag, "constraint": type(c).__name__,
+                                 "active": 0 if active is None else len(active), "grid": c.n})
+        return pl.DataFrame(rows, schema={"tag": pl.Utf8, "constraint": pl.Utf8, "active": pl.Int64, "grid": pl.Int64})
+
+    def fit(
+        self,
+        X: pl.DataFrame,
+        y: pl.Series,
+        summary: bool = True,
+        trace_memory: bool = False,
+        engine: str = "auto",
+        max_memory: Optional[float] = None,
+        solver: Optional[str] = None,
+        precision: Optional[str] = None,
+        solver_opts: Optional[Dict[str, Any]] = None,
+        time_limit: Optional[float] = None,
+        precondition: bool = True,
+        loss: str = "squared",
+        quantiles: Optional[Sequence[float]] = None,
+        non_crossing: bool = False,
+        family: Optional[str] = None,
+        link: Optional[str] = None,
+        delta: float = 1.0,
+    ) -> None:
         """
         Compute basis coefficients mapping combinations within additive splines.
 
         Minimizes the specified L2 norm determining the optimal linear composition evaluating structural distances.
-        `||Sum(Spline_i(X)) - y||_2`
+        `||Sum(Spline_i(X)) - y||_2`, the pinball loss of every quantile with `loss="quantile"`, or a
+        robust loss with `loss="huber"` and `loss="l1"`.
+        With a `family` the penalized deviance of a generalized additive model is minimized instead.
 
         Parameters
         ----------
@@ -79,25 +348,174 @@ class LpRegressor:
             The independent predictive training feature frame subset containing all modeled keys.
         y : pl.Series
             Dependent observation labels associated mapping.
+        summary : bool, default=True
+            Whether to print the model summary once fitted.
+        trace_memory : bool, default=False
+            Whether to record the peak traced memory of every stage in `fit_report`.
+        engine : str, default="auto"
+            How the problem is handed to CVXPY:
+
+            - `cvxpy`: builds the additive expression over all rows (reference engine).
+            - `qp`: compiles the model straight into sparse QP matrices solved by OSQP,
+              bypassing the CVXPY expression tree and warm starting from the previous fit.
+            - `suffstat`: compresses the squared loss into the sparse sufficient statistics `D'D` and `D'y`,
+              of size `(n_params, n_params)` independently of the number of rows.
+            - `backfit`: block coordinate descent over the splines. Every term is refitted against the partial
+              residual with its own cached factorization (banded for B-splines, diagonal for factors), or a
+              small warm-started QP when it has constraints or L1 penalties, until the objective stops
+              decreasing. Memory grows with `n` plus the squared size of each term, not of the whole model.
+            - `irls`: iteratively reweighted least squares, used (only) for models with a `family`.
+            - `auto`: `cvxpy`, switching to `qp`, `suffstat` then `backfit` when `max_memory` would be exceeded.
+              Always `qp` for `identifiable` models.
+        max_memory : Optional[float], default=None
+            Memory budget in bytes. The problem size is estimated before any CVXPY object is built
+            (see `plan`) and the fit fails fast when the selected engine would exceed it.
+        solver : Optional[str], default=None
+            The solver name in CVXPY notation (e.g. `OSQP`, `CLARABEL`, `HIGHS`). When None it is chosen
+            from the problem class: OSQP for the squared and `huber` losses (Clarabel with `precision="accurate"`),
+            Clarabel for the piecewise linear `quantile` and `l1` losses. The `qp` engine supports `OSQP` and `CLARABEL` only.
+        precision : Optional[str], default=None
+            Tolerance preset `fast`, `balanced` or `accurate` translated into the solver settings.
+            None keeps the solver defaults.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Options passed through to the solver, taking precedence over the `precision` preset.
+        time_limit : Optional[float], default=None
+            Wall time budget of the solver in seconds. When it is set and the solver stops on its time (or
+            iteration) limit, or fails with a solver error, the model falls back, in order, to the best iterate
+            if it is feasible, to the unconstrained least-squares solution projected onto the shape constraints
+            (squared loss only), then to the coefficients of the previous fit, with a `RuntimeWarning`. The
+            fallback used is reported by `status`. Without a time limit solver errors are raised. With a
+            `family` the budget is shared by all IRLS iterations, which stop at the last accepted iterate with
+            status `user_limit`.
+        precondition : bool, default=True
+            Whether the squared loss engines center (on the block intercept) and scale every design column
+            before solving; the `qp` engine also equilibrates the constraint rows, while `cvxpy` and `suffstat`
+            write the problem against the scaled coefficients. Coefficients are mapped back afterwards, so the
+            solution is the same up to solver tolerance; the applied scalings are reported by `preconditioning`.
+        loss : str, default="squared"
+            The data loss, one of `LOSSES`:
+
+            - `squared`: least squares.
+            - `quantile`: the pinball loss of every level of `quantiles`, fitted jointly as one LP over the
+              shared design, constraints and penalties with the `cvxpy` engine. The splines hold the
+              coefficients of the level closest to the median; all levels are predicted by `predict_quantiles`.
+            - `huber`: the Huber loss, quadratic for residuals up to `delta` and linear beyond, so that spikes
+              in the target do not drag the fit. Solved by the `cvxpy` engine with one vectorized `huber` atom.
+            - `l1`: the sum of absolute residuals (median regression), an LP with the `cvxpy` engine.
+        quantiles : Optional[Sequence[float]], default=None
+            The quantile levels in `(0, 1)` fitted by the `quantile` loss, e.g. `(0.1, 0.5, 0.9)`.
+        non_crossing : bool, default=False
+            Whether the curves of adjacent quantiles are constrained not to cross on the training rows.
+        family : Optional[str], default=None
+            The distribution of the target, one of `FAMILIES` (`gaussian`, `poisson`, `binomial`, `gamma`).
+            The model is then fitted by the `irls` engine: iteratively reweighted least squares whose inner
+            weighted QP, with the same penalties and shape constraints, is solved directly by OSQP (or Clarabel)
+            and warm-started across iterations. The splines hold the linear predictor, so `predict` returns
+            `eta = g(mu)`; wrap the model in a `Link` to predict the mean. Convergence statistics are reported
+            in `fit_report.convergence`.
+        link : Optional[str], default=None
+            The link of the `family`, one of `LINKS` (`identity`, `log`, `logit`, `exp`).
+            None selects the default link of the family.
+        delta : float, default=1.0
+            The threshold of the `huber` loss in units of the target, typically a small multiple of the noise scale.
 
         Raises
         ------
         ValueError
-            If no splines were initiated or structural dependencies are incorrectly verified.
+            If no splines were initiated or structural dependencies are incorrectly verified,
+            the solver or precision are not supported, the loss is not supported by the engine, or the targets
+            are outside the support of the family.
+        MemoryError
+            If the estimated peak memory exceeds `max_memory`.
+        cp.error.SolverError
+            If the solver fails and no `time_limit` was given.
         """
         self._validate_input(X)
+        if loss not in LOSSES:
+            raise ValueError(f"Unknown loss '{loss}'. Available losses: {LOSSES}")
+        if loss != "squared":
+            if engine not in ("auto", "cvxpy"):
+                raise ValueError(f"The {loss} loss requires the 'cvxpy' engine, got '{engine}'.")
+            if getattr(self, 'identifiable', False):
+                raise ValueError(f"The {loss} loss does not support identifiable=True.")
+            engine = "cvxpy"
+        levels = check_quantiles(quantiles) if loss == "quantile" else None
+        if loss == "huber":
+            check_delta(delta)
+        if family is not None:
+            glm_family, glm_link = resolve_family(family, link)
+            if loss != "squared":
+                raise ValueError(f"A family defines its own deviance and cannot be combined with the {loss} loss.")
+            if engine not in ("auto", "irls"):
+                raise ValueError(f"A family requires the 'irls' engine, got '{engine}'.")
+            if getattr(self, 'identifiable', False):
+                raise ValueError("A family does not support identifiable=True.")
+            if not glm_family.valid_y(np.asarray(y, dtype=float)):
+                raise ValueError(f"The targets are outside the support of the {family} family.")
+        elif link is not None:
+            raise ValueError("A link requires a family, e.g. family='poisson'.")
+        report = FitReport(trace_memory=trace_memory).start()
+        previous = self._coefficient_vector()
+        self._quantiles = None
+        self._quantile_coefficients = None
+        self._family = family
 
-        for spline in self.splines:
+        with instrument.span("fit", rows=len(X)) as span:
+            self._set_coef_maps(None)
+            for spline in self.splines:
+                with report.stage("init_spline", spline.tag, rows=len(X)):
+                    if spline.by is not None:
+                        spline.init_spline(X[spline.term].to_numpy(), by=X[spline.by].to_numpy())
+                    else:
+                        spline.init_spline(X[spline.term].to_numpy())
+
+            with report.stage("plan"):
+                self._engine = "irls" if family is not None else self._select_engine(X, engine, max_memory)
+            span.set_tag("engine", self._engine)
+            self._solver = self._select_solver(solver, precision, quadratic_loss=loss in ("squared", "huber"))
+            opts = solver_options(self._solver, precision, solver_opts, time_limit=time_limit)
+            span.set_tag("solver", self._solver)
 
-            if spline.by is not None:
-                spline.init_spline(X[spline.term].to_numpy(), by=X[spline.by].to_numpy())
+            if family is not None:
+                self._fit_irls(X, y, glm_family, glm_link, report=report, solver_opts=opts, time_limit=time_limit)
+            elif loss == "quantile":
+                self._fit_quantiles(X, y, levels, non_crossing=non_crossing, report=report, solver_opts=opts,
+                                    catch_errors=time_limit is not None)
+            elif loss != "squared":
+                self._fit_robust(X, y, loss, delta=delta, report=report, solver_opts=opts, catch_errors=time_limit is not None)
+            elif self._engine == "backfit":
+                self._fit_backfit(X, y, report=report, solver_opts=opts)
+            elif self._engine == "qp":
+                self._fit_qp(X, y, report=report, solver_opts=opts, precondition=precondition)
             else:
-                spline.init_spline(X[spline.term].to_numpy())
+                if self._engine == "suffstat":
+                    data_loss, self._summary_data = self._build_sufficient_statistics(
+                        X, y, report=report, precondition=precondition)
+                else:
+                    total_expression, self._summary_data = self._build_model_expression(X, report=report, precondition=precondition)
+                    data_loss = cp.sum_squares(total_expression - np.asarray(y))
 
-        total_expression, self._summary_data = self._build_model_expression(X)
-        
-        self._solve_problem(total_expression, y)       
-        self._status =  self.problem.status
+                for _ in range(MAX_REFINEMENTS + 1):
+                    self._solve_problem(data_loss, len(X), report=report, solver_opts=opts,
+                                        catch_errors=time_limit is not None)
+                    self._store_variable_values()
+                    if not self._refine_constraints(report=report):
+                        break
+
+            self._fallback = None
+            if self._status in BUDGET_STATUSES and time_limit is not None and family is None:
+                self._apply_fallback(X, y, previous, report=report, least_squares=loss == "squared")
+                span.set_tag("fallback", self._fallback)
+            elif self._status == SOLVER_ERROR:
+                blocks = self._coefficient_blocks()
+                if previous is not None and len(previous) == blocks[-1].stop:
+                    # as when CVXPY raises, a failed fit leaves the previous coefficients in place
+                    self._store_coefficient_vector(previous, blocks)
+                raise cp.error.SolverError(f"Solver '{self._solver}' failed in the {self._engine} engine.")
+            span.set_tag("params", sum(item["Parameters"] for item in self._summary_data))
+        report.solver["precision"] = precision
+        report.stop()
+        self._fit_report = report
         if summary:
             self.summary()
 
@@ -124,9 +542,130 @@ class LpRegressor:
         ValueError
             If structural dataframe column dependencies aren't accurately mirrored natively.
         """
-        if return_components:
-            return self._predict_components(X)
-        return self._predict_total(X)
+        with instrument.span("predict", rows=len(X)):
+            if return_components:
+                return self._predict_components(X)
+            return self._predict_total(X)
+
+    def predict_derivative(self, X: pl.DataFrame, term: str, derivative: int = 1) -> np.ndarray:
+        """
+        Predict the derivative of the fitted model with respect to one feature.
+
+        Every spline modelling the column contributes the analytic derivative of its basis, e.g. the
+        B-spline derivative recursion or the rotated Fourier pairs; the other splines are constant in it.
+        The derivatives of piecewise linear and step terms are taken away from their knots.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The feature frame to evaluate the derivative on.
+        term : str
+            The column to differentiate with respect to.
+        derivative : int, default=1
+            The derivative order.
+
+        Returns
+        -------
+        np.ndarray
+            The derivative of the prediction, of shape `(n_samples,)`.
+
+        Raises
+        ------
+        ValueError
+            If no spline models the column, the column is categorical, or a spline has no derivative.
+        """
+        with instrument.span("predict_derivative", rows=len(X), term=term):
+            self._validate_term_in_dataframe(term, X)
+            total_value = np.zeros(len(X))
+            found = False
+            for spline in self.splines:
+                if spline.by == term:
+                    raise ValueError(f"Column '{term}' is the categorical by grouping of {spline!r}.")
+                if isinstance(spline.term, list):
+                    if term not in spline.term:
+                        continue
+                    order = tuple(derivative if column == term else 0 for column in spline.term)
+                elif spline.term == term:
+                    order = derivative
+                else:
+                    continue
+                found = True
+                self._validate_term_in_dataframe(spline.term, X)
+                by = X[spline.by].to_numpy() if spline.by is not None else None
+                total_value += spline.eval(X[spline.term].to_numpy(), by=by, derivative=order)
+            if not found:
+                raise ValueError(f"No spline of the model is a function of column '{term}'.")
+            return total_value
+
+    def predict_grid(self, axes: Dict[str, np.ndarray], as_frame: bool = False) -> Union[np.ndarray, pl.LazyFrame]:
+        """
+        Predict on the Cartesian product of feature values, e.g. for what-if or partial dependence scenarios.
+
+        The model being additive, every spline is evaluated only on the product of its own axes (its
+        term and `by` columns, a 2-D block for `by` or tensor terms) and the results are broadcast-summed.
+        The cost grows with the sum of the axis lengths instead of their product.
+
+        Parameters
+        ----------
+        axes : Dict[str, np.ndarray]
+            The values of every feature column, in the order of the output dimensions.
+        as_frame : bool, default=False
+            Whether to return a lazily expanded frame with one row per grid cell instead of the array.
+
+        Returns
+        -------
+        Union[np.ndarray, pl.LazyFrame]
+            The predictions of shape `tuple(len(v) for v in axes.values())`, or a LazyFrame with one
+            column per axis and the `prediction` column, in row-major order of the grid.
+
+        Raises
+        ------
+        ValueError
+            If a spline depends on a column that is not an axis.
+        """
+        values = {name: np.asarray(v).ravel() for name, v in axes.items()}
+        shape = tuple(len(v) for v in values.values())
+        with instrument.span("predict_grid", axes=len(shape), cells=int(np.prod(shape))):
+            total_value = np.zeros(shape)
+            for spline in self.splines:
+                total_value += self._evaluate_spline_on_grid(spline, values)
+        if as_frame:
+            return self._grid_frame(values, total_value)
+        return total_value
+
+    def _evaluate_spline_on_grid(self, spline: "base_spline.Spline", values: Dict[str, np.ndarray]) -> np.ndarray:
+        """Evaluate a single spline on the product of its own grid axes, shaped to broadcast over the others."""
+        from ..spline.constant import Constant
+
+        names = list(values)
+        if isinstance(spline, Constant):
+            return spline.eval(np.zeros(1)).reshape((1,) * len(names))
+
+        columns = list(spline.term) if isinstance(spline.term, list) else [spline.term]
+        if spline.by is not None:
+            columns.append(spline.by)
+        missing = [column for column in columns if column not in values]
+        if missing:
+            raise ValueError(f"Columns {missing} of {spline!r} are not grid axes: {names}")
+
+        dims = sorted({names.index(column) for column in columns})
+        mesh = np.meshgrid(*[values[names[d]] for d in dims], indexing="ij")
+        block = pl.DataFrame({names[d]: m.ravel() for d, m in zip(dims, mesh)})
+        broadcast = [1] * len(names)
+        for d in dims:
+            broadcast[d] = len(values[names[d]])
+        return self._evaluate_spline(spline, block).reshape(broadcast)
+
+    def _grid_frame(self, values: Dict[str, np.ndarray], prediction: np.ndarray) -> pl.LazyFrame:
+        """Attach lazily gathered axis columns to the row-major flattened predictions."""
+        lengths = [len(v) for v in values.values()]
+        strides = np.cumprod([1] + lengths[::-1])[:-1][::-1]
+        frame = pl.LazyFrame({"prediction": prediction.ravel()}).with_row_index("_cell")
+        columns = [
+            pl.lit(pl.Series(name, v)).gather((pl.col("_cell") // int(stride)) % len(v)).alias(name)
+            for (name, v), stride in zip(values.items(), strides)
+        ]
+        return frame.select(*columns, "prediction")
 
     def _predict_components(self, X: pl.DataFrame) -> np.ndarray:
         """Calculate predictions for each spline individually."""
@@ -202,75 +741,731 @@ class LpRegressor:
         if not self.splines:
              raise ValueError("No splines to fit.")
 
-    def _validate_term_in_dataframe(self, term: str, X: pl.DataFrame) -> None:
-        """Check if the term exists in the DataFrame columns."""
-        if term not in X.columns:
-                raise ValueError(f"Term {term} not found in input DataFrame columns: {X.columns}")
+    def _validate_term_in_dataframe(self, term: Union[str, List[str]], X: pl.DataFrame) -> None:
+        """Check if the term (or every column of a multi-column term) exists in the DataFrame columns."""
+        for column in (term if isinstance(term, list) else [term]):
+            if column not in X.columns:
+                raise ValueError(f"Term {column} not found in input DataFrame columns: {X.columns}")
 
-    def _build_model_expression(self, X: pl.DataFrame) -> Tuple[cp.Expression, List[Dict[str, Any]]]:
+    def _build_model_expression(self, X: pl.DataFrame, report: Optional[FitReport] = None,
+                                precondition: bool = False) -> Tuple[cp.Expression, List[Dict[str, Any]]]:
         """
         Construct the global structural mathematical logic natively isolating expressions targeting individual component matrices.
 
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent building each basis and expression.
+        precondition : bool, default=False
+            Whether the expressions are written against centered and scaled coefficients, see `_set_coef_maps`.
+
         Returns
         -------
         Tuple[cp.Expression, List[Dict[str, Any]]]
             Combination defining explicit numerical constraints modeling logic equations, matched along natively sequential lists evaluating descriptive representations for final output presentation reporting.
         """
+        report = report if report is not None else FitReport()
         total_expression = 0
         summary_data = []
 
+        bases, by_values = [], []
         for spline in self.splines:
             self._validate_term_in_dataframe(spline.term, X)
             
-            if spline.by is not None:
-                x_data = X[spline.term].to_numpy()
-                by_data = X[spline.by].to_numpy()
-                spline_expr = spline(x_data, by=by_data)
-            else:
-                x_data = X[spline.term].to_numpy()
-                spline_expr = spline(x_data)
-            
-            # Collect info for summary
-            num_params = sum(v.size for v in spline._variables)
-            constraint_names = [type(c).__name__ for c in spline.constraints]
-            constraints_str = ", ".join(constraint_names) if constraint_names else "None"
-            penalty_names = [type(p).__name__ for p in getattr(spline, 'penalties', [])]
-            penalties_str = ", ".join(penalty_names) if penalty_names else "None"
-            
-            summary_data.append({
-                "Spline Type": type(spline).__name__,
-                "Term": spline.term,
-                "Tag": spline.tag,
-                "Parameters": num_params,
-                "Constraints": constraints_str,
-                "Penalties": penalties_str
-            })
+            x_data = X[spline.term].to_numpy()
+            by_data = X[spline.by].to_numpy() if spline.by is not None else None
+
+            with report.stage("build_basis", spline.tag, rows=len(x_data)) as entry:
+                basis = spline._build_basis(x_data)
+                entry["size"] = basis.data.nbytes + basis.indices.nbytes + basis.indptr.nbytes if sp.issparse(basis) else basis.nbytes
+                entry["items"] = basis.shape[0]
+            bases.append(basis)
+            by_values.append(by_data)
+
+        designs = [s._design_from_basis(b, by=v) for s, b, v in zip(self.splines, bases, by_values)] if precondition else None
+        self._set_coef_maps(designs, report=report)
+
+        for spline, basis, by_data in zip(self.splines, bases, by_values):
+            with report.stage("build_expression", spline.tag):
+                spline_expr = spline._basis_expression(basis, by=by_data)
             
+            summary_data.append(self._summary_item(spline))
             total_expression += spline_expr
             
         return total_expression, summary_data
 
-    def _solve_problem(self, expression: cp.Expression, y: pl.Series) -> None:
+    def _summary_item(self, spline: "base_spline.Spline") -> Dict[str, Any]:
         """
-        Set up and solve the convex optimization problem.
+        Collect the summary description of a spline whose variables are built.
+
+        Parameters
+        ----------
+        spline : Spline
+            The spline to describe.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The summary row of the spline.
         """
-        y_np = y.to_numpy()
+        num_params = spline.n_basis * spline.n_by_classes
+        constraint_names = [type(c).__name__ for c in spline.constraints]
+        constraints_str = ", ".join(constraint_names) if constraint_names else "None"
+        penalty_names = [type(p).__name__ for p in getattr(spline, 'penalties', [])]
+        penalties_str = ", ".join(penalty_names) if penalty_names else "None"
         
-        main_loss = cp.sum_squares(expression - y_np)
+        return {
+            "Spline Type": type(spline).__name__,
+            "Term": spline.term if isinstance(spline.term, str) else " x ".join(spline.term),
+            "Tag": spline.tag,
+            "Parameters": num_params,
+            "Constraints": constraints_str,
+            "Penalties": penalties_str
+        }
+
+    def _build_sufficient_statistics(self, X: pl.DataFrame, y: pl.Series, report: Optional[FitReport] = None,
+                                     precondition: bool = False) -> Tuple[cp.Expression, List[Dict[str, Any]]]:
+        """
+        Compress the squared loss into sufficient statistics of the stacked sparse design.
+
+        The loss `||D b - y||^2` equals `b'G b - 2 (D'y)'b + y'y` with the sparse Gram matrix `G = D'D`, so the
+        problem no longer scales with the rows. `G` is handed to the solver as is: it is never densified or
+        factored, and keeps the block sparsity of the design (diagonal for one-hot factors).
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        y : pl.Series
+            The target values.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent building each design and the statistics.
+        precondition : bool, default=False
+            Whether the statistics are built on centered and scaled coefficients, see `_set_coef_maps`.
+
+        Returns
+        -------
+        Tuple[cp.Expression, List[Dict[str, Any]]]
+            The squared loss written with the statistics and the summary rows.
+        """
+        report = report if report is not None else FitReport()
+        designs, summary_data = self._build_designs(X, report=report)
+        self._set_coef_maps(designs if precondition else None, report=report)
+        if precondition:
+            # the statistics are computed from the scaled design, in the coordinates `z` of `b = M z`
+            designs = [d @ spline._coef_map[0] for d, spline in zip(designs, self.splines)]
+            coefs = [spline._coef_map[1] for spline in self.splines]
+        else:
+            coefs = [spline._coef_vector() for spline in self.splines]
+
+        with report.stage("build_statistics", rows=len(X)) as entry:
+            D = sp.hstack(designs, format='csc')
+            y_np = np.asarray(y, dtype=float)
+            gram = (D.T @ D).tocsc()
+            gram = (gram + gram.T) / 2
+            Dty = D.T @ y_np
+            entry["size"] = gram.data.nbytes + gram.indices.nbytes + Dty.nbytes
+            entry["items"] = gram.nnz
+
+        b = cp.hstack(coefs)
+        return cp.quad_form(b, gram, assume_PSD=True) - 2 * Dty @ b + float(y_np @ y_np), summary_data
+
+    def _set_coef_maps(self, designs: Optional[List[sp.csr_matrix]], report: Optional[FitReport] = None) -> None:
+        """
+        Write the CVXPY problem of the splines against preconditioned coefficients, see `precondition`.
+
+        Every spline gets the change of variables `b = M z` of its block, so the solver sees centered and
+        scaled design columns while the constraints and penalties keep their meaning.
+
+        Parameters
+        ----------
+        designs : Optional[List[sp.csr_matrix]]
+            The design of every spline, or None to write the problem against the original coefficients.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent computing the scalings.
+        """
+        self._preconditioning = None
+        if designs is None:
+            for spline in self.splines:
+                spline._set_coef_map(None)
+            return
+        report = report if report is not None else FitReport()
+        with report.stage("precondition") as entry:
+            preconditioner = build_preconditioner(self.splines, designs)
+            for spline, M in zip(self.splines, preconditioner.maps):
+                spline._set_coef_map(M)
+            self._preconditioning = preconditioner.scalings
+            entry["items"] = len(preconditioner.scalings)
+
+    def _build_designs(self, X: pl.DataFrame, report: Optional[FitReport] = None) -> Tuple[List[sp.csr_matrix], List[Dict[str, Any]]]:
+        """
+        Build the sparse design matrix of every spline.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent building each design.
+
+        Returns
+        -------
+        Tuple[List[sp.csr_matrix], List[Dict[str, Any]]]
+            The designs, in spline order, and the summary rows.
+        """
+        report = report if report is not None else FitReport()
+        designs = []
+        summary_data = []
+
+        for spline in self.splines:
+            self._validate_term_in_dataframe(spline.term, X)
+
+            x_data = X[spline.term].to_numpy()
+            by_data = X[spline.by].to_numpy() if spline.by is not None else None
+
+            with report.stage("build_basis", spline.tag, rows=len(x_data)) as entry:
+                design = spline._build_design(x_data, by=by_data)
+                entry["size"] = design.data.nbytes + design.indices.nbytes + design.indptr.nbytes
+                entry["items"] = design.shape[0]
+
+            designs.append(design)
+            summary_data.append(self._summary_item(spline))
+
+        return designs, summary_data
+
+    def _fit_qp(self, X: pl.DataFrame, y: pl.Series, report: Optional[FitReport] = None, solver_opts: Optional[Dict[str, Any]] = None,
+                precondition: bool = True) -> None:
+        """
+        Fit the model with the direct QP engine, bypassing CVXPY.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        y : pl.Series
+            The target values.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent compiling and solving.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Settings passed to the solver.
+        precondition : bool, default=True
+            Whether to center and scale the design columns before solving.
+        """
+        report = report if report is not None else FitReport()
+        designs, summary_data = self._build_designs(X, report=report)
+        for _ in range(MAX_REFINEMENTS + 1):
+            self._solve_qp(designs, y, summary_data, report=report, solver_opts=solver_opts, precondition=precondition)
+            if not self._refine_constraints(report=report):
+                break
+
+    def _solve_qp(self, designs: List[sp.csr_matrix], y: pl.Series, summary_data: List[Dict[str, Any]], report: FitReport,
+                  solver_opts: Optional[Dict[str, Any]] = None, precondition: bool = True) -> None:
+        """
+        Compile, reduce, precondition and solve the QP of the current constraints, then store the coefficients.
+
+        Parameters
+        ----------
+        designs : List[sp.csr_matrix]
+            The design of every spline on the training rows.
+        y : pl.Series
+            The target values.
+        summary_data : List[Dict[str, Any]]
+            The summary rows of the full model, copied and reduced by the identifiability reparameterization.
+        report : FitReport
+            Report collecting the time spent compiling and solving.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Settings passed to the solver.
+        precondition : bool, default=True
+            Whether to center and scale the design columns before solving.
+        """
+        summary_data = [dict(item) for item in summary_data]
+        with report.stage("compile") as entry:
+            qp = compile_qp(self.splines, designs, np.asarray(y, dtype=float))
+            entry["items"] = qp.n_constraints
+
+        self._reparameterization = None
+        self._preconditioning = None
+        M = None
+        if getattr(self, 'identifiable', False):
+            with report.stage("identify") as entry:
+                self._reparameterization = identify(self.splines, designs)
+                M = self._reparameterization.M
+                designs = [d @ m for d, m in zip(designs, self._reparameterization.maps)]
+                entry["items"] = self._reparameterization.n_removed
+            centered = set(self._reparameterization.centered)
+            for item in summary_data:
+                if item["Tag"] in centered:
+                    item["Parameters"] -= 1
+        self._summary_data = summary_data
+
+        problem = qp if M is None else qp.substitute(M)
+        if precondition:
+            with report.stage("precondition") as entry:
+                preconditioner = build_preconditioner(self.splines, designs)
+                problem = preconditioner.apply(problem)
+                M = preconditioner.M if M is None else M @ preconditioner.M
+                self._preconditioning = preconditioner.scalings
+                entry["items"] = len(preconditioner.scalings)
+
+        with report.stage("solve", rows=len(y), params=problem.n_variables):
+            result = solve_qp(problem, solver=self._solver or "OSQP", warm_start=self._qp_warm_start, **(solver_opts or {}))
+        report.solver = result.stats
+
+        self.problem = None
+        self._status = result.status
+        x = result.x
+        if x is not None:
+            self._qp_warm_start = {"x": x, "y": result.y}
+            if M is not None:
+                x = expand_solution(M, x, qp.n_variables)
+        for spline, block in zip(self.splines, qp.blocks):
+            coefs = x[block] if x is not None else None
+            self._store_coefficients(spline, coefs)
+
+    def _fit_backfit(self, X: pl.DataFrame, y: pl.Series, report: Optional[FitReport] = None,
+                     solver_opts: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Fit the model by backfitting, see `backfit`.
+
+        The designs are built and every block is factorized once; blocks are factorized again only when
+        lazily generated constraints add rows. The sweeps start from the coefficients of the previous fit
+        when their sizes match.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        y : pl.Series
+            The target values.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent factorizing and sweeping.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Settings passed to the QP solver of constrained blocks.
+        """
+        report = report if report is not None else FitReport()
+        designs, self._summary_data = self._build_designs(X, report=report)
+        y_np = np.asarray(y, dtype=float)
+        self._reparameterization = None
+        self._preconditioning = None
+        self.problem = None
+
+        previous = self._coefficient_vector()
+        blocks = self._coefficient_blocks()
+        initial = None
+        if previous is not None and len(previous) == blocks[-1].stop:
+            initial = [previous[block] for block in blocks]
+
+        solvers: List[Optional[BlockSolver]] = [None] * len(self.splines)
+        for _ in range(MAX_REFINEMENTS + 1):
+            for j, (spline, design) in enumerate(zip(self.splines, designs)):
+                if solvers[j] is not None and not any(getattr(c, 'lazy', False) for c in spline.constraints):
+                    continue
+                with report.stage("factorize", spline.tag, params=design.shape[1]) as entry:
+                    solvers[j] = BlockSolver(spline, design, solver=self._solver or "OSQP", settings=solver_opts)
+                    entry["items"] = design.shape[1]
+
+            with report.stage("backfit", rows=len(y_np), params=blocks[-1].stop) as entry:
+                result = backfit(solvers, y_np, initial=initial)
+                entry["items"] = result.convergence["iterations"]
+            report.solver = result.stats
+            report.convergence = result.convergence
+
+            self._status = result.status
+            self._store_coefficient_vector(None if result.coefs is None else np.concatenate(result.coefs), blocks)
+            initial = result.coefs
+            if not self._refine_constraints(report=report):
+                break
+
+    def _fit_irls(self, X: pl.DataFrame, y: pl.Series, family: Family, link: LinkFunction, report: Optional[FitReport] = None,
+                  solver_opts: Optional[Dict[str, Any]] = None, time_limit: Optional[float] = None) -> None:
+        """
+        Fit a generalized additive model by iteratively reweighted least squares, see `irls`.
+
+        The designs are built once. Penalties and constraints are compiled without data rows and recompiled
+        only when lazily generated constraints add rows.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        y : pl.Series
+            The target values.
+        family : Family
+            The distribution of the target.
+        link : LinkFunction
+            The link of the linear predictor.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent compiling and iterating.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Settings passed to the inner QP solver.
+        time_limit : Optional[float], default=None
+            Wall time budget in seconds shared by all IRLS iterations (and constraint refinements).
+        """
+        report = report if report is not None else FitReport()
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        # the inner time limit is set per iteration from the remaining budget
+        settings = {k: v for k, v in (solver_opts or {}).items() if k != "time_limit"}
+        designs, self._summary_data = self._build_designs(X, report=report)
+        D = sp.hstack(designs, format='csr')
+        y_np = np.asarray(y, dtype=float)
+        self._reparameterization = None
+        self._preconditioning = None
+        self.problem = None
+
+        for _ in range(MAX_REFINEMENTS + 1):
+            with report.stage("compile") as entry:
+                structure = compile_qp(self.splines, [d[:0] for d in designs], np.zeros(0))
+                entry["items"] = structure.n_constraints
+
+            with report.stage("irls", rows=len(y_np), params=structure.n_variables) as entry:
+                budget = max(deadline - time.perf_counter(), 0.0) if deadline is not None else None
+                result = irls(structure, D, y_np, family, link, solver=self._solver or "OSQP",
+                              warm_start=self._qp_warm_start, time_limit=budget, **settings)
+                entry["items"] = result.convergence["iterations"]
+            report.solver = result.stats
+            report.convergence = result.convergence
+
+            self._status = result.status
+            if result.x is not None:
+                self._qp_warm_start = {"x": result.x, "y": result.y}
+            self._store_coefficient_vector(result.x, structure.blocks)
+            if result.status == "user_limit" and deadline is not None:
+                break
+            if not self._refine_constraints(report=report):
+                break
+
+    def _fit_robust(self, X: pl.DataFrame, y: pl.Series, loss: str, delta: float = 1.0, report: Optional[FitReport] = None,
+                    solver_opts: Optional[Dict[str, Any]] = None, catch_errors: bool = False) -> None:
+        """
+        Fit the model with a robust loss over the stacked design, see `robust_problem`.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        y : pl.Series
+            The target values.
+        loss : str
+            `huber` or `l1`.
+        delta : float, default=1.0
+            The threshold of the Huber loss.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent building and solving.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Keyword arguments passed to the solver.
+        catch_errors : bool, default=False
+            Whether solver errors are reported as a status, see `_run_problem`.
+        """
+        report = report if report is not None else FitReport()
+        designs, self._summary_data = self._build_designs(X, report=report)
+        blocks = self._coefficient_blocks()
+        n_coefs = blocks[-1].stop if blocks else 0
+        D = sp.hstack(designs, format='csr')
+        y_np = np.asarray(y, dtype=float)
+        penalties = penalty_system(self.splines, blocks, n_coefs)
+
+        for _ in range(MAX_REFINEMENTS + 1):
+            with report.stage("compile") as entry:
+                A, lower, upper = constraint_system(self.splines, blocks, n_coefs)
+                self.problem, b = robust_problem(D, y_np, loss, A, lower, upper, penalties, delta=delta)
+                entry["items"] = A.shape[0]
+            with report.stage("solve", rows=len(y_np), params=b.size):
+                self._run_problem(solver_opts, catch_errors=catch_errors)
+            report.record_solver(self.problem)
+            self._store_coefficient_vector(None if b.value is None else np.asarray(b.value), blocks)
+            if not self._refine_constraints(report=report):
+                break
+
+    def _fit_quantiles(self, X: pl.DataFrame, y: pl.Series, quantiles: np.ndarray, non_crossing: bool = False,
+                       report: Optional[FitReport] = None, solver_opts: Optional[Dict[str, Any]] = None,
+                       catch_errors: bool = False) -> None:
+        """
+        Fit the quantile curves over a shared design, see `quantile_problem`.
+
+        The design, penalties and constraint system are built once. With `non_crossing` the coupled curves
+        are one joint LP; otherwise the level is a CVXPY parameter and the compiled problem is re-solved
+        for every quantile.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        y : pl.Series
+            The target values.
+        quantiles : np.ndarray
+            The sorted quantile levels.
+        non_crossing : bool, default=False
+            Whether to order the curves of adjacent quantiles on the training rows.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent building and solving.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Keyword arguments passed to the solver.
+        catch_errors : bool, default=False
+            Whether solver errors are reported as a status, see `_run_problem`.
+        """
+        report = report if report is not None else FitReport()
+        designs, self._summary_data = self._build_designs(X, report=report)
+        blocks = self._coefficient_blocks()
+        n_coefs = blocks[-1].stop if blocks else 0
+        D = sp.hstack(designs, format='csr')
+        y_np = np.asarray(y, dtype=float)
+        penalties = penalty_system(self.splines, blocks, n_coefs)
+        joint = non_crossing and len(quantiles) > 1
+        self._quantiles = quantiles
+
+        for _ in range(MAX_REFINEMENTS + 1):
+            with report.stage("compile") as entry:
+                A, lower, upper = constraint_system(self.splines, blocks, n_coefs)
+                level = quantiles if joint else cp.Parameter(1, name="quantile")
+                self.problem, B = quantile_problem(D, y_np, level, A, lower, upper, penalties, non_crossing=non_crossing)
+                entry["items"] = A.shape[0]
+
+            columns = []
+            for k in range(1 if joint else len(quantiles)):
+                if not joint:
+                    level.value = quantiles[k:k + 1]
+                with report.stage("solve", rows=len(y_np), params=B.size):
+                    self._run_problem(solver_opts, catch_errors=catch_errors)
+                report.record_solver(self.problem)
+                if B.value is None:
+                    break
+                columns.append(np.asarray(B.value))
+            self._quantile_coefficients = np.hstack(columns) if len(columns) == (1 if joint else len(quantiles)) else None
+
+            # lazily generated constraints must hold on every quantile curve
+            added = 0
+            for k in range(len(quantiles)):
+                self._store_coefficient_vector(self._quantile_column(k), blocks)
+                added += self._refine_constraints(report=report)
+            if not added:
+                break
+        self._store_coefficient_vector(self._quantile_column(int(np.argmin(np.abs(quantiles - 0.5)))), blocks)
+
+    def predict_quantiles(self, X: pl.DataFrame) -> np.ndarray:
+        """
+        Predict every quantile curve of a model fitted with `loss="quantile"`.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The feature frame to predict.
+
+        Returns
+        -------
+        np.ndarray
+            The predictions of shape `(n_samples, n_quantiles)`, one column per level of `quantiles`.
+
+        Raises
+        ------
+        ValueError
+            If the model was not fitted with the quantile loss.
+        """
+        if getattr(self, '_quantile_coefficients', None) is None:
+            raise ValueError("The model was not fitted with loss='quantile'.")
+        blocks = self._coefficient_blocks()
+        current = self._coefficient_vector()
+        try:
+            with instrument.span("predict_quantiles", rows=len(X), quantiles=len(self._quantiles)):
+                columns = []
+                for k in range(len(self._quantiles)):
+                    self._store_coefficient_vector(self._quantile_column(k), blocks)
+                    columns.append(self._predict_total(X))
+                return np.column_stack(columns)
+        finally:
+            self._store_coefficient_vector(current, blocks)
+
+    def _quantile_column(self, k: int) -> Optional[np.ndarray]:
+        """Return the global coefficient vector of the `k`-th quantile, or None if the fit failed."""
+        coefs = getattr(self, '_quantile_coefficients', None)
+        return None if coefs is None else coefs[:, k]
+
+    def _coefficient_blocks(self) -> List[slice]:
+        """Return the position of every spline coefficient vector in the global vector."""
+        sizes = [spline.n_basis * spline.n_by_classes for spline in self.splines]
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+        return [slice(offsets[i], offsets[i + 1]) for i in range(len(sizes))]
+
+    def _store_coefficient_vector(self, coefs: Optional[np.ndarray], blocks: List[slice]) -> None:
+        """Write a global coefficient vector, or None, into the coefficient storage of every spline."""
+        for spline, block in zip(self.splines, blocks):
+            self._store_coefficients(spline, coefs[block] if coefs is not None else None)
+
+    def _refine_constraints(self, report: Optional[FitReport] = None) -> int:
+        """
+        Add the violated rows of lazily generated constraints after a successful solve, see `Constraint.refine`.
+
+        Parameters
+        ----------
+        report : Optional[FitReport], default=None
+            Report collecting the time spent checking the constraints.
+
+        Returns
+        -------
+        int
+            The number of rows added; the problem must be solved again when positive.
+        """
+        if self._status not in ("optimal", "optimal_inaccurate"):
+            return 0
+        report = report if report is not None else FitReport()
+        added = 0
+        for spline in self.splines:
+            if not any(getattr(c, 'lazy', False) for c in spline.constraints):
+                continue
+            with report.stage("refine", spline.tag) as entry:
+                n_added = sum(c.refine(spline) for c in spline.constraints)
+                entry["items"] = n_added
+            added += n_added
+        return added
+
+    def _coefficient_vector(self) -> Optional[np.ndarray]:
+        """
+        Concatenate the stored coefficients of all splines in column-major order.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The global coefficient vector, or None if a spline has no coefficients.
+        """
+        parts = []
+        for spline in self.splines:
+            coefs = getattr(spline, '_coefficients', None)
+            if coefs is None:
+                return None
+            parts.append(np.ravel(coefs, order='F'))
+        return np.concatenate(parts)
+
+    def _apply_fallback(self, X: pl.DataFrame, y: pl.Series, previous: Optional[np.ndarray], report: Optional[FitReport] = None,
+                        least_squares: bool = True) -> None:
+        """
+        Replace the coefficients of a fit interrupted by its budget, see `resolve_fallback`, with a `RuntimeWarning`.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The training feature frame.
+        y : pl.Series
+            The target values.
+        previous : Optional[np.ndarray]
+            The coefficients before this fit, used when they match the current problem size.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent in the fallback.
+        least_squares : bool, default=True
+            Whether the projected least-squares solution is a valid fallback, i.e. the loss is squared.
+        """
+        report = report if report is not None else FitReport()
+        with report.stage("fallback", rows=len(X)):
+            designs, _ = self._build_designs(X)
+            sizes = [d.shape[1] for d in designs]
+            offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+            blocks = [slice(offsets[i], offsets[i + 1]) for i in range(len(sizes))]
+            try:
+                A, lower, upper = constraint_system(self.splines, blocks, offsets[-1])
+            except NotImplementedError:
+                # constraints defined through `build_constraint` only cannot be checked outside CVXPY
+                return
+            if previous is not None and len(previous) != offsets[-1]:
+                previous = None
+            coefs, self._fallback = resolve_fallback(
+                self._coefficient_vector(), A, lower, upper,
+                sp.hstack(designs, format='csr') if least_squares else None, np.asarray(y, dtype=float), previous,
+            )
+        warnings.warn(f"The solve stopped with status '{self._status}' within the time limit; "
+                      f"using the '{self._fallback}' fallback.", RuntimeWarning)
+        for spline, block in zip(self.splines, blocks):
+            self._store_coefficients(spline, coefs[block] if coefs is not None else None)
+
+    def _store_coefficients(self, spline: "base_spline.Spline", coefs: Optional[np.ndarray]) -> None:
+        """
+        Write flattened coefficients into the spline coefficient storage.
+
+        Parameters
+        ----------
+        spline : Spline
+            The fitted spline.
+        coefs : Optional[np.ndarray]
+            Coefficients in column-major order over `by` classes, or None if the fit failed.
+        """
+        if coefs is None:
+            spline._coefficients = None
+        elif spline.n_by_classes > 1 or spline.by is not None:
+            spline._coefficients = np.reshape(coefs, (spline.n_basis, spline.n_by_classes), order='F')
+        else:
+            spline._coefficients = np.asarray(coefs)
+
+    def _store_variable_values(self) -> None:
+        """
+        Copy the CVXPY variable values into the spline coefficient storage.
+        """
+        for spline in self.splines:
+            value = spline._coef_vector().value
+            self._store_coefficients(spline, None if value is None else np.asarray(value).ravel())
+
+    def _solve_problem(self, data_loss: cp.Expression, n_rows: int, report: Optional[FitReport] = None,
+                       solver_opts: Optional[Dict[str, Any]] = None, catch_errors: bool = False) -> None:
+        """
+        Set up and solve the convex optimization problem and record its status.
+
+        Parameters
+        ----------
+        data_loss : cp.Expression
+            The squared loss of the additive model, over the rows or from sufficient statistics.
+        n_rows : int
+            The number of training rows, for the report.
+        report : Optional[FitReport], default=None
+            Report collecting the time spent building constraints, penalties and solving.
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Keyword arguments passed to the solver.
+        catch_errors : bool, default=False
+            Whether solver errors are reported as a status, see `_run_problem`.
+        """
+        report = report if report is not None else FitReport()
         penalty_loss = 0
         
         all_constraints = []
         for spline in self.splines:
-            for c in spline.constraints:
-                all_constraints.extend(c.build_constraint(spline))
-            for p in getattr(spline, 'penalties', []):
-                for p_expr in p.build_penalty(spline):
-                    penalty_loss += p_expr
+            with report.stage("build_constraints", spline.tag) as entry:
+                n_before = len(all_constraints)
+                for c in spline.constraints:
+                    all_constraints.extend(c.build_constraint(spline))
+                entry["items"] = len(all_constraints) - n_before
+            with report.stage("build_penalties", spline.tag) as entry:
+                n_terms = 0
+                for p in getattr(spline, 'penalties', []):
+                    for p_expr in p.build_penalty(spline):
+                        penalty_loss += p_expr
+                        n_terms += 1
+                entry["items"] = n_terms
                     
-        objective = cp.Minimize(main_loss + penalty_loss)
+        objective = cp.Minimize(data_loss + penalty_loss)
         
         self.problem = cp.Problem(objective, all_constraints)
-        self.problem.solve()
+        with report.stage("solve", rows=n_rows, params=sum(v.size for v in self.problem.variables())):
+            self._run_problem(solver_opts, catch_errors=catch_errors)
+        report.record_solver(self.problem)
+
+    def _run_problem(self, solver_opts: Optional[Dict[str, Any]] = None, catch_errors: bool = False) -> None:
+        """
+        Solve `problem` with the selected solver and record its status.
+
+        Parameters
+        ----------
+        solver_opts : Optional[Dict[str, Any]], default=None
+            Keyword arguments passed to the solver.
+        catch_errors : bool, default=False
+            Whether a `cp.error.SolverError` is reported as the `solver_error` status, with no coefficients,
+            so that a fit with a `time_limit` goes through the fallbacks. Otherwise it is raised.
+        """
+        try:
+            self.problem.solve(solver=self._solver, **(solver_opts or {}))
+            self._status = self.problem.status
+        except cp.error.SolverError:
+            if not catch_errors:
+                raise
+            for variable in self.problem.variables():
+                variable.value = None
+            self._status = SOLVER_ERROR
 
     def save(self, path: Union[str, pathlib.Path]) -> None:
         """
@@ -309,5 +1504,5 @@ class LpRegressor:
     def summary(self):
         if self._summary_data is None:
             raise ValueError('Model has not been trained properly')
-        print_summary(self._summary_data, self._status)
+        print_summary(self._summary_data, self._status, report=self.fit_report, fallback=getattr(self, '_fallback', None))
 
@@ -0,0 +1,168 @@
+import time
+import tracemalloc
+import contextlib
+import polars as pl
+import cvxpy as cp
+from typing import List, Optional, Dict, Any
+from .. import instrument
+
+
+class FitReport:
+    """
+    Structured record of the time and memory spent in every stage of a fit.
+
+    Each stage entry tracks the wall time, the peak traced memory (when memory tracing is enabled)
+    and the size in bytes of the objects produced by the stage, optionally attached to a spline tag.
+    Solver statistics reported by CVXPY are stored separately in `solver`, and the statistics of iterative
+    fitting engines (iterations, convergence, objective history) in `convergence`.
+    """
+    def __init__(self, trace_memory: bool = False):
+        """
+        Initialize an empty FitReport.
+
+        Parameters
+        ----------
+        trace_memory : bool, default=False
+            Whether to record the peak memory allocated in each stage using `tracemalloc`.
+            Tracing slows down allocations, hence it is disabled by default.
+        """
+        self.trace_memory = trace_memory
+        self.stages: List[Dict[str, Any]] = []
+        self.solver: Dict[str, Any] = {}
+        self.convergence: Dict[str, Any] = {}
+        self.total_time: Optional[float] = None
+        self._owns_tracing = False
+
+    def start(self) -> "FitReport":
+        """
+        Start the global fit clock and, if requested, memory tracing.
+
+        Returns
+        -------
+        FitReport
+            The report instance to allow chaining.
+        """
+        self._t0 = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the global fit clock and release memory tracing if it was started by this report.
+        """
+        self.total_time = time.perf_counter() - self._t0
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str, spline: Optional[str] = None, **tags):
+        """
+        Context manager timing a single fit stage.
+
+        The yielded dictionary can be updated with `size` (bytes of the produced objects) and
+        `items` (number of produced rows, constraints or terms). The stage is also reported
+        as an `lpspline.instrument` span.
+
+        Parameters
+        ----------
+        name : str
+            The stage name, e.g. `init_spline` or `solve`.
+        spline : Optional[str], default=None
+            The tag of the spline the stage refers to, or None for model-wide stages.
+        **tags : dict
+            Additional attributes forwarded to the instrumentation span (rows, params...).
+        """
+        entry = {"stage": name, "spline": spline, "wall_time": 0.0, "peak_memory": None, "size": None, "items": None}
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            mem_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        with instrument.span(name, spline=spline, **tags) as span:
+            t_start = time.perf_counter()
+            try:
+                yield entry
+            finally:
+                entry["wall_time"] = time.perf_counter() - t_start
+                if tracing:
+                    entry["peak_memory"] = max(tracemalloc.get_traced_memory()[1] - mem_start, 0)
+                if entry["items"] is not None:
+                    span.set_tag("items", entry["items"])
+                self.stages.append(entry)
+
+    def record_solver(self, problem: cp.Problem) -> None:
+        """
+        Collect the statistics exposed by a solved CVXPY problem.
+
+        Parameters
+        ----------
+        problem : cp.Problem
+            The solved problem.
+        """
+        stats = problem.solver_stats
+        metrics = problem.size_metrics
+        self.solver = {
+            "solver_name": getattr(stats, "solver_name", None),
+            "num_iters": getattr(stats, "num_iters", None),
+            "setup_time": getattr(stats, "setup_time", None),
+            "solve_time": getattr(stats, "solve_time", None),
+            "compilation_time": getattr(problem, "compilation_time", None),
+            "num_variables": metrics.num_scalar_variables,
+            "num_eq_constraints": metrics.num_scalar_eq_constr,
+            "num_leq_constraints": metrics.num_scalar_leq_constr,
+            "num_data": metrics.num_scalar_data,
+        }
+
+    def stage_totals(self) -> Dict[str, float]:
+        """
+        Sum the wall time spent in every stage name across splines.
+
+        Returns
+        -------
+        Dict[str, float]
+            Mapping from stage name to total wall time in seconds, in first-seen order.
+        """
+        totals: Dict[str, float] = {}
+        for entry in self.stages:
+            totals[entry["stage"]] = totals.get(entry["stage"], 0.0) + entry["wall_time"]
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the report as plain Python containers.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dictionary with `stages`, `solver`, `convergence` and `total_time` keys.
+        """
+        return {
+            "stages": [dict(entry) for entry in self.stages],
+            "solver": dict(self.solver),
+            "convergence": dict(getattr(self, 'convergence', {})),
+            "total_time": self.total_time,
+        }
+
+    def to_frame(self) -> pl.DataFrame:
+        """
+        Returns the per stage records as a Polars DataFrame.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per stage with columns `stage`, `spline`, `wall_time`, `peak_memory`, `size` and `items`.
+        """
+        schema = {
+            "stage": pl.Utf8, "spline": pl.Utf8, "wall_time": pl.Float64,
+            "peak_memory": pl.Int64, "size": pl.Int64, "items": pl.Int64,
+        }
+        return pl.DataFrame(
+            [{k: entry[k] for k in schema} for entry in self.stages],
+            schema=schema,
+        )
+
+    def __repr__(self):
+        total = f"{self.total_time:.4f}s" if self.total_time is not None else "None"
+        return f"FitReport(stages={len(self.stages)}, total_time={total})"
@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Optional
+
+PRECISIONS = ("fast", "balanced", "accurate")
+
+# Tolerance presets per solver. `balanced` matches the defaults CVXPY applies.
+PRECISION_PRESETS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "OSQP": {
+        "fast": {"eps_abs": 1e-3, "eps_rel": 1e-3, "max_iter": 4000},
+        "balanced": {"eps_abs": 1e-5, "eps_rel": 1e-5, "max_iter": 10000},
+        "accurate": {"eps_abs": 1e-8, "eps_rel": 1e-8, "max_iter": 100000},
+    },
+    "CLARABEL": {
+        "fast": {"tol_gap_abs": 1e-5, "tol_gap_rel": 1e-5, "tol_feas": 1e-5},
+        "balanced": {"tol_gap_abs": 1e-8, "tol_gap_rel": 1e-8, "tol_feas": 1e-8},
+        "accurate": {"tol_gap_abs": 1e-10, "tol_gap_rel": 1e-10, "tol_feas": 1e-10},
+    },
+    "SCS": {
+        "fast": {"eps_abs": 1e-3, "eps_rel": 1e-3},
+        "balanced": {"eps_abs": 1e-5, "eps_rel": 1e-5},
+        "accurate": {"eps_abs": 1e-7, "eps_rel": 1e-7, "max_iters": 500000},
+    },
+    "HIGHS": {
+        "fast": {"primal_feasibility_tolerance": 1e-5, "dual_feasibility_tolerance": 1e-5},
+        "balanced": {"primal_feasibility_tolerance": 1e-7, "dual_feasibility_tolerance": 1e-7},
+        "accurate": {"primal_feasibility_tolerance": 1e-9, "dual_feasibility_tolerance": 1e-9},
+    },
+}
+
+# Name of the wall time budget setting, in seconds, of every solver.
+TIME_LIMIT_OPTIONS = {"OSQP": "time_limit", "CLARABEL": "time_limit", "SCS": "time_limit_secs", "HIGHS": "time_limit"}
+
+# Solvers the direct QP engine can call without CVXPY.
+QP_ENGINE_SOLVERS = ("OSQP", "CLARABEL")
+
+
+def problem_class(splines: List["Spline"], quadratic_loss: bool = True) -> str:
+    """
+    Classify the optimization problem built from the splines.
+
+    Parameters
+    ----------
+    splines : List[Spline]
+        The model splines.
+    quadratic_loss : bool, default=True
+        Whether the data loss is quadratic (e.g. squared error).
+
+    Returns
+    -------
+    str
+        `QP` if the objective has a quadratic term, `LP` if it is piecewise linear
+        (linear losses with `Lasso` penalties and linear constraints only).
+    """
+    if quadratic_loss:
+        return "QP"
+    for spline in splines:
+        for p in getattr(spline, 'penalties', []):
+            if p.norm != "l1":
+                return "QP"
+    return "LP"
+
+
+def select_solver(problem_type: str, engine: str = "cvxpy", precision: Optional[str] = None) -> str:
+    """
+    Choose a solver suited to the problem class, engine and precision.
+
+    First-order OSQP is preferred for QPs unless high accuracy is requested, where the
+    interior point Clarabel is more reliable. LPs, which the linear data losses produce with one
+    auxiliary variable per row, go to Clarabel as well: interior point scales with them, simplex does not.
+
+    Parameters
+    ----------
+    problem_type : str
+        `QP` or `LP`, see `problem_class`.
+    engine : str, default="cvxpy"
+        The fitting engine; the direct `qp` engine only supports `QP_ENGINE_SOLVERS`.
+    precision : Optional[str], default=None
+        One of `PRECISIONS`, or None for solver defaults.
+
+    Returns
+    -------
+    str
+        The solver name in CVXPY notation.
+    """
+    if engine == "qp" or problem_type == "QP":
+        return "CLARABEL" if precision == "accurate" else "OSQP"
+    return "CLARABEL"
+
+
+def solver_options(solver: str, precision: Optional[str] = None, solver_opts: Optional[Dict[str, Any]] = None,
+                   time_limit: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Merge the precision preset and time budget of a solver with user supplied options.
+
+    Parameters
+    ----------
+    solver : str
+        The solver name.
+    precision : Optional[str], default=None
+        One of `PRECISIONS`, or None to skip the preset.
+    solver_opts : Optional[Dict[str, Any]], default=None
+        Options passed through to the solver, taking precedence over the preset.
+    time_limit : Optional[float], default=None
+        Wall time budget in seconds, translated into the solver setting of `TIME_LIMIT_OPTIONS`.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The solver keyword arguments.
+
+    Raises
+    ------
+    ValueError
+        If the precision is unknown, or the solver does not support a time limit.
+    """
+    if precision is not None and precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}'. Available presets: {PRECISIONS}")
+    opts: Dict[str, Any] = {}
+    if precision is not None:
+        opts.update(PRECISION_PRESETS.get(solver.upper(), {}).get(precision, {}))
+    if time_limit is not None:
+        if solver.upper() not in TIME_LIMIT_OPTIONS:
+            raise ValueError(f"Solver '{solver}' does not support time_limit. Supported solvers: {tuple(TIME_LIMIT_OPTIONS)}")
+        opts[TIME_LIMIT_OPTIONS[solver.upper()]] = float(time_limit)
+    if solver_opts:
+        opts.update(solver_opts)
+    return opts
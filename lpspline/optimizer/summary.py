@@ -6,7 +6,7 @@ import cvxpy as cp
 
 
 
-def print_summary(summary_data: List[Dict[str, Any]], status: str = None) -> None:
+def print_summary(summary_data: List[Dict[str, Any]], status: str = None, report: Any = None, fallback: str = None) -> None:
     """
     Print a formatted summary console output of the fitted regression model characteristics.
 
@@ -16,6 +16,10 @@ def print_summary(summary_data: List[Dict[str, Any]], status: str = None) -> Non
         A list of mapped dictionaries detailing the specific features per Spline component.
     status: str
         Problem status
+    report: FitReport, default=None
+        Optional fit report whose stage timings and solver statistics are appended to the summary.
+    fallback: str, default=None
+        The fallback used when the solver ran out of budget.
     """
     total_params = sum(item["Parameters"] for item in summary_data)
     status = status if status is not None else "Not fitted"
@@ -25,6 +29,8 @@ def print_summary(summary_data: List[Dict[str, Any]], status: str = None) -> Non
     print("✨ Model Summary ✨")
     print("="*width)
     status_icon = f"✅ {status}" if status == "optimal" else f"❌ {status}"
+    if fallback is not None:
+        status_icon += f" (fallback: {fallback})"
     print(f"Problem Status: {status_icon}")
     print("-" * width)
     print(f"\033[1m{'Spline Type':<20} | {'Term':<12} | {'Tag':<15} | {'Constraints':<20} | {'Penalties':<20} | {'Params':<8}\033[0m")
@@ -36,6 +42,61 @@ def print_summary(summary_data: List[Dict[str, Any]], status: str = None) -> Non
         print(f"🟢 {item['Spline Type']:<17} | {item['Term']:<12} | {tag_str:<15} | {item['Constraints']:<20} | {penalties_str:<20} | {item['Parameters']:<8}")
     print("-" * width)
     print(f"{'📊 Total Parameters':<98} | {total_params}")
+    if report is not None:
+        _print_report(report, width)
     print("="*width + "\n")
 
 
+def _print_report(report: Any, width: int) -> None:
+    """
+    Print the stage timings and solver statistics section of the summary.
+
+    Parameters
+    ----------
+    report : FitReport
+        The fit report to render.
+    width : int
+        Width of the summary table.
+    """
+    print("-" * width)
+    total_time = report.total_time if report.total_time is not None else 0.0
+    print(f"\033[1m{'⏱️  Fit Stage':<40} | {'Wall Time [s]':<15} | {'Peak Memory [MB]':<18}\033[0m")
+    print("-" * width)
+    peaks: Dict[str, float] = {}
+    for entry in report.stages:
+        if entry["peak_memory"] is not None:
+            peaks[entry["stage"]] = max(peaks.get(entry["stage"], 0), entry["peak_memory"])
+    for stage, wall_time in report.stage_totals().items():
+        peak_str = f"{peaks[stage] / 1e6:.2f}" if stage in peaks else "-"
+        print(f"{stage:<40} | {wall_time:<15.4f} | {peak_str:<18}")
+    print(f"{'Total':<40} | {total_time:<15.4f} |")
+    if report.solver.get("solver_name") is not None:
+        solver = report.solver
+        print("-" * width)
+        print(
+            f"Solver: {solver.get('solver_name')} | iterations: {solver.get('num_iters')} | "
+            f"setup: {_fmt_time(solver.get('setup_time'))} | solve: {_fmt_time(solver.get('solve_time'))} | "
+            f"compilation: {_fmt_time(solver.get('compilation_time'))} | variables: {solver.get('num_variables')} | "
+            f"eq/leq constraints: {solver.get('num_eq_constraints')}/{solver.get('num_leq_constraints')}"
+        )
+    convergence = getattr(report, 'convergence', None)
+    if convergence:
+        converged = "✅ converged" if convergence.get("converged") else "❌ not converged"
+        objective = "deviance" if "deviance" in convergence else "objective"
+        details = " | ".join(f"{key}: {convergence[key]}" for key in ("family", "link") if key in convergence)
+        print(
+            f"Convergence ({convergence.get('method')}): {converged} | iterations: {convergence.get('iterations')} | "
+            f"{objective}: {_fmt_float(convergence.get(objective))}" + (f" | {details}" if details else "")
+        )
+
+
+def _fmt_time(value: Any) -> str:
+    """Format an optional time in seconds."""
+    return f"{value:.4f}s" if isinstance(value, (int, float)) else "-"
+
+
+def _fmt_float(value: Any) -> str:
+    """Format an optional objective value."""
+    return f"{value:.6g}" if isinstance(value, (int, float)) else "-"
+
+
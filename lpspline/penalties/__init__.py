@@ -3,4 +3,4 @@
 
 
 from .base import Penalty
-from .smooth import Ridge, Lasso
\ No newline at end of file
+from .smooth import Ridge, Lasso, Smooth, Fused
\ No newline at end of file
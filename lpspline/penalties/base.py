@@ -1,12 +1,107 @@
 import abc
-from typing import List
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Optional
 from ..spline import Spline
 from cvxpy import Expression
 
 class Penalty(abc.ABC):
     """
     Abstract base class defining the algorithmic penalty interface.
+
+    A penalty is `alpha * ||W vec(coefs)||` with the norm given by `norm` (`l2` squared or `l1`)
+    and the operator `W` returned by `build_matrix`.
     """
+    norm = "l2"
+
+    def __init__(self, alpha: float = 1.0, weights: Optional[np.ndarray] = None):
+        """
+        Initialize the penalty structure.
+
+        Parameters
+        ----------
+        alpha : float, default=1.0
+            The optimization severity weighting.
+        weights : Optional[np.ndarray], default=None
+            Optional per-coefficient weights, of length `n_basis` (shared by all `by` classes)
+            or `n_basis * n_by_classes` (column-major, one class after the other).
+        """
+        self._alpha = alpha
+        self._weights = None if weights is None else np.asarray(weights, dtype=float)
+
+    @property
+    def alpha(self) -> float:
+        """
+        Returns the scaling severity.
+
+        Returns
+        -------
+        float
+            Penalty tuning constant.
+        """
+        return self._alpha
+
+    @property
+    def weights(self) -> Optional[np.ndarray]:
+        """
+        Returns the per-coefficient weights.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The weights as provided, or None for uniform weighting.
+        """
+        return self._weights
+
+    def _coef_weights(self, s: Spline) -> Optional[np.ndarray]:
+        """
+        Expands the weights over the flattened coefficients of the spline.
+
+        Parameters
+        ----------
+        s : Spline
+            The Spline instance determining optimization variables.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            Weights of length `n_basis * n_by_classes`, or None for uniform weighting.
+
+        Raises
+        ------
+        ValueError
+            If the weights length matches neither the basis nor the flattened coefficients.
+        """
+        if self._weights is None:
+            return None
+        n_coefs = s.n_basis * s.n_by_classes
+        if len(self._weights) == n_coefs:
+            return self._weights
+        if len(self._weights) == s.n_basis:
+            return np.tile(self._weights, s.n_by_classes)
+        raise ValueError(
+            f"{type(self).__name__} weights must have length {s.n_basis} or {n_coefs}, got {len(self._weights)}"
+        )
+
+    def build_matrix(self, s: Spline) -> sp.csr_matrix:
+        """
+        Builds the sparse operator `W` the norm of the penalty is applied to.
+
+        Parameters
+        ----------
+        s : Spline
+            The Spline instance determining optimization variables.
+
+        Returns
+        -------
+        sp.csr_matrix
+            Matrix with `n_basis * n_by_classes` columns, the diagonal of the weights by default.
+        """
+        w = self._coef_weights(s)
+        if w is None:
+            return sp.identity(s.n_basis * s.n_by_classes, format='csr')
+        return sp.diags(w, format='csr')
+
     @abc.abstractmethod
     def build_penalty(self, s: Spline) -> List[Expression]:
         """
@@ -1,87 +1,174 @@
 import cvxpy as cp
+import scipy.sparse as sp
+from typing import Optional
 from .base import Penalty
 from ..spline import Spline
+from ..constraints.base import _difference_matrix
 
 class Ridge(Penalty):
     """
     L2 Ridge Regularization targeting coefficient smoothness.
     """
-    def __init__(self, alpha: float = 1.0):
+    norm = "l2"
+
+    def build_penalty(self, s: Spline) -> list:
+        """
+        Creates a Ridge penalty: $alpha * \\sum (w v)^2$, as a single atom over all coefficients.
+
+        Parameters
+        ----------
+        s : Spline
+            The targeted function modeling bounds.
+        
+        Returns
+        -------
+        list
+            Returns a list of CVXPY expressions to be mathematically subtracted/added 
+            into the objective solver metric.
+        """
+        v = s._coef_vector()
+        w = self._coef_weights(s)
+        if w is not None:
+            v = cp.multiply(w, v)
+        return [self.alpha * cp.sum_squares(v)]
+
+
+
+class Lasso(Penalty):
+    """
+    L1 Lasso Regularization targeting coefficient sparsity.
+    """
+    norm = "l1"
+
+    def build_penalty(self, s: Spline) -> list:
+        """
+        Creates a Lasso penalty evaluating $alpha * \\sum |w v|$, as a single atom over all coefficients.
+        
+        Parameters
+        ----------
+        s : Spline
+            The targeted function modeling bounds.
+
+        Returns
+        -------
+        list
+            A list of CVXPY absolute weighting expressions applied to the core equation metric.
+        """
+        v = s._coef_vector()
+        w = self._coef_weights(s)
+        if w is not None:
+            v = cp.multiply(w, v)
+        return [self.alpha * cp.norm1(v)]
+
+
+
+class Smooth(Penalty):
+    """
+    L2 difference penalty (P-spline) on adjacent coefficients, penalizing roughness instead of size.
+
+    On a `TensorSpline` the differences are taken along the rows and/or columns of the coefficient grid,
+    giving one marginal penalty per feature. Differences wrap around for periodic B-spline bases.
+    """
+    norm = "l2"
+
+    def __init__(self, alpha: float = 1.0, order: int = 2, axis: Optional[int] = None):
         """
-        Initialize the Ridge penalty structure.
+        Initialize the difference penalty.
 
         Parameters
         ----------
         alpha : float, default=1.0
             The optimization severity weighting.
+        order : int, default=2
+            The difference order, 1 penalizes slopes and 2 curvature.
+        axis : Optional[int], default=None
+            For a `TensorSpline`, the marginal (0 or 1) whose direction is penalized; None penalizes both.
         """
-        self._alpha = alpha
+        super().__init__(alpha=alpha)
+        self.order = order
+        self.axis = axis
 
-    @property
-    def alpha(self) -> float:
+    def build_matrix(self, s: Spline) -> sp.csr_matrix:
         """
-        Returns the scaling severity.
+        Builds the difference operator over the flattened coefficients of all `by` classes.
+
+        Parameters
+        ----------
+        s : Spline
+            The Spline instance determining optimization variables.
 
         Returns
         -------
-        float
-            Penalty tuning constant.
+        sp.csr_matrix
+            Matrix with `n_basis * n_by_classes` columns.
+
+        Raises
+        ------
+        ValueError
+            If `axis` is set on a spline that is not a `TensorSpline`.
         """
-        return self._alpha
+        from ..spline import TensorSpline
+
+        if isinstance(s, TensorSpline):
+            first, second = s.marginals
+            blocks = []
+            if self.axis in (None, 0):
+                blocks.append(sp.kron(_marginal_difference(first, self.order), sp.identity(second.n_basis)))
+            if self.axis in (None, 1):
+                blocks.append(sp.kron(sp.identity(first.n_basis), _marginal_difference(second, self.order)))
+            D = sp.vstack(blocks, format='csr')
+        elif self.axis is not None:
+            raise ValueError(f"Smooth axis applies to TensorSpline only, got '{type(s).__name__}'.")
+        else:
+            D = _marginal_difference(s, self.order)
+        return sp.kron(sp.identity(s.n_by_classes), D, format='csr')
 
     def build_penalty(self, s: Spline) -> list:
         """
-        Creates a Ridge penalty: $alpha * \\sum v^2$.
+        Creates the difference penalty $alpha * \\sum (D v)^2$, as a single atom over all coefficients.
 
         Parameters
         ----------
         s : Spline
             The targeted function modeling bounds.
-        
+
         Returns
         -------
         list
-            Returns a list of CVXPY expressions to be mathematically subtracted/added 
-            into the objective solver metric.
+            A list holding the CVXPY penalty expression.
         """
-        penalties = []
-        for var in s._variables:
-            penalties.append(self.alpha * cp.sum_squares(var))
-        return penalties
+        return [self.alpha * cp.sum_squares(self.build_matrix(s) @ s._coef_vector())]
 
 
 
-class Lasso(Penalty):
+class Fused(Smooth):
     """
-    L1 Lasso Regularization targeting coefficient sparsity.
+    L1 difference penalty (fused lasso) on adjacent coefficients, favouring piecewise constant fits.
+
+    On a `StepSpline` it merges neighbouring bins whose values differ little. The differences are built
+    as for `Smooth`, with a default order of 1.
     """
-    def __init__(self, alpha: float = 1.0):
+    norm = "l1"
+
+    def __init__(self, alpha: float = 1.0, order: int = 1, axis: Optional[int] = None):
         """
-        Initialize the Lasso penalty structure.
+        Initialize the fused lasso penalty.
 
         Parameters
         ----------
         alpha : float, default=1.0
-            The optimization severity weighting scaling absolute value costs.
-        """
-        self._alpha = alpha
-
-    @property
-    def alpha(self) -> float:
-        """
-        Returns the scaling severity.
-
-        Returns
-        -------
-        float
-            Penalty tuning constant.
+            The optimization severity weighting.
+        order : int, default=1
+            The difference order.
+        axis : Optional[int], default=None
+            For a `TensorSpline`, the marginal (0 or 1) whose direction is penalized; None penalizes both.
         """
-        return self._alpha
+        super().__init__(alpha=alpha, order=order, axis=axis)
 
     def build_penalty(self, s: Spline) -> list:
         """
-        Creates a Lasso penalty sum sequence evaluating $alpha * \\sum |v|$.
-        
+        Creates the fused penalty $alpha * \\sum |D v|$, as a single atom over all coefficients.
+
         Parameters
         ----------
         s : Spline
@@ -90,9 +177,35 @@ class Lasso(Penalty):
         Returns
         -------
         list
-            A list of CVXPY absolute weighting expressions applied to the core equation metric.
+            A list holding the CVXPY penalty expression.
         """
-        penalties = []
-        for var in s._variables:
-            penalties.append(self.alpha * cp.sum_abs(var))
-        return penalties
+        return [self.alpha * cp.norm1(self.build_matrix(s) @ s._coef_vector())]
+
+
+def _marginal_difference(s: Spline, order: int) -> sp.csr_matrix:
+    """
+    Returns the difference operator of the given order over the basis of one spline.
+
+    Parameters
+    ----------
+    s : Spline
+        The spline whose coefficients are differenced.
+    order : int
+        The difference order.
+
+    Returns
+    -------
+    sp.csr_matrix
+        Matrix of shape `(n_basis - order, n_basis)`, or `(n_basis, n_basis)` for wrapped differences
+        of a periodic B-spline.
+    """
+    from ..spline import CyclicSpline
+
+    p = s.n_basis
+    if isinstance(s, CyclicSpline) and s.basis == "bspline":
+        step = sp.identity(p, format='csr') - sp.eye(p, k=-1, format='csr') - sp.eye(p, k=p - 1, format='csr')
+        D = sp.identity(p, format='csr')
+        for _ in range(order):
+            D = step @ D
+        return sp.csr_matrix(D)
+    return _difference_matrix(p, order)
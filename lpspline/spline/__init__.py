@@ -5,4 +5,7 @@ from .piecewise_linear import PiecewiseLinear
 from .bspline import BSpline
 from .cyclic_spline import CyclicSpline
 from .factor import Factor
+from .crossed_factor import CrossedFactor
 from .constant import Constant
+from .tensor import TensorSpline
+from .step import StepSpline
@@ -2,7 +2,9 @@
 import abc
 import numpy as np
 import cvxpy as cp
-from typing import List, Optional
+import scipy.sparse as sp
+from typing import List, Optional, Union
+from .. import instrument
 
 class Spline(abc.ABC):
     """
@@ -24,6 +26,8 @@ class Spline(abc.ABC):
         self._constraints = []
         self._penalties = []
         self._variables = []
+        self._coefficients = None # numeric coefficients written by the fitting engine
+        self._coef_map = None # change of variables (M, z) with coefficients M @ z, set by the fitting engine
 
         self._by = None # column name of by reference values
         self._by_classes = None # set of unique by values
@@ -42,6 +46,32 @@ class Spline(abc.ABC):
         """
         return self._by
 
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions (coefficients per `by` class) of the spline.
+
+        Returns
+        -------
+        int
+            The number of columns of the basis matrix.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not define its basis dimension.")
+
+    @property
+    def n_by_classes(self) -> int:
+        """
+        Returns the number of `by` classes the coefficients are replicated over.
+
+        Returns
+        -------
+        int
+            The number of `by` classes, or 1 if the spline has no `by` grouping.
+        """
+        if self._by is not None and self._by_classes is not None:
+            return len(self._by_classes)
+        return 1
+
     @property
     def variables(self) -> List[cp.Variable]:
         """
@@ -79,14 +109,14 @@ class Spline(abc.ABC):
         return self._penalties
 
     @property
-    def term(self) -> str:
+    def term(self) -> Union[str, List[str]]:
         """
         Returns the column name or term this spline models.
 
         Returns
         -------
-        str
-            The column name or term string.
+        Union[str, List[str]]
+            The column name or term string, or the list of columns of a multi-feature term (`TensorSpline`).
         """
         return self._term
 
@@ -110,8 +140,11 @@ class Spline(abc.ABC):
         Returns
         -------
         np.ndarray
-            The computed coefficient values from the CVXPY variables.
+            The coefficient values written by the last fit, or the values of the CVXPY variables.
         """
+        coefficients = getattr(self, '_coefficients', None)
+        if coefficients is not None:
+            return coefficients
         return np.array(self._variables.value)
 
     def init_spline(self, x: np.ndarray, by: np.ndarray = None):
@@ -169,14 +202,29 @@ class Spline(abc.ABC):
         from ..constraints import Monotonic, Convex, Concave, Bound
         from .cyclic_spline import CyclicSpline
         from .factor import Factor
+        from .crossed_factor import CrossedFactor
         from .linear import Linear
         from .piecewise_linear import PiecewiseLinear
+        from .tensor import TensorSpline
+        from .step import StepSpline
         
         for c in constraints:
-            if isinstance(self, (CyclicSpline, Factor)):
+            if isinstance(self, TensorSpline):
+                if not isinstance(c, Monotonic):
+                    raise ValueError(f"{type(self).__name__} cannot accept {type(c).__name__} constraint.")
+                if c.axis not in (0, 1):
+                    raise ValueError("TensorSpline accepts Monotonic constraints along one marginal: set axis to 0 or 1.")
+                marginal = self.marginals[c.axis]
+                if isinstance(marginal, CyclicSpline) and (c.start is None or c.end is None):
+                    raise ValueError("A cyclic marginal can only be monotonic on an interval: set start and end.")
+            if isinstance(self, CyclicSpline) and self.basis == "bspline" and isinstance(c, Monotonic):
+                # a periodic function can only be monotonic on an interval
+                if c.start is None or c.end is None:
+                    raise ValueError("CyclicSpline accepts Monotonic constraints only on an interval: set start and end.")
+            elif isinstance(self, (CyclicSpline, Factor, CrossedFactor)):
                 if isinstance(c, (Monotonic, Convex, Concave)):
                     raise ValueError(f"{type(self).__name__} cannot accept {type(c).__name__} constraint.")
-            if isinstance(self, (Linear)):
+            if isinstance(self, (Linear, StepSpline)):
                 if isinstance(c, (Convex, Concave)):
                     raise ValueError(f"{type(self).__name__} cannot accept {type(c).__name__} constraint.")
                 
@@ -228,6 +276,56 @@ class Spline(abc.ABC):
         """
         pass
 
+    def _build_derivative_basis(self, x: np.ndarray, derivative: int) -> np.ndarray:
+        """
+        Builds the matrix of the basis derivatives with respect to the feature.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input feature array.
+        derivative : int
+            The derivative order, at least 1.
+
+        Returns
+        -------
+        np.ndarray
+            A 2D array of shape `(n_samples, n_basis_funcs)`, dense or sparse as the basis itself.
+
+        Raises
+        ------
+        ValueError
+            If the spline type has no analytic derivative.
+        """
+        raise ValueError(f"{type(self).__name__} does not support derivatives.")
+
+    def _evaluate_basis(self, x: np.ndarray, derivative: int = 0) -> np.ndarray:
+        """
+        Returns the basis, or its derivative of the given order.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The input feature array.
+        derivative : int, default=0
+            The derivative order, 0 for the basis itself.
+
+        Returns
+        -------
+        np.ndarray
+            A 2D array of shape `(n_samples, n_basis_funcs)`.
+
+        Raises
+        ------
+        ValueError
+            If the derivative order is negative.
+        """
+        if derivative < 0:
+            raise ValueError(f"The derivative order must be non-negative, got {derivative}.")
+        if derivative == 0:
+            return self._build_basis(x)
+        return self._build_derivative_basis(x, derivative)
+
     @abc.abstractmethod
     def _build_variables(self) -> cp.Variable:
         """
@@ -266,6 +364,117 @@ class Spline(abc.ABC):
         out[np.arange(n)[mask], by_mapped[mask]] = 1.0
         return out
 
+    def _coef_vector(self) -> cp.Expression:
+        """
+        Returns the CVXPY coefficients flattened in column-major order, one `by` class after the other.
+
+        Returns
+        -------
+        cp.Expression
+            The expression `vec(variables)` constraints and penalties are written against, or `M @ z`
+            when the fitting engine set a change of variables, see `_set_coef_map`.
+        """
+        coef_map = getattr(self, '_coef_map', None)
+        if coef_map is not None:
+            M, z = coef_map
+            return cp.Constant(M) @ z
+        return cp.vec(self._build_variables(), order='F')
+
+    def _set_coef_map(self, M: Optional[sp.spmatrix]) -> None:
+        """
+        Sets the change of variables `vec(variables) = M z` the CVXPY problem is written against.
+
+        Parameters
+        ----------
+        M : Optional[sp.spmatrix]
+            Square matrix of size `n_basis * n_by_classes`, e.g. the column scaling of a preconditioner,
+            with a new variable `z`. None removes the change of variables.
+        """
+        self._coef_map = None if M is None else (sp.csr_matrix(M), cp.Variable(M.shape[1], name=f"{self.tag}_scaled"))
+
+    def _by_codes(self, by: np.ndarray) -> np.ndarray:
+        """
+        Returns the integer class index of every `by` value, -1 for unseen classes.
+
+        Parameters
+        ----------
+        by : np.ndarray
+            A 1D array of group identifiers.
+
+        Returns
+        -------
+        np.ndarray
+            A 1D integer array of class indices into `_by_classes`.
+        """
+        by = np.asarray(by)
+        if getattr(self, '_by_int_map', None) is None:
+            codes = by.astype(int)
+            codes[(codes < 0) | (codes >= len(self._by_classes))] = -1
+            return codes
+        classes = self._by_classes
+        pos = np.clip(np.searchsorted(classes, by), 0, len(classes) - 1)
+        return np.where(classes[pos] == by, pos, -1)
+
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of structurally non-zero basis entries in each row.
+
+        Returns
+        -------
+        int
+            The row non-zero count, equal to `n_basis` for dense bases.
+        """
+        return self.n_basis
+
+    def _build_design(self, x: np.ndarray, by: np.ndarray = None) -> sp.csr_matrix:
+        """
+        Builds the sparse design matrix mapping the flattened coefficients to spline values.
+
+        For `by` splines each row holds the basis values in the block of its class, with
+        columns ordered as the column-major flattening `cp.vec(variables, order='F')`.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input feature array.
+        by : np.ndarray, default=None
+            The 1D grouping array, if the `by` argument is specified.
+
+        Returns
+        -------
+        sp.csr_matrix
+            A sparse matrix of shape `(n_samples, n_basis * n_by_classes)`.
+        """
+        return self._design_from_basis(self._build_basis(x), by=by)
+
+    def _design_from_basis(self, basis: Union[np.ndarray, sp.spmatrix], by: np.ndarray = None) -> sp.csr_matrix:
+        """
+        Spreads a prebuilt basis matrix into the design of `_build_design`.
+
+        Parameters
+        ----------
+        basis : Union[np.ndarray, sp.spmatrix]
+            The basis matrix returned by `_build_basis`.
+        by : np.ndarray, default=None
+            The 1D grouping array, if the `by` argument is specified.
+
+        Returns
+        -------
+        sp.csr_matrix
+            A sparse matrix of shape `(n_samples, n_basis * n_by_classes)`.
+        """
+        basis = sp.csr_matrix(basis)
+        if by is None:
+            return basis
+        n, p = basis.shape
+        coo = basis.tocoo()
+        codes = self._by_codes(by)[coo.row]
+        keep = codes >= 0
+        return sp.csr_matrix(
+            (coo.data[keep], (coo.row[keep], coo.col[keep] + p * codes[keep])),
+            shape=(n, p * self.n_by_classes),
+        )
+
     def __call__(self, x: np.ndarray, by: np.ndarray = None) -> cp.Expression:
         """
         Evaluates the symbolic CVXPY spline expression for the given input `x`.
@@ -288,11 +497,36 @@ class Spline(abc.ABC):
             If no CVXPY variables are defined for the spline prior to evaluation.
         """
 
+        basis = self._build_basis(x)
+        return self._basis_expression(basis, by=by)
+
+    def _basis_expression(self, basis: np.ndarray, by: np.ndarray = None) -> cp.Expression:
+        """
+        Combines a prebuilt basis matrix with the CVXPY variables of the spline.
+
+        Parameters
+        ----------
+        basis : np.ndarray
+            The basis matrix returned by `_build_basis`.
+        by : np.ndarray, default=None
+            The 1D grouping array, if the `by` argument is specified.
+
+        Returns
+        -------
+        cp.Expression
+            A CVXPY Expression representing the spline values for optimization.
+
+        Raises
+        ------
+        ValueError
+            If no CVXPY variables are defined for the spline.
+        """
+        if getattr(self, '_coef_map', None) is not None:
+            return self._design_from_basis(basis, by=by) @ self._coef_vector()
+
         variables = self._build_variables()
         if not variables:
             raise ValueError("No variables defined for this spline.")
-        
-        basis = self._build_basis(x)
 
         if by is None:
             return basis @ variables
@@ -304,7 +538,7 @@ class Spline(abc.ABC):
             return out
 
 
-    def eval(self, x: np.ndarray, return_basis: bool = False, by: np.ndarray = None) -> np.ndarray:
+    def eval(self, x: np.ndarray, return_basis: bool = False, by: np.ndarray = None, derivative: int = 0) -> np.ndarray:
         """
         Evaluates the fitted numeric spline values for the given input `x`.
 
@@ -316,6 +550,9 @@ class Spline(abc.ABC):
             Whether to return the raw basis matrix instead of the evaluated spline.
         by : np.ndarray, default=None
             The 1D integer-encoded grouping array, if the `by` argument is specified.
+        derivative : int, default=0
+            The order of the derivative with respect to `x` to evaluate, from the analytic derivative
+            of the basis. With `return_basis` the derivative basis is returned.
 
         Returns
         -------
@@ -329,16 +566,18 @@ class Spline(abc.ABC):
         """
         assert self.coefficients is not None, "Spline has not been fitted."
         
-        basis = self._build_basis(x)
-
-        if by is None:
-            return basis @ self.coefficients
-        else:
-            onehotby = self._build_one_hot_matrix(by=by)
-            out = basis @ self.coefficients
-            out = np.multiply(out, onehotby)
-            out = np.sum(out, axis=1)
-            return out
+        with instrument.span("eval", spline=self.tag, rows=len(x)):
+            with instrument.span("build_basis", spline=self.tag, rows=len(x)):
+                basis = self._evaluate_basis(x, derivative)
+
+            if by is None:
+                return basis @ self.coefficients
+            else:
+                onehotby = self._build_one_hot_matrix(by=by)
+                out = basis @ self.coefficients
+                out = np.multiply(out, onehotby)
+                out = np.sum(out, axis=1)
+                return out
 
     def __add__(self, other):
         """
@@ -1,6 +1,7 @@
 
 import numpy as np
 import cvxpy as cp
+import scipy.sparse as sp
 from typing import List, Optional, Union
 from .base import Spline
 
@@ -44,6 +45,19 @@ class BSpline(Spline):
         """
         return self._degree
 
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions.
+
+        Returns
+        -------
+        int
+            `n_knots + degree - 1`.
+        """
+        n_knots = self._knots if isinstance(self._knots, int) else len(self._knots)
+        return n_knots + self.degree - 1
+
     @property
     def by(self) -> Optional[str]:
         """
@@ -121,6 +135,17 @@ class BSpline(Spline):
             
         return t_input
 
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of non-zero basis functions at any point, `degree + 1`.
+
+        Returns
+        -------
+        int
+            The row non-zero count.
+        """
+        return min(self.degree + 1, self.n_basis)
+
     def _build_basis(self, x: np.ndarray, **kwargs) -> np.ndarray:
         """
         Builds the B-Spline basis functions using Cox-de Boor recursion.
@@ -162,6 +187,70 @@ class BSpline(Spline):
         return base_basis
 
 
+    def _build_derivative_basis(self, x: np.ndarray, derivative: int) -> np.ndarray:
+        """
+        Builds the derivatives of the B-Spline basis functions.
+
+        Uses the derivative recursion
+        $B'_{i,p}(x) = p (B_{i,p-1}(x) / (t_{i+p} - t_i) - B_{i+1,p-1}(x) / (t_{i+p+1} - t_{i+1}))$:
+        the basis of degree `degree - derivative` is built with Cox-de Boor and mapped by one sparse
+        two-band matrix per derivative order.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Input array of feature values to evaluate.
+        derivative : int
+            The derivative order, at least 1.
+
+        Returns
+        -------
+        np.ndarray
+            Matrix with shape `(n_samples, n_basis_funcs)`, zero when `derivative > degree`.
+        """
+        t = self._pad_knots(self.knots, self.degree)
+        k = self.degree
+
+        x = np.array(x).flatten()
+        n = len(x)
+        m = len(t)
+        if derivative > k:
+            return np.zeros((n, m - k - 1))
+
+        b = self._initialize_basis(x, t, n, m)
+        for p in range(1, k - derivative + 1):
+            b = self._compute_next_degree_basis(b_prev=b, x=x, t=t, p=p, n=n, m=m)
+        for p in range(k - derivative + 1, k + 1):
+            b = np.asarray(b @ self._derivative_matrix(t, p))
+        return b
+
+    def _derivative_matrix(self, t: np.ndarray, p: int) -> sp.csr_matrix:
+        """
+        Maps the basis of degree `p - 1` to the derivatives of the basis of degree `p`.
+
+        Parameters
+        ----------
+        t : np.ndarray
+            Padded knot sequence.
+        p : int
+            The degree of the differentiated basis.
+
+        Returns
+        -------
+        sp.csr_matrix
+            Matrix of shape `(m - p, m - p - 1)` with `m` the number of padded knots.
+        """
+        m = len(t)
+        i = np.arange(m - p - 1)
+        left = t[i + p] - t[i]
+        right = t[i + p + 1] - t[i + 1]
+        upper = np.divide(p, left, out=np.zeros(len(i)), where=left != 0)
+        lower = np.divide(-p, right, out=np.zeros(len(i)), where=right != 0)
+        return sp.csr_matrix(
+            (np.concatenate([upper, lower]), (np.concatenate([i, i + 1]), np.concatenate([i, i]))),
+            shape=(m - p, m - p - 1),
+        )
+
     def _initialize_basis(self, x: np.ndarray, t: np.ndarray, n: int, m: int) -> np.ndarray:
         """
         Initialize degree 0 basis functions.
@@ -269,7 +358,7 @@ class BSpline(Spline):
             A CVXPY Variable of shape `(n_knots + degree - 1, len(by_classes) if by else 1)`.
         """
         if not self._variables:
-            basedim = len(self.knots) + self.degree - 1
+            basedim = self.n_basis
             if self.by is None:
                 self._variables = cp.Variable(shape=(basedim,), name=f"{self.term}_bspline")
             else:
@@ -25,6 +25,18 @@ class Constant(Spline):
         super().__init__(term=term, tag=tag)
         self._variables = []
 
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions.
+
+        Returns
+        -------
+        int
+            Always 1.
+        """
+        return 1
+
     def _build_basis(self, x: np.ndarray) -> np.ndarray:
         """
         Builds the Constant basis function uniformly evaluating to `1.0`.
@@ -41,6 +53,24 @@ class Constant(Spline):
         """
         return np.ones((len(x), 1))
 
+    def _build_derivative_basis(self, x: np.ndarray, derivative: int) -> np.ndarray:
+        """
+        Builds the derivative of the constant basis, identically zero.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Input array used to match the matrix length.
+        derivative : int
+            The derivative order, at least 1.
+
+        Returns
+        -------
+        np.ndarray
+            A 2D matrix of shape `(n_samples, 1)` of zeros.
+        """
+        return np.zeros((len(x), 1))
+
     def _build_variables(self) -> cp.Variable:
         """
         Create the CVXPY variable for the sole intercept coefficient.
@@ -0,0 +1,312 @@
+import numpy as np
+import cvxpy as cp
+import scipy.sparse as sp
+from typing import List, Optional
+from .base import Spline
+from .. import instrument
+
+
+class CrossedFactor(Spline):
+    """
+    Interaction of several categorical columns (e.g. store x weekday) without building their cross product.
+
+    Each column is encoded by binary search over its sorted training levels and the combination is the
+    mixed-radix integer `sum_c code_c * stride_c`, computed vectorized. Coefficients are allocated only for
+    the combinations observed in training; unseen combinations evaluate to zero (or to their main effects).
+
+    With `shrinkage` the term also holds one main effect per level of every column, and the combination
+    coefficients get a ridge penalty of that strength: sparse combinations are shrunk toward the additive
+    main effects instead of toward zero.
+    """
+    def __init__(self, terms: List[str], tag: Optional[str] = 'crossed', shrinkage: Optional[float] = None):
+        """
+        Initialize the CrossedFactor.
+
+        Parameters
+        ----------
+        terms : List[str]
+            The categorical columns to cross, at least two.
+        tag : Optional[str], default='crossed'
+            The descriptive tag denoting spline implementation type.
+        shrinkage : Optional[float], default=None
+            Ridge strength shrinking the combinations toward the main effects of every column. When None
+            the term only holds the combinations.
+
+        Raises
+        ------
+        ValueError
+            If fewer than two columns are given.
+        """
+        if len(terms) < 2:
+            raise ValueError(f"CrossedFactor requires at least two columns, got {terms}.")
+        super().__init__(term=list(terms), tag=tag)
+        self._shrinkage = shrinkage
+        self._classes = None
+        self._combinations = None
+        self._variables = []
+
+    @property
+    def shrinkage(self) -> Optional[float]:
+        """
+        Returns the ridge strength shrinking the combinations toward the main effects.
+
+        Returns
+        -------
+        Optional[float]
+            The shrinkage, or None if the term has no main effects.
+        """
+        return self._shrinkage
+
+    @property
+    def n_main(self) -> int:
+        """
+        Returns the number of main effect coefficients.
+
+        Returns
+        -------
+        int
+            The total number of levels over all columns with `shrinkage`, 0 otherwise.
+        """
+        if self._shrinkage is None or self._classes is None:
+            return 0
+        return sum(len(c) for c in self._classes)
+
+    @property
+    def n_combinations(self) -> int:
+        """
+        Returns the number of observed combinations.
+
+        Returns
+        -------
+        int
+            The number of combination coefficients.
+        """
+        return 0 if self._combinations is None else len(self._combinations)
+
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions.
+
+        Returns
+        -------
+        int
+            The main effects, if any, followed by the observed combinations.
+        """
+        return self.n_main + self.n_combinations
+
+    @property
+    def penalties(self) -> list:
+        """
+        Returns the penalties of the term, including the shrinkage of the combinations.
+
+        Returns
+        -------
+        list
+            The user penalties, followed by a `Ridge` on the combination coefficients with `shrinkage`.
+        """
+        from ..penalties import Ridge
+
+        if self._shrinkage is None or self._combinations is None:
+            return self._penalties
+        weights = np.concatenate([np.zeros(self.n_main), np.ones(self.n_combinations)])
+        return self._penalties + [Ridge(self._shrinkage, weights=weights)]
+
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of non-zero basis entries per row.
+
+        Returns
+        -------
+        int
+            One combination indicator, plus one main effect per column with `shrinkage`.
+        """
+        return 1 + (len(self.term) if self._shrinkage is not None else 0)
+
+    def init_spline(self, x: np.ndarray, by: np.ndarray = None):
+        """
+        Collects the levels of every column and the observed combinations.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D array of shape `(n_samples, n_columns)`.
+        by : np.ndarray, default=None
+            Unused, crossed factors have no `by` grouping.
+
+        Raises
+        ------
+        ValueError
+            If the cross product of the levels does not fit a 64-bit code.
+        """
+        super().init_spline(x, by)
+        x = self._columns(x)
+        self._classes = [np.unique(column) for column in x.T]
+        if np.prod([float(len(c)) for c in self._classes]) >= 2.0 ** 62:
+            raise ValueError("CrossedFactor levels are too many to encode the combinations in 64 bits.")
+        codes = self._combine(self._level_codes(x))
+        self._combinations = np.unique(codes[codes >= 0])
+
+    def _level_codes(self, x: np.ndarray) -> np.ndarray:
+        """
+        Returns the level index of every value, column by column.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D array of shape `(n_samples, n_columns)`.
+
+        Returns
+        -------
+        np.ndarray
+            Integer array of the same shape, -1 for unseen levels.
+        """
+        codes = np.empty(x.shape, dtype=np.int64)
+        for j, classes in enumerate(self._classes):
+            column = x[:, j]
+            pos = np.clip(np.searchsorted(classes, column), 0, len(classes) - 1)
+            codes[:, j] = np.where(classes[pos] == column, pos, -1)
+        return codes
+
+    def _combine(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Returns the mixed-radix code of every combination of level codes.
+
+        Parameters
+        ----------
+        codes : np.ndarray
+            The level codes of shape `(n_samples, n_columns)`.
+
+        Returns
+        -------
+        np.ndarray
+            The int64 combination codes, -1 where a level is unseen.
+        """
+        radix = np.array([len(c) for c in self._classes], dtype=np.int64)
+        strides = np.concatenate([np.cumprod(radix[::-1])[::-1][1:], [1]])
+        combined = codes @ strides
+        return np.where((codes >= 0).all(axis=1), combined, -1)
+
+    def encode(self, x: np.ndarray) -> np.ndarray:
+        """
+        Returns the coefficient indices touched by every row.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D array of shape `(n_samples, n_columns)`.
+
+        Returns
+        -------
+        np.ndarray
+            Integer array of shape `(n_samples, n_columns + 1)` with `shrinkage` (main effects of every
+            column, then the combination) or `(n_samples, 1)` otherwise; -1 for unseen levels or combinations.
+        """
+        x = self._columns(x)
+        level_codes = self._level_codes(x)
+        combined = self._combine(level_codes)
+
+        n_comb = len(self._combinations)
+        pos = np.clip(np.searchsorted(self._combinations, combined), 0, max(n_comb - 1, 0))
+        found = (combined >= 0) & (self._combinations[pos] == combined) if n_comb else np.zeros(len(x), dtype=bool)
+        columns = [np.where(found, self.n_main + pos, -1)]
+
+        if self._shrinkage is not None:
+            offsets = np.concatenate([[0], np.cumsum([len(c) for c in self._classes])[:-1]])
+            mains = np.where(level_codes >= 0, level_codes + offsets, -1)
+            columns = [mains[:, j] for j in range(mains.shape[1])] + columns
+        return np.column_stack(columns)
+
+    def _build_basis(self, x: np.ndarray, **kwargs) -> sp.csr_matrix:
+        """
+        Builds the sparse indicator matrix of the main effects and observed combinations.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D array of shape `(n_samples, n_columns)`.
+
+        Returns
+        -------
+        sp.csr_matrix
+            A sparse binary matrix of shape `(n_samples, n_basis)`.
+        """
+        codes = self.encode(x)
+        keep = codes >= 0
+        rows = np.nonzero(keep)[0]
+        return sp.csr_matrix((np.ones(len(rows)), (rows, codes[keep])), shape=(codes.shape[0], self.n_basis))
+
+    def eval(self, x: np.ndarray, return_basis: bool = False, by: np.ndarray = None, derivative: int = 0) -> np.ndarray:
+        """
+        Evaluates the fitted term by gathering and summing the coefficients touched by every row.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D array of shape `(n_samples, n_columns)`.
+        return_basis : bool, default=False
+            Whether to return the raw basis matrix instead of the evaluated spline.
+        by : np.ndarray, default=None
+            Unused, crossed factors have no `by` grouping.
+        derivative : int, default=0
+            Must be 0: categorical terms have no derivative.
+
+        Returns
+        -------
+        np.ndarray
+            A 1D numpy array of shape `(n_samples,)`.
+
+        Raises
+        ------
+        ValueError
+            If a derivative is requested.
+        """
+        if derivative:
+            return self._build_derivative_basis(x, derivative)
+        if return_basis:
+            return self._build_basis(x)
+        assert self.coefficients is not None, "Spline has not been fitted."
+        with instrument.span("eval", spline=self.tag, rows=len(x)):
+            codes = self.encode(x)
+            coefficients = np.asarray(self.coefficients).ravel()
+            return np.where(codes >= 0, coefficients[np.maximum(codes, 0)], 0.0).sum(axis=1)
+
+    def _columns(self, x: np.ndarray) -> np.ndarray:
+        """
+        Checks the input holds one column per crossed term.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The input array.
+
+        Returns
+        -------
+        np.ndarray
+            The input as a 2D array of shape `(n_samples, n_columns)`.
+
+        Raises
+        ------
+        ValueError
+            If the input does not have one column per term.
+        """
+        x = np.asarray(x)
+        if x.ndim != 2 or x.shape[1] != len(self.term):
+            raise ValueError(f"CrossedFactor expects an array of shape (n_samples, {len(self.term)}), got {x.shape}.")
+        return x
+
+    def _build_variables(self) -> cp.Variable:
+        """
+        Create the CVXPY variables of the main effects and combinations.
+
+        Returns
+        -------
+        cp.Variable
+            A 1D vector of size `(n_basis,)`.
+        """
+        if not self._variables:
+            self._variables = cp.Variable(shape=(self.n_basis,), name=f"{'_'.join(self.term)}_crossed")
+        return self._variables
+
+    def __repr__(self):
+        return f"CrossedFactor(terms={self.term}, n_combinations={self.n_combinations}, shrinkage={self.shrinkage})"
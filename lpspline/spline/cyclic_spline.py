@@ -1,14 +1,77 @@
 
 import numpy as np
 import cvxpy as cp
+import scipy.sparse as sp
 from typing import List, Optional
 from .base import Spline
 
+BASES = ("fourier", "bspline")
+
+
+def fourier_basis(x: np.ndarray, period: float, order: int, dtype: np.dtype = np.float64, layout: str = "F",
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Evaluates the Fourier basis `[1, sin(w x), cos(w x), sin(2 w x), cos(2 w x), ...]` with `w = 2 pi / period`.
+
+    Only the first harmonic calls `np.sin` and `np.cos`; the higher ones follow from the angle-addition
+    recurrence `sin((k+1)a) = sin(ka) cos(a) + cos(ka) sin(a)`, `cos((k+1)a) = cos(ka) cos(a) - sin(ka) sin(a)`,
+    written in place into a preallocated array.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input 1D array of cyclic measurements.
+    period : float
+        The periodicity interval.
+    order : int
+        The number of sine/cosine pairs.
+    dtype : np.dtype, default=np.float64
+        The output precision, e.g. `np.float32` to halve the memory of large designs.
+    layout : str, default="F"
+        Memory layout of the output, `F` (column contiguous, as consumed by sparse solvers) or `C`.
+    out : Optional[np.ndarray], default=None
+        Preallocated output of shape `(len(x), 1 + 2 * order)` to write into.
+
+    Returns
+    -------
+    np.ndarray
+        The basis matrix of shape `(len(x), 1 + 2 * order)`.
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    n = len(x)
+    if out is None:
+        out = np.empty((n, 1 + 2 * order), dtype=dtype, order=layout)
+    out[:, 0] = 1.0
+    if order == 0:
+        return out
+
+    theta = (2 * np.pi / period) * x
+    s1, c1 = np.sin(theta), np.cos(theta)
+    s, c = s1.copy(), c1.copy()
+    tmp = np.empty(n)
+    for k in range(1, order + 1):
+        out[:, 2 * k - 1] = s
+        out[:, 2 * k] = c
+        if k < order:
+            # (s, c) <- (s c1 + c s1, c c1 - s s1)
+            np.multiply(s, c1, out=tmp)
+            np.multiply(s, s1, out=s)
+            np.multiply(c, c1, out=c)
+            np.subtract(c, s, out=c)
+            np.multiply(out[:, 2 * k], s1, out=s)
+            np.add(s, tmp, out=s)
+    return out
+
+
 class CyclicSpline(Spline):
     """
     Periodic Cyclic Spline defined by Fourier series expansions.
+
+    With `basis="bspline"` the term is instead a periodic B-spline on `knots` evenly spaced knots wrapped
+    modulo `period`: every row touches only `degree + 1` columns and the basis is returned sparse.
     """
-    def __init__(self, term: str, order: int, period: float = None, tag: Optional[str] = 'cyclicspline', by: Optional[str] = None):
+    def __init__(self, term: str, order: int = None, period: float = None, tag: Optional[str] = 'cyclicspline', by: Optional[str] = None,
+                 basis: str = "fourier", knots: int = None, degree: int = 3):
         """
         Initialize the Cyclic Spline.
 
@@ -16,20 +79,41 @@ class CyclicSpline(Spline):
         ----------
         term : str
             The column name denoting the periodic feature.
-        order : int
-            The number of sine/cosine pairs to generate.
+        order : int, default=None
+            The number of sine/cosine pairs to generate. Required by the `fourier` basis.
         period : float, default=None
             The periodicity interval. If None, it is inferred from data.
         tag : Optional[str], default='cyclicspline'
             A tag for identification.
         by : Optional[str], default=None
             The column name denoting group classes if interaction modeling is required.
+        basis : str, default="fourier"
+            The periodic basis, `fourier` or `bspline`.
+        knots : int, default=None
+            The number of evenly spaced knots over one period, i.e. the number of basis functions.
+            Required by the `bspline` basis.
+        degree : int, default=3
+            The polynomial degree of the `bspline` basis.
+
+        Raises
+        ------
+        ValueError
+            If the basis is unknown or its size parameter is missing.
         """
+        if basis not in BASES:
+            raise ValueError(f"Unknown basis '{basis}'. Available bases: {BASES}")
+        if basis == "fourier" and order is None:
+            raise ValueError("The fourier basis requires `order`.")
+        if basis == "bspline" and (knots is None or knots < degree + 1):
+            raise ValueError(f"The bspline basis requires `knots` >= degree + 1 = {degree + 1}.")
         super().__init__(term=term, tag=tag)
         self._period = period
         self._order = order
         self._by = by
         self._variables = []
+        self._basis = basis
+        self._knots = knots
+        self._degree = degree
 
     @property
     def period(self) -> float:
@@ -55,6 +139,69 @@ class CyclicSpline(Spline):
         """
         return self._order
 
+    @property
+    def basis(self) -> str:
+        """
+        Returns the periodic basis of the spline.
+
+        Returns
+        -------
+        str
+            `fourier` or `bspline`.
+        """
+        return getattr(self, '_basis', "fourier")
+
+    @property
+    def knots(self) -> Optional[int]:
+        """
+        Returns the number of knots of the `bspline` basis.
+
+        Returns
+        -------
+        Optional[int]
+            The number of evenly spaced knots over one period, or None for the `fourier` basis.
+        """
+        return getattr(self, '_knots', None)
+
+    @property
+    def degree(self) -> int:
+        """
+        Returns the polynomial degree of the `bspline` basis.
+
+        Returns
+        -------
+        int
+            The B-spline degree.
+        """
+        return getattr(self, '_degree', 3)
+
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions.
+
+        Returns
+        -------
+        int
+            `1 + 2 * order`, or `knots` for the `bspline` basis.
+        """
+        if self.basis == "bspline":
+            return self.knots
+        return 1 + 2 * self.order
+
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of structurally non-zero basis entries in each row.
+
+        Returns
+        -------
+        int
+            `degree + 1` for the `bspline` basis, `n_basis` for the dense Fourier basis.
+        """
+        if self.basis == "bspline":
+            return min(self.degree + 1, self.n_basis)
+        return self.n_basis
+
     def init_spline(self, x: np.ndarray, by: np.ndarray = None):
         """
         Initializes the periodic boundary conditions based on data.
@@ -85,24 +232,144 @@ class CyclicSpline(Spline):
         x : np.ndarray
             Input 1D array of cyclic measurements.
         **kwargs : dict
-            Additional format arguments.
+            Additional format arguments: `dtype` and `layout` of the Fourier basis, see `fourier_basis`.
         
         Returns
         -------
         np.ndarray
             A 2D mathematical basis matrix of shape `(n_samples, 1 + 2 * order)`.
         """
-        x = np.array(x).flatten()
+        if self.basis == "bspline":
+            return self._build_periodic_bspline_basis(x)
+        return fourier_basis(x, self.period, self.order, dtype=kwargs.get("dtype", np.float64), layout=kwargs.get("layout", "F"))
+
+    def _build_periodic_bspline_basis(self, x: np.ndarray) -> sp.csr_matrix:
+        """
+        Builds the sparse periodic B-spline basis on evenly spaced knots.
+
+        The basis function `j` is the cardinal B-spline starting at knot `j`, wrapped modulo `period`.
+        In the knot cell `i` the non-zero functions are `i - degree, ..., i` (modulo `knots`), evaluated
+        with the de Boor triangle on unit spacing.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Input 1D array of cyclic measurements.
+
+        Returns
+        -------
+        sp.csr_matrix
+            Matrix of shape `(n_samples, knots)` with `degree + 1` non-zeros per row.
+        """
+        return self._build_periodic_bspline_derivative_basis(x, 0)
+
+    def _build_periodic_bspline_derivative_basis(self, x: np.ndarray, derivative: int) -> sp.csr_matrix:
+        """
+        Builds the sparse periodic B-spline basis, or its derivative, on evenly spaced knots.
+
+        The de Boor triangle is run to degree `degree - derivative`; every derivative order then maps the
+        cell values with the unit-spacing recursion `N'_{j,p} = N_{j,p-1} - N_{j+1,p-1}` and the chain
+        rule factor `knots / period`.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Input 1D array of cyclic measurements.
+        derivative : int
+            The derivative order, 0 for the basis itself.
+
+        Returns
+        -------
+        sp.csr_matrix
+            Matrix of shape `(n_samples, knots)` with `degree + 1` non-zeros per row.
+        """
+        x = np.asarray(x, dtype=float).ravel()
         n = len(x)
-        basis_list = [np.ones_like(x)]
-        
-        for k in range(1, self.order + 1):
-            omega = 2 * np.pi * k / self.period
-            basis_list.append(np.sin(omega * x))
-            basis_list.append(np.cos(omega * x))
-            
-        base_basis = np.vstack(basis_list).T    
-        return base_basis
+        K, d = self.knots, self.degree
+        if derivative > d:
+            return sp.csr_matrix((n, K))
+        u = np.mod(x, self.period) / self.period * K
+        cell = np.minimum(np.floor(u).astype(int), K - 1)
+        t = u - cell
+
+        values = [np.ones(n)]
+        for j in range(1, d - derivative + 1):
+            saved = np.zeros(n)
+            for r in range(j):
+                temp = values[r] / j
+                right, left = r + 1 - t, t + j - r - 1
+                values[r] = saved + right * temp
+                saved = left * temp
+            values.append(saved)
+
+        scale = K / self.period
+        zero = np.zeros(n)
+        for _ in range(derivative):
+            # the function r of the cell holds the lower-degree functions r - 1 and r
+            values = [scale * (low - high) for low, high in zip([zero] + values, values + [zero])]
+
+        rows = np.repeat(np.arange(n), d + 1)
+        cols = np.mod(cell[:, None] - d + np.arange(d + 1), K).ravel()
+        data = np.stack(values, axis=1).ravel()
+        return sp.csr_matrix((data, (rows, cols)), shape=(n, K))
+
+    def _build_derivative_basis(self, x: np.ndarray, derivative: int) -> np.ndarray:
+        """
+        Builds the derivatives of the periodic basis.
+
+        Every Fourier pair is rotated by a quarter period per order,
+        $d^n/dx^n \\sin(k w x) = (k w)^n \\sin(k w x + n \\pi / 2)$, so the derivative reuses the
+        basis values; the `bspline` basis uses the cardinal B-spline derivative recursion.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Input 1D array of cyclic measurements.
+        derivative : int
+            The derivative order, at least 1.
+
+        Returns
+        -------
+        np.ndarray
+            Matrix of shape `(n_samples, n_basis)`, sparse for the `bspline` basis.
+        """
+        if self.basis == "bspline":
+            return self._build_periodic_bspline_derivative_basis(x, derivative)
+
+        basis = fourier_basis(x, self.period, self.order)
+        out = np.zeros_like(basis)
+        sin, cos = basis[:, 1::2], basis[:, 2::2]
+        # sin(a + n pi / 2), cos(a + n pi / 2) for n modulo 4
+        rotated = [(sin, cos), (cos, -sin), (-sin, -cos), (-cos, sin)][derivative % 4]
+        scale = (2 * np.pi / self.period * np.arange(1, self.order + 1)) ** derivative
+        out[:, 1::2] = rotated[0] * scale
+        out[:, 2::2] = rotated[1] * scale
+        return out
+
+    def _support_cells(self, start: float = None, end: float = None) -> np.ndarray:
+        """
+        Returns the knot cells of the `bspline` basis covering the interval `[start, end]`, wrapping around the period.
+
+        Parameters
+        ----------
+        start : float, default=None
+            The interval start; None with `end` None selects the whole period.
+        end : float, default=None
+            The interval end. An `end` smaller than `start` wraps through the period boundary.
+
+        Returns
+        -------
+        np.ndarray
+            The sorted cell indices.
+        """
+        K = self.knots
+        if start is None or end is None or end - start >= self.period:
+            return np.arange(K)
+        first = min(int(np.floor(np.mod(start, self.period) / self.period * K)), K - 1)
+        last = min(int(np.floor(np.mod(end, self.period) / self.period * K)), K - 1)
+        if first <= last:
+            return np.arange(first, last + 1)
+        return np.concatenate([np.arange(first, K), np.arange(0, last + 1)])
 
     def _build_variables(self) -> cp.Variable:
         """
@@ -114,7 +381,7 @@ class CyclicSpline(Spline):
             A CVXPY Variable of shape `(1 + 2 * order, len(by_classes) if by else 1)`.
         """
         if isinstance(self._variables, list) and not self._variables:
-            dim_base = 1 + 2 * self.order
+            dim_base = self.n_basis
             if self._by is not None:
                 self._variables = cp.Variable(shape=(dim_base, len(self._by_classes)), name=f"{self.term}_cyclic")
             else:
@@ -122,4 +389,6 @@ class CyclicSpline(Spline):
         return self._variables
 
     def __repr__(self):
+        if self.basis == "bspline":
+            return f"CyclicSpline(term='{self.term}', period={self.period}, knots={self.knots}, degree={self.degree}, by={self._by}, basis='bspline')"
         return f"CyclicSpline(term='{self.term}', period={self.period}, order={self.order}, by={self._by})"
@@ -1,14 +1,50 @@
-
+import zlib
 import numpy as np
 import cvxpy as cp
+import scipy.sparse as sp
 from typing import List, Optional
 from .base import Spline
+from .. import instrument
+
+
+def hash_bucket(values: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Deterministically maps values to buckets with the CRC32 of their string representation.
+
+    Unlike the built-in `hash`, the mapping does not depend on the interpreter session, so a saved model
+    assigns the same buckets when loaded elsewhere. Only the distinct values are hashed.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The 1D array of categories.
+    n_buckets : int
+        The number of buckets.
+
+    Returns
+    -------
+    np.ndarray
+        Integer bucket indices in `[0, n_buckets)`.
+    """
+    uniques, inverse = np.unique(np.asarray(values), return_inverse=True)
+    buckets = np.fromiter((zlib.crc32(str(v).encode()) for v in uniques), dtype=np.int64, count=len(uniques))
+    return (buckets % n_buckets)[inverse.ravel()]
+
 
 class Factor(Spline):
     """
-    Categorical Factor mapping utilizing a one-hot-encoded basis.
+    Categorical Factor mapping utilizing a sparse one-hot-encoded basis.
+
+    For high-cardinality (ID-like) columns the number of coefficients can be bounded:
+
+    - `min_count`: classes seen fewer times in training are pooled, with unseen classes, into one "other" level.
+    - `hash_buckets`: the pooled classes (all classes when `min_count` is not set) are instead spread
+      deterministically over a fixed number of hashed buckets.
+
+    Classes are encoded by binary search over the sorted kept classes, and every row holds a single indicator.
     """
-    def __init__(self, term: str, tag: Optional[str] = 'factor', n_classes: Optional[int] = None):
+    def __init__(self, term: str, tag: Optional[str] = 'factor', n_classes: Optional[int] = None,
+                 hash_buckets: Optional[int] = None, min_count: Optional[int] = None):
         """
         Initialize the Factor.
 
@@ -21,9 +57,16 @@ class Factor(Spline):
         n_classes : Optional[int], default=None
             The number of explicitly known classes or categories natively included in the data array `x`.
             If not populated, it uses the length of exactly uniquely present feature subsets.
+        hash_buckets : Optional[int], default=None
+            Number of hashed buckets receiving the long-tail and unseen classes.
+        min_count : Optional[int], default=None
+            Minimum number of training rows for a class to keep its own level. Rarer and unseen classes
+            are pooled into the "other" level, or into the hashed buckets when `hash_buckets` is set.
         """
         super().__init__(term=term, tag=tag)
         self._n_classes = n_classes
+        self._hash_buckets = hash_buckets
+        self._min_count = min_count
         self._variables = []
 
     @property
@@ -38,6 +81,83 @@ class Factor(Spline):
         """
         return self._n_classes
 
+    @property
+    def hash_buckets(self) -> Optional[int]:
+        """
+        Returns the number of hashed buckets.
+
+        Returns
+        -------
+        Optional[int]
+            The number of buckets, or None if hashing is disabled.
+        """
+        return getattr(self, '_hash_buckets', None)
+
+    @property
+    def min_count(self) -> Optional[int]:
+        """
+        Returns the minimum count for a class to keep its own level.
+
+        Returns
+        -------
+        Optional[int]
+            The threshold, or None if rare classes are not pooled.
+        """
+        return getattr(self, '_min_count', None)
+
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions: the kept classes plus the pooled levels.
+
+        Returns
+        -------
+        int
+            The number of classes, or kept classes plus `hash_buckets` (or one "other" level).
+        """
+        if self.hash_buckets is None and self.min_count is None:
+            return self.n_classes
+        return self._n_kept() + (self.hash_buckets if self.hash_buckets is not None else 1)
+
+    @property
+    def levels(self) -> List[str]:
+        """
+        Returns the label of every coefficient.
+
+        Returns
+        -------
+        List[str]
+            The kept classes, followed by `other` or the `bucket_<i>` labels.
+        """
+        levels = [str(c) for c in getattr(self, '_classes', [])]
+        if self.hash_buckets is not None:
+            levels += [f"bucket_{i}" for i in range(self.hash_buckets)]
+        elif self.min_count is not None:
+            levels.append("other")
+        return levels
+
+    def _n_kept(self) -> int:
+        """
+        Returns the number of classes with their own level.
+
+        Returns
+        -------
+        int
+            The length of the sorted kept classes.
+        """
+        return len(getattr(self, '_classes', []))
+
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of non-zero basis entries per row, a single indicator.
+
+        Returns
+        -------
+        int
+            Always 1.
+        """
+        return 1
+
     def init_spline(self, x: np.ndarray, by: np.ndarray = None):
         """
         Introspectively determines the number of categorical instances locally contained in `x`
@@ -51,40 +171,107 @@ class Factor(Spline):
             The grouped indexing column if modeling interactions.
         """
         super().init_spline(x, by)
-        self._classes = np.unique(x)
-        self._int_map = {c: i for i, c in enumerate(self._classes)}
+        classes, counts = np.unique(np.asarray(x).ravel(), return_counts=True)
+        if self.min_count is not None:
+            classes = classes[counts >= self.min_count]
+        elif self.hash_buckets is not None:
+            classes = classes[:0]
+        self._classes = classes
         if self._n_classes is None:
             self._n_classes = len(self._classes)
-        
 
-    def _build_basis(self, x: np.ndarray) -> np.ndarray:
+    def encode(self, x: np.ndarray) -> np.ndarray:
         """
-        Generates the one-hot-encoded transformation matrix for evaluated inputs.
+        Returns the coefficient index of every category.
 
         Parameters
         ----------
         x : np.ndarray
-            Categorical representation list implicitly structured as indexed zero-based classes.
+            The 1D array of categories.
 
         Returns
         -------
         np.ndarray
-            A 2D binary matrix of shape `(n_samples, n_classes)`.
+            Integer indices into `levels`; -1 for classes without a level (unseen, without pooling).
         """
-        # One-hot encoding
-        x_flat = np.array(x).flatten()
-        if getattr(self, '_int_map', None) is not None:
-            x_mapped = np.array([self._int_map.get(v, -1) for v in x_flat])
+        x = np.asarray(x).ravel()
+        classes = getattr(self, '_classes', None)
+        if classes is None:
+            # not initialized: categories are the zero-based class indices
+            codes = x.astype(int)
+            codes[(codes < 0) | (codes >= self.n_basis)] = -1
+            return codes
+
+        n_kept = len(classes)
+        if n_kept:
+            pos = np.clip(np.searchsorted(classes, x), 0, n_kept - 1)
+            codes = np.where(classes[pos] == x, pos, -1)
         else:
-            x_mapped = x_flat.astype(int)
-            
-        n = len(x_mapped)
-        basis = np.zeros((n, self.n_classes))
-        
-        mask = (x_mapped >= 0) & (x_mapped < self.n_classes)
-        basis[np.arange(n)[mask], x_mapped[mask]] = 1.0
-        
-        return basis
+            codes = np.full(len(x), -1)
+
+        pooled = codes < 0
+        if self.hash_buckets is None and self.min_count is None:
+            codes[codes >= self.n_basis] = -1
+        elif self.hash_buckets is not None:
+            if pooled.any():
+                codes[pooled] = n_kept + hash_bucket(x[pooled], self.hash_buckets)
+        elif self.min_count is not None:
+            codes[pooled] = n_kept
+        return codes
+
+    def _build_basis(self, x: np.ndarray) -> sp.csr_matrix:
+        """
+        Generates the sparse one-hot-encoded transformation matrix for evaluated inputs.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Categorical representation list implicitly structured as indexed zero-based classes.
+
+        Returns
+        -------
+        sp.csr_matrix
+            A sparse binary matrix of shape `(n_samples, n_basis)` with at most one non-zero per row.
+        """
+        codes = self.encode(x)
+        keep = codes >= 0
+        indptr = np.concatenate([[0], np.cumsum(keep)])
+        return sp.csr_matrix((np.ones(int(keep.sum())), codes[keep], indptr), shape=(len(codes), self.n_basis))
+
+    def eval(self, x: np.ndarray, return_basis: bool = False, by: np.ndarray = None, derivative: int = 0) -> np.ndarray:
+        """
+        Evaluates the fitted factor by gathering the coefficient of every category.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D array of categories.
+        return_basis : bool, default=False
+            Whether to return the raw basis matrix instead of the evaluated spline.
+        by : np.ndarray, default=None
+            Unused, factors have no `by` grouping.
+        derivative : int, default=0
+            Must be 0: categorical terms have no derivative.
+
+        Returns
+        -------
+        np.ndarray
+            A 1D numpy array of shape `(n_samples,)`; categories without a level evaluate to zero.
+
+        Raises
+        ------
+        ValueError
+            If a derivative is requested.
+        """
+        if derivative:
+            return self._build_derivative_basis(x, derivative)
+        if return_basis:
+            return self._build_basis(x)
+        assert self.coefficients is not None, "Spline has not been fitted."
+        with instrument.span("eval", spline=self.tag, rows=len(x)):
+            codes = self.encode(x)
+            coefficients = np.asarray(self.coefficients).ravel()
+            return np.where(codes >= 0, coefficients[np.maximum(codes, 0)], 0.0)
 
     def _build_variables(self) -> cp.Variable:
         """
@@ -93,12 +280,17 @@ class Factor(Spline):
         Returns
         -------
         cp.Variable
-            A 1D dimensional vector tracking factor biases sized `(n_classes,)`.
+            A 1D dimensional vector tracking factor biases sized `(n_basis,)`.
         """
         if not self._variables:
-            dim = self.n_classes
+            dim = self.n_basis
             self._variables = cp.Variable(shape=(dim,), name=f"{self.term}_factor")
         return self._variables
 
     def __repr__(self):
-        return f"Factor(term='{self.term}', n_classes={self.n_classes})"
+        extra = ""
+        if self.hash_buckets is not None:
+            extra += f", hash_buckets={self.hash_buckets}"
+        if self.min_count is not None:
+            extra += f", min_count={self.min_count}"
+        return f"Factor(term='{self.term}', n_classes={self.n_classes}{extra})"
@@ -29,6 +29,18 @@ class Linear(Spline):
         self._by = by
         self._by_classes = None
 
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions.
+
+        Returns
+        -------
+        int
+            2 with an intercept column, 1 otherwise.
+        """
+        return 2 if self.bias else 1
+
     def init_spline(self, x: np.ndarray, by: np.ndarray = None):
         """
         Introspectively determines unique categories for nested grouping mappings.
@@ -63,6 +75,27 @@ class Linear(Spline):
         assert x.ndim == 1, "x must be a 1D array"
         return np.hstack([np.ones((len(x), 1)), x.reshape(-1, 1)]) if self.bias else x.reshape(-1, 1)
 
+    def _build_derivative_basis(self, x: np.ndarray, derivative: int) -> np.ndarray:
+        """
+        Builds the derivative of the linear basis: the slope column is one for the first derivative.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input numeric feature sequence array.
+        derivative : int
+            The derivative order, at least 1.
+
+        Returns
+        -------
+        np.ndarray
+            A 2D matrix of shape `(n_samples, n_basis)`, zero but for the slope column when `derivative=1`.
+        """
+        basis = np.zeros((len(x), self.n_basis))
+        if derivative == 1:
+            basis[:, -1] = 1.0
+        return basis
+
     def _build_variables(self) -> cp.Variable:
         """
         Create the respective individual mapping variables mapping directly to slopes and bounds.
@@ -73,7 +106,7 @@ class Linear(Spline):
             A CVXPY Variable dimensioned according to the bias configuration length.
         """
         if not self._variables:
-            basedim = 2 if self.bias else 1
+            basedim = self.n_basis
             if self.by is None:
                 self._variables = cp.Variable(shape=(basedim,), name=f"{self.term}_linear")
             else:
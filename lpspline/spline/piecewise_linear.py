@@ -1,14 +1,26 @@
 
 import numpy as np
 import cvxpy as cp
+import scipy.sparse as sp
 from typing import List, Optional, Union
 from .base import Spline
 
+BASES = ("truncated", "hat")
+
+
 class PiecewiseLinear(Spline):
     """
     Piecewise Linear Spine framework built primarily around discrete ReLU knot bases.
+
+    Two parameterizations of the piecewise linear functions with breakpoints at the knots are available:
+
+    - `truncated`: `[1, x, max(0, x - k_1), ...]`, coefficients are intercept, slope and slope changes.
+    - `hat`: degree-1 B-splines, one local "hat" function per knot with two non-zeros per row.
+      Coefficients are the function values at the knots; outside the knots the end segments are
+      extended linearly. Use `truncated_coefficients` to recover the `truncated` semantics.
     """
-    def __init__(self, term: str, knots: Union[int, np.ndarray], tag: Optional[str] = 'pwl', by: Optional[str] = None):
+    def __init__(self, term: str, knots: Union[int, np.ndarray], tag: Optional[str] = 'pwl', by: Optional[str] = None,
+                 basis: str = "truncated"):
         """
         Initialize the Piecewise Linear Spline.
 
@@ -22,9 +34,21 @@ class PiecewiseLinear(Spline):
             The descriptive tag denoting spline implementation type.
         by : Optional[str], default=None
             The column representing interaction categorical groupings.
+        basis : str, default="truncated"
+            The parameterization, `truncated` or `hat`. With `hat` the basis is built on the sorted unique
+            knots extended with the training range (`basis_knots`), so the first and last knots bound the data.
+
+        Raises
+        ------
+        ValueError
+            If the basis is unknown.
         """
+        if basis not in BASES:
+            raise ValueError(f"Unknown basis '{basis}'. Available bases: {BASES}")
         super().__init__(term=term, tag=tag)
         self._knots = knots
+        self._basis = basis
+        self._hat_knots = None
         self._by = by
         self._variables = []
 
@@ -40,6 +64,60 @@ class PiecewiseLinear(Spline):
         """
         return self._knots
 
+    @property
+    def basis_knots(self) -> Union[int, np.ndarray]:
+        """
+        Returns the knots the basis is built on.
+
+        Returns
+        -------
+        Union[int, np.ndarray]
+            The knots, extended with the training range for the `hat` basis once initialized.
+        """
+        hat_knots = getattr(self, '_hat_knots', None)
+        return hat_knots if hat_knots is not None else self._knots
+
+    @property
+    def basis(self) -> str:
+        """
+        Returns the parameterization of the spline.
+
+        Returns
+        -------
+        str
+            `truncated` or `hat`.
+        """
+        return getattr(self, '_basis', "truncated")
+
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions.
+
+        Returns
+        -------
+        int
+            Intercept and slope plus one hinge per knot, or one hat per knot.
+        """
+        knots = self.basis_knots
+        n_knots = knots if isinstance(knots, int) else len(knots)
+        if self.basis == "hat":
+            return n_knots
+        return 2 + n_knots
+
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of structurally non-zero basis entries in each row.
+
+        Returns
+        -------
+        int
+            2 for the hat basis, `n_basis` for the dense truncated basis.
+        """
+        if self.basis == "hat":
+            return min(2, self.n_basis)
+        return self.n_basis
+
     @property
     def by(self) -> Optional[str]:
         """
@@ -68,6 +146,8 @@ class PiecewiseLinear(Spline):
             self._knots = np.linspace(np.min(x), np.max(x), self._knots)
         else:
             self._knots = np.sort(self._knots)
+        if self.basis == "hat":
+            self._hat_knots = np.unique(np.concatenate([[np.min(x)], self._knots, [np.max(x)]]))
 
     def _build_basis(self, x: np.ndarray, **kwargs) -> np.ndarray:
         """
@@ -87,6 +167,9 @@ class PiecewiseLinear(Spline):
         np.ndarray
             Matrix containing structural features with shape `(n_samples, 2 + len(knots))`.
         """
+        if self.basis == "hat":
+            return self._build_hat_basis(x)
+
         x = np.array(x).flatten()
         n = len(x)
         
@@ -97,6 +180,101 @@ class PiecewiseLinear(Spline):
         base_basis = np.vstack(basis_list).T
         return base_basis
 
+    def _build_hat_basis(self, x: np.ndarray) -> sp.csr_matrix:
+        """
+        Builds the sparse degree-1 B-spline basis, linear between consecutive knots.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Input dataset array points.
+
+        Returns
+        -------
+        sp.csr_matrix
+            Matrix of shape `(n_samples, len(basis_knots))` with two non-zeros per row.
+        """
+        x = np.asarray(x, dtype=float).ravel()
+        n = len(x)
+        knots = np.asarray(self.basis_knots, dtype=float)
+        m = len(knots)
+        if m == 1:
+            return sp.csr_matrix(np.ones((n, 1)))
+
+        idx = np.clip(np.searchsorted(knots, x, side='right') - 1, 0, m - 2)
+        t = (x - knots[idx]) / (knots[idx + 1] - knots[idx])
+        rows = np.repeat(np.arange(n), 2)
+        cols = np.stack([idx, idx + 1], axis=1).ravel()
+        data = np.stack([1.0 - t, t], axis=1).ravel()
+        return sp.csr_matrix((data, (rows, cols)), shape=(n, m))
+
+    def _build_derivative_basis(self, x: np.ndarray, derivative: int) -> Union[np.ndarray, sp.csr_matrix]:
+        """
+        Builds the derivative of the basis, piecewise constant in `x`.
+
+        The first derivative of a hinge `max(0, x - k)` is the step `x > k`, and the one of a hat
+        function is `+-1 / (k_{i+1} - k_i)` on its two segments. Higher derivatives vanish between knots.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Input dataset array points.
+        derivative : int
+            The derivative order, at least 1.
+
+        Returns
+        -------
+        Union[np.ndarray, sp.csr_matrix]
+            Matrix of shape `(n_samples, n_basis)`, sparse for the hat basis.
+        """
+        x = np.asarray(x, dtype=float).ravel()
+        n = len(x)
+        if self.basis == "hat":
+            knots = np.asarray(self.basis_knots, dtype=float)
+            m = len(knots)
+            if derivative > 1 or m == 1:
+                return sp.csr_matrix((n, m))
+            idx = np.clip(np.searchsorted(knots, x, side='right') - 1, 0, m - 2)
+            slope = 1.0 / (knots[idx + 1] - knots[idx])
+            rows = np.repeat(np.arange(n), 2)
+            cols = np.stack([idx, idx + 1], axis=1).ravel()
+            data = np.stack([-slope, slope], axis=1).ravel()
+            return sp.csr_matrix((data, (rows, cols)), shape=(n, m))
+
+        if derivative > 1:
+            return np.zeros((n, self.n_basis))
+        knots = np.asarray(self.knots, dtype=float)
+        return np.column_stack([np.zeros(n), np.ones(n), (x[:, None] > knots[None, :]).astype(float)])
+
+    def truncated_coefficients(self) -> np.ndarray:
+        """
+        Returns the fitted coefficients in the `truncated` parameterization over the same knots.
+
+        For the hat basis the values at the knots are converted into intercept, slope and one slope
+        change per knot, so that `[1, x, max(0, x - k_1), ...] @ coefs` reproduces the fitted function.
+
+        Returns
+        -------
+        np.ndarray
+            Coefficients of shape `(2 + len(basis_knots),)`, or `(2 + len(basis_knots), n_by_classes)` for `by` splines.
+        """
+        coefs = np.asarray(self.coefficients, dtype=float)
+        if self.basis == "truncated":
+            return coefs
+
+        knots = np.asarray(self.basis_knots, dtype=float)
+        values = coefs.reshape(len(knots), -1)
+        out = np.zeros((2 + len(knots), values.shape[1]))
+        if len(knots) == 1:
+            out[0] = values[0]
+        else:
+            slopes = np.diff(values, axis=0) / np.diff(knots)[:, None]
+            out[0] = values[0] - slopes[0] * knots[0]
+            out[1] = slopes[0]
+            # the slope changes at the interior knots; the first and last hinges stay zero
+            out[3:len(knots) + 1] = np.diff(slopes, axis=0)
+        return out if coefs.ndim > 1 else out[:, 0]
+
     def _build_variables(self) -> cp.Variable:
         """
         Creates optimized CVXPY configurations sequentially describing parameter weights.
@@ -107,7 +285,7 @@ class PiecewiseLinear(Spline):
             Structured matrix matching length required for evaluating full sequence.
         """
         if isinstance(self._variables, list) and not self._variables:
-            dim_base = 2 + len(self.knots)
+            dim_base = self.n_basis
             if self._by is not None:
                 self._variables = cp.Variable(shape=(dim_base, len(self._by_classes)), name=f"{self.term}_pwl")
             else:
@@ -115,4 +293,6 @@ class PiecewiseLinear(Spline):
         return self._variables
 
     def __repr__(self):
+        if self.basis != "truncated":
+            return f"PiecewiseLinear(term='{self.term}', knots={self.knots}, by={self._by}, basis='{self.basis}')"
         return f"PiecewiseLinear(term='{self.term}', knots={self.knots}, by={self._by})"
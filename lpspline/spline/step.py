@@ -0,0 +1,221 @@
+import numpy as np
+import cvxpy as cp
+import scipy.sparse as sp
+from typing import Optional, Union
+from .base import Spline
+from .. import instrument
+
+BINNINGS = ("quantile", "uniform")
+
+
+class StepSpline(Spline):
+    """
+    Piecewise constant (histogram-like) spline holding one value per bin.
+
+    Every row is encoded by the index of its bin, found with a binary search over the edges, so the
+    design is a sparse indicator matrix with a single non-zero per row and evaluation is a gather of
+    the bin values. Values below the first or above the last edge fall in the outer bins.
+    """
+    def __init__(self, term: str, bins: Union[int, np.ndarray] = 10, binning: str = "quantile", tag: Optional[str] = 'step',
+                 by: Optional[str] = None):
+        """
+        Initialize the Step Spline.
+
+        Parameters
+        ----------
+        term : str
+            The column name representing the continuous covariate.
+        bins : Union[int, np.ndarray], default=10
+            An explicit array of sorted bin edges, or the number of bins to place on the training data.
+        binning : str, default="quantile"
+            How an integer number of bins is placed: `quantile` (equally populated bins, duplicated edges
+            of tied values are dropped) or `uniform` (equally wide bins).
+        tag : Optional[str], default='step'
+            The descriptive tag denoting spline implementation type.
+        by : Optional[str], default=None
+            The column representing interaction categorical groupings.
+
+        Raises
+        ------
+        ValueError
+            If the binning is unknown.
+        """
+        if binning not in BINNINGS:
+            raise ValueError(f"Unknown binning '{binning}'. Available binnings: {BINNINGS}")
+        super().__init__(term=term, tag=tag)
+        self._bins = bins
+        self._binning = binning
+        self._by = by
+        self._variables = []
+
+    @property
+    def edges(self) -> Union[int, np.ndarray]:
+        """
+        Returns the bin edges.
+
+        Returns
+        -------
+        Union[int, np.ndarray]
+            The sorted array of `n_basis + 1` edges, or the number of bins before initialization.
+        """
+        return self._bins
+
+    @property
+    def binning(self) -> str:
+        """
+        Returns how the bins are placed.
+
+        Returns
+        -------
+        str
+            `quantile` or `uniform`.
+        """
+        return self._binning
+
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions, one per bin.
+
+        Returns
+        -------
+        int
+            The number of bins.
+        """
+        return self._bins if isinstance(self._bins, int) else len(self._bins) - 1
+
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of non-zero basis entries per row, a single bin indicator.
+
+        Returns
+        -------
+        int
+            Always 1.
+        """
+        return 1
+
+    def init_spline(self, x: np.ndarray, by: np.ndarray = None):
+        """
+        Places the bin edges on the training data if a number of bins was given.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input array of training features.
+        by : np.ndarray, default=None
+            The array of grouping values.
+        """
+        super().init_spline(x, by)
+        if isinstance(self._bins, int):
+            if self._binning == "quantile":
+                self._bins = np.unique(np.quantile(x, np.linspace(0, 1, self._bins + 1)))
+            else:
+                self._bins = np.linspace(np.min(x), np.max(x), self._bins + 1)
+        else:
+            self._bins = np.sort(np.asarray(self._bins, dtype=float))
+
+    def bin_index(self, x: np.ndarray) -> np.ndarray:
+        """
+        Returns the bin of every value, by binary search over the inner edges.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input feature array.
+
+        Returns
+        -------
+        np.ndarray
+            Integer bin indices in `[0, n_basis)`.
+        """
+        return np.searchsorted(self._bins[1:-1], np.asarray(x).ravel(), side='right')
+
+    def _build_basis(self, x: np.ndarray, **kwargs) -> sp.csr_matrix:
+        """
+        Builds the sparse bin indicator matrix.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input feature array.
+
+        Returns
+        -------
+        sp.csr_matrix
+            A sparse matrix of shape `(n_samples, n_basis)` with a single one per row.
+        """
+        idx = self.bin_index(x)
+        n = len(idx)
+        return sp.csr_matrix((np.ones(n), idx, np.arange(n + 1)), shape=(n, self.n_basis))
+
+    def _build_derivative_basis(self, x: np.ndarray, derivative: int) -> sp.csr_matrix:
+        """
+        Builds the derivative of the bin indicators, zero away from the edges.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input feature array.
+        derivative : int
+            The derivative order, at least 1.
+
+        Returns
+        -------
+        sp.csr_matrix
+            An empty sparse matrix of shape `(n_samples, n_basis)`.
+        """
+        return sp.csr_matrix((len(np.asarray(x).ravel()), self.n_basis))
+
+    def eval(self, x: np.ndarray, return_basis: bool = False, by: np.ndarray = None, derivative: int = 0) -> np.ndarray:
+        """
+        Evaluates the fitted spline by gathering the value of the bin of every row.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 1D input feature array to evaluate the spline on.
+        return_basis : bool, default=False
+            Whether to return the raw basis matrix instead of the evaluated spline.
+        by : np.ndarray, default=None
+            The 1D grouping array, if the `by` argument is specified.
+        derivative : int, default=0
+            The derivative order; the derivatives of a step function are zero.
+
+        Returns
+        -------
+        np.ndarray
+            A 1D numpy array of shape `(n_samples,)`; rows of unseen `by` classes are zero.
+        """
+        if return_basis:
+            return self._evaluate_basis(x, derivative)
+        assert self.coefficients is not None, "Spline has not been fitted."
+        if derivative:
+            return super().eval(x, by=by, derivative=derivative)
+        with instrument.span("eval", spline=self.tag, rows=len(x)):
+            idx = self.bin_index(x)
+            coefficients = np.asarray(self.coefficients)
+            if by is None:
+                return coefficients[idx]
+            codes = self._by_codes(by)
+            return np.where(codes >= 0, coefficients[idx, np.maximum(codes, 0)], 0.0)
+
+    def _build_variables(self) -> cp.Variable:
+        """
+        Create CVXPY variables representing the bin values.
+
+        Returns
+        -------
+        cp.Variable
+            A CVXPY Variable of shape `(n_bins, len(by_classes) if by else 1)`.
+        """
+        if not self._variables:
+            if self.by is None:
+                self._variables = cp.Variable(shape=(self.n_basis,), name=f"{self.term}_step")
+            else:
+                self._variables = cp.Variable(shape=(self.n_basis, len(self._by_classes)), name=f"{self.term}_step")
+        return self._variables
+
+    def __repr__(self):
+        edges = self.edges.tolist() if isinstance(self.edges, np.ndarray) else self.edges
+        return f"StepSpline(term='{self.term}', edges={edges}, binning='{self.binning}', by={self._by})"
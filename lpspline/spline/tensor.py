@@ -0,0 +1,269 @@
+import numpy as np
+import cvxpy as cp
+import scipy.sparse as sp
+from typing import Optional, Tuple, Union
+from .base import Spline
+
+# Rows evaluated at once by `TensorSpline.eval`, bounding the memory of the sparse basis.
+EVAL_CHUNK = 1_000_000
+
+
+def row_kronecker(A: sp.spmatrix, B: sp.spmatrix) -> sp.csr_matrix:
+    """
+    Row-wise Kronecker (face-splitting) product of two sparse matrices with the same number of rows.
+
+    Row `r` of the output is `kron(A[r], B[r])`: column `i * B.shape[1] + j` holds `A[r, i] * B[r, j]`.
+    Only the products of stored entries are formed, so a row has `nnz(A[r]) * nnz(B[r])` non-zeros.
+
+    Parameters
+    ----------
+    A : sp.spmatrix
+        Matrix of shape `(n, p1)`.
+    B : sp.spmatrix
+        Matrix of shape `(n, p2)`.
+
+    Returns
+    -------
+    sp.csr_matrix
+        Matrix of shape `(n, p1 * p2)`.
+    """
+    A = sp.csr_matrix(A)
+    B = sp.csr_matrix(B)
+    A.eliminate_zeros()
+    B.eliminate_zeros()
+    n, p2 = A.shape[0], B.shape[1]
+
+    nnz_b = np.diff(B.indptr)
+    row_a = np.repeat(np.arange(n), np.diff(A.indptr))
+    rep = nnz_b[row_a]  # every entry of A meets the entries of the same row of B
+    idx_a = np.repeat(np.arange(A.nnz), rep)
+    offset = np.arange(len(idx_a)) - np.repeat(np.cumsum(rep) - rep, rep)
+    idx_b = np.repeat(B.indptr[:-1][row_a], rep) + offset
+
+    indptr = np.concatenate([[0], np.cumsum(np.diff(A.indptr) * nnz_b)])
+    return sp.csr_matrix(
+        (A.data[idx_a] * B.data[idx_b], A.indices[idx_a] * p2 + B.indices[idx_b], indptr),
+        shape=(n, A.shape[1] * p2),
+    )
+
+
+class TensorSpline(Spline):
+    """
+    Smooth interaction of two features built as the tensor product of two marginal splines.
+
+    The basis is the row-wise Kronecker product of the marginal bases, kept sparse: with cubic B-spline
+    marginals every row has `4 * 4` non-zeros whatever the number of knots. Coefficients form a
+    `(n_basis_1, n_basis_2)` grid flattened row-major, coefficient `i * n_basis_2 + j` multiplying the
+    product of the `i`-th function of the first marginal and the `j`-th of the second.
+    """
+    def __init__(self, first: Spline, second: Spline, tag: Optional[str] = 'tensor', by: Optional[str] = None):
+        """
+        Initialize the Tensor Spline.
+
+        Parameters
+        ----------
+        first : Spline
+            The marginal spline of the first feature, a `BSpline`, `CyclicSpline` or `PiecewiseLinear`.
+        second : Spline
+            The marginal spline of the second feature, a `BSpline`, `CyclicSpline` or `PiecewiseLinear`.
+        tag : Optional[str], default='tensor'
+            A tag for identification.
+        by : Optional[str], default=None
+            The column name denoting group classes if interaction modeling is required.
+
+        Raises
+        ------
+        ValueError
+            If a marginal has an unsupported type, a `by` grouping, constraints or penalties.
+        """
+        from .bspline import BSpline
+        from .cyclic_spline import CyclicSpline
+        from .piecewise_linear import PiecewiseLinear
+
+        for m in (first, second):
+            if not isinstance(m, (BSpline, CyclicSpline, PiecewiseLinear)):
+                raise ValueError(f"TensorSpline marginals must be BSpline, CyclicSpline or PiecewiseLinear, got '{type(m).__name__}'.")
+            if m.by is not None or m.constraints or m.penalties:
+                raise ValueError("TensorSpline marginals must not have a by grouping, constraints or penalties: set them on the TensorSpline.")
+        super().__init__(term=[first.term, second.term], tag=tag)
+        self._marginals = (first, second)
+        self._by = by
+        self._by_classes = None
+        self._variables = []
+
+    @property
+    def marginals(self) -> Tuple[Spline, Spline]:
+        """
+        Returns the marginal splines.
+
+        Returns
+        -------
+        Tuple[Spline, Spline]
+            The splines of the first and second feature.
+        """
+        return self._marginals
+
+    @property
+    def n_basis(self) -> int:
+        """
+        Returns the number of basis functions.
+
+        Returns
+        -------
+        int
+            The product of the marginal basis dimensions.
+        """
+        first, second = self._marginals
+        return first.n_basis * second.n_basis
+
+    def _basis_nnz_per_row(self) -> int:
+        """
+        Returns the number of structurally non-zero basis entries in each row.
+
+        Returns
+        -------
+        int
+            The product of the marginal row non-zero counts.
+        """
+        first, second = self._marginals
+        return first._basis_nnz_per_row() * second._basis_nnz_per_row()
+
+    def init_spline(self, x: np.ndarray, by: np.ndarray = None):
+        """
+        Initializes the marginal splines on their feature.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D input array of shape `(n_samples, 2)`, one column per feature.
+        by : np.ndarray, default=None
+            The array of grouping values.
+        """
+        super().init_spline(x, by)
+        x = self._columns(x)
+        for m, column in zip(self._marginals, x.T):
+            m.init_spline(column)
+
+    def _build_basis(self, x: np.ndarray, **kwargs) -> sp.csr_matrix:
+        """
+        Builds the sparse row-wise Kronecker product of the marginal bases.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D input array of shape `(n_samples, 2)`.
+
+        Returns
+        -------
+        sp.csr_matrix
+            A sparse matrix of shape `(n_samples, n_basis)`.
+        """
+        x = self._columns(x)
+        first, second = self._marginals
+        return row_kronecker(first._build_basis(x[:, 0]), second._build_basis(x[:, 1]))
+
+    def _evaluate_basis(self, x: np.ndarray, derivative: Union[int, Tuple[int, int]] = 0) -> sp.csr_matrix:
+        """
+        Returns the basis, or its partial derivative, as the row-wise Kronecker product of the marginals.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D input array of shape `(n_samples, 2)`.
+        derivative : Union[int, Tuple[int, int]], default=0
+            The derivative order with respect to each feature, or 0 for the basis itself.
+
+        Returns
+        -------
+        sp.csr_matrix
+            A sparse matrix of shape `(n_samples, n_basis)`.
+
+        Raises
+        ------
+        ValueError
+            If a single non-zero order is given.
+        """
+        if isinstance(derivative, (int, np.integer)):
+            if derivative:
+                raise ValueError("TensorSpline derivatives take one order per feature, e.g. derivative=(1, 0).")
+            derivative = (0, 0)
+        x = self._columns(x)
+        first, second = self._marginals
+        return row_kronecker(first._evaluate_basis(x[:, 0], derivative[0]), second._evaluate_basis(x[:, 1], derivative[1]))
+
+    def eval(self, x: np.ndarray, return_basis: bool = False, by: np.ndarray = None,
+             derivative: Union[int, Tuple[int, int]] = 0) -> np.ndarray:
+        """
+        Evaluates the fitted spline, `EVAL_CHUNK` rows at a time to bound the memory of the basis.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The 2D input array of shape `(n_samples, 2)`.
+        return_basis : bool, default=False
+            Whether to return the raw basis matrix instead of the evaluated spline.
+        by : np.ndarray, default=None
+            The 1D grouping array, if the `by` argument is specified.
+        derivative : Union[int, Tuple[int, int]], default=0
+            The partial derivative orders with respect to the first and second feature, e.g. `(1, 0)`.
+
+        Returns
+        -------
+        np.ndarray
+            A 1D numpy array of shape `(n_samples,)` representing the predicted values.
+        """
+        x = self._columns(x)
+        if return_basis:
+            return self._evaluate_basis(x, derivative)
+        if len(x) <= EVAL_CHUNK:
+            return super().eval(x, by=by, derivative=derivative)
+        return np.concatenate([
+            super(TensorSpline, self).eval(x[i:i + EVAL_CHUNK], by=None if by is None else by[i:i + EVAL_CHUNK],
+                                           derivative=derivative)
+            for i in range(0, len(x), EVAL_CHUNK)
+        ])
+
+    def _columns(self, x: np.ndarray) -> np.ndarray:
+        """
+        Checks the input holds one column per marginal.
+
+        Parameters
+        ----------
+        x : np.ndarray
+            The input array.
+
+        Returns
+        -------
+        np.ndarray
+            The input as a 2D array of shape `(n_samples, 2)`.
+
+        Raises
+        ------
+        ValueError
+            If the input does not have two columns.
+        """
+        x = np.asarray(x)
+        if x.ndim != 2 or x.shape[1] != 2:
+            raise ValueError(f"TensorSpline expects an array of shape (n_samples, 2), got {x.shape}.")
+        return x
+
+    def _build_variables(self) -> cp.Variable:
+        """
+        Create CVXPY variables representing the spline coefficients.
+
+        Returns
+        -------
+        cp.Variable
+            A CVXPY Variable of shape `(n_basis, len(by_classes) if by else 1)`.
+        """
+        if not self._variables:
+            name = f"{self.term[0]}_{self.term[1]}_tensor"
+            if self.by is None:
+                self._variables = cp.Variable(shape=(self.n_basis,), name=name)
+            else:
+                self._variables = cp.Variable(shape=(self.n_basis, len(self._by_classes)), name=name)
+        return self._variables
+
+    def __repr__(self):
+        first, second = self._marginals
+        return f"TensorSpline(first={first!r}, second={second!r}, by={self._by})"
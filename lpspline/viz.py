@@ -129,7 +129,7 @@ def plot_diagnostic(model: LpRegressor, X: pl.DataFrame, ncols: int = 4, y: pl.S
         color = f'C{i % 10}'
         
         if isinstance(spline, Factor):
-            x_vals = np.array([spline._int_map.get(v, -1) for v in x_vals_raw])
+            x_vals = spline.encode(x_vals_raw)
         else:
             x_vals = x_vals_raw
         
@@ -157,8 +157,8 @@ def plot_diagnostic(model: LpRegressor, X: pl.DataFrame, ncols: int = 4, y: pl.S
         axes[i].set_xlabel(feature)
         pmp.remove_axis('top', 'right', ax=axes[i])
         if isinstance(spline, Factor):
-            axes[i].set_xticks(range(len(spline._classes)))
-            axes[i].set_xticklabels(spline._classes)
+            axes[i].set_xticks(range(spline.n_basis))
+            axes[i].set_xticklabels(spline.levels)
         pmp.bullet_grid(stepinch=.3, ax=axes[i], alpha=0.4)
         pmp.legend(ax=axes[i], loc='upper left', ncol=1)
 
@@ -0,0 +1,115 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, Factor
+from lpspline.constraints import Anchor, Bound, Concave, Monotonic
+from lpspline.penalties import Lasso, Ridge, Smooth
+from lpspline.optimizer.backfit import BlockSolver, backfit
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(8)
+    n = 2000
+    x = rng.uniform(0, 10, n)
+    h = rng.uniform(0, 24, n)
+    g = rng.integers(0, 4, n)
+    y = np.log1p(x) + np.sin(2 * np.pi * h / 24) + 0.5 * g + rng.normal(0, 0.1, n)
+    return pl.DataFrame({"x": x, "h": h, "g": g}), pl.Series("y", y)
+
+
+MODELS = [
+    lambda: [BSpline("x", knots=8).add_penalty(Smooth(0.5)), CyclicSpline("h", order=3, period=24), Factor("g")],
+    lambda: [BSpline("x", knots=8).add_constraint(Monotonic(), Concave()), BSpline("h", knots=6, tag="h").add_penalty(Lasso(0.2)),
+             Factor("g").add_penalty(Ridge(0.1))],
+    lambda: [PiecewiseLinear("x", knots=5, by="g").add_constraint(Monotonic(), Bound(upper=4.0, lazy=True)),
+             Linear("h").add_constraint(Anchor((12.0, 0.0)))],
+]
+
+
+class TestBackfitEngine:
+    @pytest.mark.parametrize("make_splines", MODELS)
+    def test_matches_qp(self, data, make_splines):
+        X, y = data
+        ref = LpRegressor(make_splines())
+        ref.fit(X, y, summary=False, engine="qp")
+        model = LpRegressor(make_splines())
+        model.fit(X, y, summary=False, engine="backfit")
+
+        assert model.status["status"] == "optimal"
+        assert model.problem is None
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-2)
+        convergence = model.fit_report.convergence
+        assert convergence["method"] == "backfit" and convergence["converged"]
+        assert np.all(np.diff(convergence["history"]) <= 1e-6 * convergence["history"][0])
+
+    def test_shared_levels_converge(self, data):
+        X, y = data
+        make_splines = lambda: [BSpline("x", knots=8, by="g").add_constraint(Monotonic()).add_penalty(Ridge(0.1)),
+                                CyclicSpline("h", order=3, period=24), Factor("g")]
+        ref = LpRegressor(make_splines())
+        ref.fit(X, y, summary=False, engine="qp", solver="CLARABEL")
+        model = LpRegressor(make_splines())
+        model.fit(X, y, summary=False, engine="backfit")
+
+        assert model.status == {"status": "optimal", "fallback": None}
+        assert model.fit_report.convergence["iterations"] < 20
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-4)
+
+    def test_high_cardinality_factor(self, monkeypatch):
+        rng = np.random.default_rng(9)
+        n, levels = 60000, 10000
+        x = rng.uniform(0, 10, n)
+        h = rng.uniform(0, 24, n)
+        g = rng.integers(0, levels, n)
+        X = pl.DataFrame({"x": x, "h": h, "g": g})
+        y = pl.Series("y", np.log1p(x) + np.sin(2 * np.pi * h / 24) + rng.normal(0, 0.5, levels)[g] + rng.normal(0, 0.1, n))
+        make_splines = lambda: [BSpline("x", knots=8), CyclicSpline("h", order=3, period=24), Factor("g")]
+        ref = LpRegressor(make_splines())
+        ref.fit(X, y, summary=False, engine="qp", solver="CLARABEL")
+
+        def dense(*args, **kwargs):
+            raise AssertionError("dense level system")
+        # one level move per factor level: the level system must stay sparse
+        monkeypatch.setattr(np.linalg, "pinv", dense)
+        model = LpRegressor(make_splines())
+        model.fit(X, y, summary=False, engine="backfit")
+
+        assert model.status == {"status": "optimal", "fallback": None}
+        assert model.fit_report.convergence["blocks"] == {"diagonal": 1, "banded": 1, "dense": 1}
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-4)
+
+    def test_unconverged_status(self, data):
+        X, y = data
+        x = X["x"].to_numpy()
+        blocks = []
+        for tag in ("a", "b"):
+            s = BSpline("x", knots=8, tag=tag)
+            s.init_spline(x)
+            blocks.append(BlockSolver(s, s._build_design(x)))
+        with pytest.warns(RuntimeWarning):
+            result = backfit(blocks, y.to_numpy(), max_iter=1)
+        assert result.status == "optimal_inaccurate"
+        assert not result.convergence["converged"] and result.coefs is not None
+
+    def test_block_factorizations(self, data):
+        X, y = data
+        model = LpRegressor([BSpline("x", knots=8), Factor("g"), BSpline("h", knots=6, tag="h").add_constraint(Monotonic())])
+        model.fit(X, y, summary=False, engine="backfit")
+        assert model.fit_report.convergence["blocks"] == {"diagonal": 1, "banded": 1, "qp": 1}
+        assert len(model.fit_report.to_frame().filter(pl.col("stage") == "factorize")) == 3
+        assert model.fit_report.solver["num_solves"] >= model.fit_report.convergence["iterations"]
+
+    def test_refit_starts_from_previous(self, data):
+        X, y = data
+        model = LpRegressor([BSpline("x", knots=8), CyclicSpline("h", order=3, period=24), Factor("g")])
+        model.fit(X, y, summary=False, engine="backfit")
+        cold = model.fit_report.convergence["iterations"]
+        model.fit(X, y, summary=False, engine="backfit")
+        assert model.fit_report.convergence["iterations"] < cold
+
+    def test_plan_memory(self, data):
+        X, _ = data
+        plan = LpRegressor(MODELS[0]()).plan(X)
+        assert (plan["memory_backfit"] <= plan["memory_qp"]).all()
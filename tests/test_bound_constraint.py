@@ -69,3 +69,105 @@ class TestBoundConstraint:
         # Check x > 0.7 - it should be able to follow y=0.2 and be less than 0.6
         mask_out = x > 0.7
         assert np.any(preds[mask_out] < 0.4)
+
+    def test_periodic_bspline_coefficient_bound(self):
+        x = np.linspace(0, 24, 200, endpoint=False)
+        y = np.sin(2 * np.pi * x / 24)
+        df = pl.DataFrame({"x": x})
+
+        s = CyclicSpline("x", period=24, basis="bspline", knots=24).add_constraint(Bound(upper=0.5, start=3, end=9, mode="sufficient"))
+        A, lower, upper = s.constraints[0].build_matrix(s)
+        assert A.shape[0] == 10 and A.nnz == 10
+
+        model = LpRegressor(s)
+        model.fit(df, pl.Series("y", y), summary=False)
+        grid = np.linspace(3, 9, 100)
+        assert np.all(s.eval(grid) <= 0.5 + 1e-5)
+        assert np.isclose(s.eval(np.array([18.0]))[0], -1.0, atol=0.05)
+
+    @pytest.mark.parametrize("basis", ["truncated", "hat"])
+    def test_pwl_exact_mode(self, basis):
+        x = np.linspace(0, 1, 200)
+        df = pl.DataFrame({"x": x})
+        s = PiecewiseLinear("x", knots=8, basis=basis).add_constraint(Bound(upper=0.3, start=0.1, end=0.7, mode="exact"))
+        s.init_spline(x)
+        A, lower, upper = s.constraints[0].build_matrix(s)
+        inner = np.sum((np.asarray(s.knots) > 0.1) & (np.asarray(s.knots) < 0.7))
+        assert A.shape[0] == inner + 2
+
+        model = LpRegressor(s)
+        model.fit(df, pl.Series("y", x), summary=False)
+        grid = np.linspace(0.1, 0.7, 1000)
+        assert np.all(s.eval(grid) <= 0.3 + 1e-5)
+        assert s.eval(np.array([1.0]))[0] > 0.8
+
+    def test_bspline_sufficient_mode(self):
+        x = np.linspace(-1, 1, 200)
+        df = pl.DataFrame({"x": x})
+        s = BSpline("x", knots=10, degree=3).add_constraint(Bound(lower=0.2, mode="sufficient"))
+        s.init_spline(x)
+        A, lower, upper = s.constraints[0].build_matrix(s)
+        assert A.shape[0] == s.n_basis and A.nnz == s.n_basis
+
+        model = LpRegressor(s)
+        model.fit(df, pl.Series("y", x ** 2), summary=False)
+        assert np.all(s.eval(np.linspace(-1, 1, 1000)) >= 0.2 - 1e-5)
+
+    def test_default_grid_mode(self):
+        x = np.linspace(0, 1, 50)
+        for s in (PiecewiseLinear("x", knots=8), BSpline("x", knots=6, degree=1), CyclicSpline("x", order=2, period=1.0)):
+            s.add_constraint(Bound(lower=0.0, n=40))
+            s.init_spline(x)
+            assert s.constraints[0].mode == "grid"
+            assert s.constraints[0].build_matrix(s)[0].shape[0] == 40
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            Bound(lower=0.0, mode="dense")
+        s = BSpline("x", knots=5, degree=3).add_constraint(Bound(lower=0.0, mode="exact"))
+        s.init_spline(np.linspace(0, 1, 20))
+        with pytest.raises(ValueError):
+            s.constraints[0].build_matrix(s)
+        s = CyclicSpline("x", order=2, period=1.0).add_constraint(Bound(lower=0.0, mode="sufficient"))
+        with pytest.raises(ValueError):
+            s.constraints[0].build_matrix(s)
+
+    @pytest.mark.parametrize("engine", ["cvxpy", "qp"])
+    def test_lazy_grid_bound(self, engine):
+        x = np.linspace(0, 2 * np.pi, 300)
+        df = pl.DataFrame({"x": x})
+        y = pl.Series("y", np.sin(x))
+        bound = Bound(lower=-0.5, upper=0.5, n=500, mode="grid", lazy=True)
+        s = CyclicSpline("x", order=3, period=2 * np.pi).add_constraint(bound)
+        model = LpRegressor(s)
+        model.fit(df, y, summary=False, engine=engine)
+
+        values = s.eval(np.linspace(0, 2 * np.pi, 500))
+        assert np.all(np.abs(values) <= 0.5 + 1e-3)
+        assert 0 < len(bound.active) < bound.n
+        active = model.active_constraints
+        assert active["active"].to_list() == [len(bound.active)]
+        assert active["grid"].to_list() == [500]
+        assert len([st for st in model.fit_report.stages if st["stage"] == "solve"]) > 1
+
+        # the refit starts from the remembered active set
+        model.fit(df, y, summary=False, engine=engine)
+        assert len([st for st in model.fit_report.stages if st["stage"] == "solve"]) == 1
+
+    def test_lazy_ignored_outside_grid(self):
+        s = PiecewiseLinear("x", knots=5).add_constraint(Bound(upper=0.2, mode="exact", lazy=True))
+        model = LpRegressor(s)
+        model.fit(pl.DataFrame({"x": np.linspace(0, 1, 20)}), pl.Series("y", np.linspace(0, 1, 20)), summary=False)
+        assert s.constraints[0].active is None
+        assert model.active_constraints["active"].to_list() == [0]
+
+    def test_step_bound_on_bins(self):
+        from lpspline.spline import StepSpline
+        x = np.linspace(0, 10, 200)
+        s = StepSpline("x", bins=np.arange(0, 11, 1.0)).add_constraint(Bound(upper=4.0, start=2.5, end=6.5, mode="sufficient"))
+        model = LpRegressor(s)
+        model.fit(pl.DataFrame({"x": x}), pl.Series("y", x), summary=False)
+        A, lower, upper = s.constraints[0].build_matrix(s)
+        assert A.shape[0] == 5 and A.nnz == 5
+        assert np.all(s.eval(np.linspace(2.5, 6.5, 100)) <= 4.0 + 1e-5)
+        assert s.eval(np.array([9.5]))[0] > 8.0
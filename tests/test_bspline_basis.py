@@ -11,15 +11,20 @@ def run_test():
     import types
     mock_cp = types.ModuleType("cvxpy")
     mock_cp.Variable = MockVariable
+    real_cp = sys.modules.get("cvxpy")
     sys.modules["cvxpy"] = mock_cp
     
-    x = np.linspace(0, 10, 100)
-    spline = BSpline(term='x', knots=4, degree=3)
-    spline.init_spline(x)
-    basis = spline._build_basis(x)
-    
-    var = spline._build_variables()
-    print(f"Basis shape: {basis.shape}")
-    print(f"Variables shape expected: {var.shape}")
+    try:
+        x = np.linspace(0, 10, 100)
+        spline = BSpline(term='x', knots=4, degree=3)
+        spline.init_spline(x)
+        basis = spline._build_basis(x)
+        
+        var = spline._build_variables()
+        print(f"Basis shape: {basis.shape}")
+        print(f"Variables shape expected: {var.shape}")
+    finally:
+        if real_cp is not None:
+            sys.modules["cvxpy"] = real_cp
 
 run_test()
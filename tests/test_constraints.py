@@ -1,9 +1,10 @@
 import pytest
 import numpy as np
 import polars as pl
-from lpspline.spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, Factor
+from lpspline.spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, Factor, StepSpline
 from lpspline import LpRegressor
-from lpspline.constraints import Anchor, Monotonic, Convex, Concave
+from lpspline.constraints import Anchor, Monotonic, Convex, Concave, Bound
+from lpspline.constraints.base import Constraint
 
 class TestConstraints:
     def test_anchor(self):
@@ -41,3 +42,136 @@ class TestConstraints:
         # Decreasing line fit on (0,0), (1,1), (2,0) will just be flat or similar due to sum_squares objective
         preds = opt.predict(df)
         assert preds[1] <= preds[0] + 1e-4  # Should be non-increasing
+
+    def test_build_constraint_only_subclass(self):
+        class NonNegative(Constraint):
+            def build_constraint(self, s):
+                return [s._coef_vector() >= 0]
+
+        df = pl.DataFrame({"x": np.linspace(0, 1, 50), "y": np.linspace(1, -1, 50)})
+        model = LpRegressor(Linear("x", bias=True).add_constraint(NonNegative()))
+        model.fit(df, df["y"], summary=False, engine="cvxpy")
+        assert np.all(model.splines[0].coefficients >= -1e-6)
+        assert NonNegative().size(model.splines[0]) == 2
+        with pytest.raises(NotImplementedError):
+            model.fit(df, df["y"], summary=False, engine="qp")
+
+    @pytest.mark.parametrize("spline", [
+        PiecewiseLinear("x", knots=6), PiecewiseLinear("x", knots=6, basis="hat"), BSpline("x", knots=7),
+        BSpline("x", knots=7, degree=1), CyclicSpline("x", period=10, basis="bspline", knots=8), StepSpline("x", bins=6),
+    ])
+    def test_size_without_building(self, spline, monkeypatch):
+        x = np.linspace(0, 10, 60)
+        spline.init_spline(x, by=np.arange(60) % 3)
+        constraints = [Monotonic(), Monotonic(start=2.0, end=6.0, decreasing=True), Convex(start=2.0, end=6.0),
+                       Concave(), Bound(lower=-1, upper=1, n=30, mode="auto"), Bound(lower=0, lazy=True),
+                       Anchor((1.0, 0.0), (2.0, 1.0))]
+        expected = []
+        for c in constraints:
+            try:
+                expected.append(Constraint.size(c, spline))
+            except (ValueError, NotImplementedError) as e:
+                expected.append(type(e))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("size built the constraint system")
+        monkeypatch.setattr(type(spline), "_build_basis", fail)
+        for c, n in zip(constraints, expected):
+            monkeypatch.setattr(type(c), "build_matrix", fail)
+            if isinstance(n, type):
+                with pytest.raises(n):
+                    c.size(spline)
+            else:
+                assert c.size(spline) == n
+
+    def test_stacked_constraint_matrix(self):
+        x = np.linspace(0, 10, 60)
+        df = pl.DataFrame({"x": x, "g": np.arange(60) % 4})
+        s = BSpline("x", knots=6, by="g")
+        s.init_spline(x, by=df["g"].to_numpy())
+
+        A, lower, upper = Monotonic().build_matrix(s)
+        assert A.shape == (7 * 4, 8 * 4)
+        assert np.all(lower == 0) and np.all(np.isinf(upper))
+
+        from lpspline.constraints import Bound
+        bound = Bound(lower=-1, upper=1, n=30)
+        assert len(bound.build_constraint(s)) == 1
+        assert bound.size(s) == 30 * 2 * 4
+        assert len(Anchor((1.0, 0.0), (2.0, 1.0)).build_constraint(s)) == 1
+
+
+    @pytest.mark.parametrize("constraint", [Monotonic(), Convex(), Concave(), Monotonic(start=2.0, end=6.0, decreasing=True)])
+    def test_hat_basis_matches_truncated(self, constraint):
+        rng = np.random.default_rng(4)
+        x = rng.uniform(0, 10, 400)
+        df = pl.DataFrame({"x": x, "g": rng.integers(0, 2, 400)})
+        y = pl.Series("y", np.sqrt(x) + 0.2 * np.sin(x) + rng.normal(0, 0.1, 400))
+
+        fits = {}
+        for basis in ("truncated", "hat"):
+            model = LpRegressor([PiecewiseLinear("x", knots=8, by="g", basis=basis).add_constraint(constraint)])
+            model.fit(df, y, summary=False, engine="qp")
+            assert model._status == "optimal"
+            fits[basis] = model
+        assert np.allclose(fits["hat"].predict(df), fits["truncated"].predict(df), atol=1e-3)
+
+
+class TestPenalties:
+    def test_single_atom_per_spline(self):
+        from lpspline.penalties import Ridge, Lasso
+        x = np.linspace(0, 1, 30)
+        s = BSpline("x", knots=5, by="g")
+        s.init_spline(x, by=np.arange(30) % 3)
+        assert len(Ridge(1.0).build_penalty(s)) == 1
+        assert len(Lasso(1.0, weights=np.arange(7)).build_penalty(s)) == 1
+        with pytest.raises(ValueError, match="weights must have length"):
+            Ridge(1.0, weights=[1.0, 2.0]).build_penalty(s)
+
+    def test_weights_zero_leave_coefficient_free(self):
+        from lpspline.penalties import Ridge
+        x = np.linspace(0, 1, 30)
+        df = pl.DataFrame({"x": x})
+        free = Linear("x").add_penalty(Ridge(100.0, weights=[0.0, 1.0]))
+        LpRegressor(free).fit(df, pl.Series("y", np.full(30, 5.0)), summary=False)
+        assert np.isclose(free.coefficients[0], 5.0, atol=1e-3)
+
+    def test_smooth_difference_operator(self):
+        from lpspline.penalties import Smooth
+        s = BSpline("x", knots=5, by="g")
+        s.init_spline(np.linspace(0, 1, 30), by=np.arange(30) % 3)
+        D = Smooth(1.0, order=2).build_matrix(s)
+        assert D.shape == (3 * (s.n_basis - 2), 3 * s.n_basis)
+        assert np.allclose(D @ np.ones(3 * s.n_basis), 0.0)
+
+        c = CyclicSpline("h", period=24, basis="bspline", knots=8)
+        D = Smooth(1.0, order=1).build_matrix(c)
+        assert D.shape == (8, 8)
+        assert np.allclose(D @ np.ones(8), 0.0)
+        with pytest.raises(ValueError):
+            Smooth(1.0, axis=0).build_matrix(c)
+
+
+class TestPeriodicBSpline:
+    def test_monotonic_interval(self):
+        rng = np.random.default_rng(8)
+        h = rng.uniform(0, 24, 600)
+        y = np.sin(2 * np.pi * h / 24) + rng.normal(0, 0.1, 600)
+        df = pl.DataFrame({"h": h, "g": rng.integers(0, 2, 600)})
+
+        spline = CyclicSpline("h", period=24, basis="bspline", knots=48, by="g").add_constraint(Monotonic(start=0, end=5))
+        model = LpRegressor(spline)
+        model.fit(df, pl.Series("y", y), summary=False, engine="qp")
+        assert model._status == "optimal"
+
+        grid = np.linspace(0, 5, 200)
+        for g in (0, 1):
+            values = spline.eval(grid, by=np.full(200, g))
+            assert np.all(np.diff(values) >= -1e-4)
+        assert np.sqrt(np.mean((model.predict(df) - y) ** 2)) < 0.3
+
+        # wrapping interval across the period boundary
+        wrapped = CyclicSpline("h", period=24, basis="bspline", knots=24).add_constraint(Monotonic(start=22, end=2))
+        wrapped.init_spline(h)
+        A, _, _ = wrapped.constraints[0].build_matrix(wrapped)
+        assert A.shape[0] == 7
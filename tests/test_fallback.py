@@ -0,0 +1,137 @@
+import numpy as np
+import polars as pl
+import pytest
+import scipy.sparse as sp
+import cvxpy as cp
+import osqp
+from lpspline import LpRegressor
+from lpspline.spline import BSpline, Linear
+from lpspline.constraints import Monotonic
+from lpspline.constraints.base import _difference_matrix, _inequality
+from lpspline.optimizer.fallback import is_feasible, projected_least_squares, resolve_fallback
+from lpspline.optimizer.solver import solver_options
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(11)
+    n = 2000
+    x = rng.uniform(0, 10, n)
+    y = np.log1p(x) + 0.3 * np.sin(3 * x) + rng.normal(0, 0.2, n)
+    return pl.DataFrame({"x": x}), pl.Series("y", y)
+
+
+class TestFallback:
+    def test_time_limit_options(self):
+        assert solver_options("OSQP", time_limit=2)["time_limit"] == 2.0
+        assert solver_options("SCS", time_limit=2)["time_limit_secs"] == 2.0
+        with pytest.raises(ValueError):
+            solver_options("SCIPY", time_limit=2)
+
+    def test_resolve_order(self):
+        rng = np.random.default_rng(0)
+        D = sp.csr_matrix(rng.normal(size=(50, 4)))
+        y = D @ np.array([3.0, 2.0, 1.0, 0.0])
+        A, lower, upper = _inequality(_difference_matrix(4, 1), lower=0)
+
+        feasible = np.array([0.0, 1.0, 2.0, 3.0])
+        assert resolve_fallback(feasible, A, lower, upper, D, y) == (feasible, "best_iterate")
+
+        coefs, fallback = resolve_fallback(feasible[::-1].copy(), A, lower, upper, D, y)
+        assert fallback == "projected_least_squares"
+        assert is_feasible(A, lower, upper, coefs)
+
+        A_bad = sp.vstack([A, -A], format='csr')
+        l_bad = np.concatenate([np.ones(3), np.ones(3)])
+        u_bad = np.full(6, np.inf)
+        assert projected_least_squares(D, y, A_bad, l_bad, u_bad) is None
+        assert resolve_fallback(None, A_bad, l_bad, u_bad, D, y, previous=feasible) == (feasible, "previous")
+        assert resolve_fallback(None, A_bad, l_bad, u_bad, D, y) == (None, "none")
+
+    @pytest.mark.parametrize("engine", ["cvxpy", "qp"])
+    def test_budget_exhausted(self, data, engine):
+        X, y = data
+        model = LpRegressor([BSpline("x", knots=12).add_constraint(Monotonic())])
+        opts = {"max_iter": 1, "polishing": False}
+        with pytest.warns(RuntimeWarning, match="fallback"):
+            model.fit(X, y, summary=False, engine=engine, solver="OSQP", solver_opts=opts, time_limit=60)
+
+        assert model.status["status"] == "user_limit"
+        assert model.status["fallback"] in ("best_iterate", "projected_least_squares")
+        assert np.all(np.diff(model.splines[0].coefficients) >= -1e-4)
+        assert "fallback" in [s["stage"] for s in model.fit_report.stages]
+
+        # without a time limit the iterate is kept as is
+        model.fit(X, y, summary=False, engine=engine, solver="OSQP", solver_opts=opts)
+        assert model.status == {"status": "user_limit", "fallback": None}
+        assert "fallback" not in [s["stage"] for s in model.fit_report.stages]
+
+    def test_time_limit(self, data):
+        X, y = data
+        model = LpRegressor([BSpline("x", knots=12).add_constraint(Monotonic())])
+        model.fit(X, y, summary=False, engine="qp", time_limit=60)
+        assert model.status == {"status": "optimal", "fallback": None}
+
+        model = LpRegressor([BSpline("x", knots=12).add_constraint(Monotonic())])
+        with pytest.warns(RuntimeWarning):
+            model.fit(X, y, summary=False, engine="qp", time_limit=1e-9, solver_opts={"polishing": False})
+        assert model.status["status"] == "user_limit"
+        assert model.status["fallback"] is not None
+        assert model.splines[0].coefficients is not None
+
+    def test_solver_error(self, data, monkeypatch):
+        X, y = data
+        model = LpRegressor([BSpline("x", knots=12).add_constraint(Monotonic())])
+
+        def fail(*args, **kwargs):
+            raise cp.error.SolverError("Solver 'OSQP' failed.")
+
+        def osqp_fail(*args, **kwargs):
+            raise osqp.OSQPException("failed")
+
+        with monkeypatch.context() as m:
+            m.setattr(cp.Problem, "solve", fail)
+            with pytest.raises(cp.error.SolverError):
+                model.fit(X, y, summary=False, engine="cvxpy")
+            with pytest.warns(RuntimeWarning):
+                model.fit(X, y, summary=False, engine="cvxpy", time_limit=1)
+        assert model.status == {"status": "solver_error", "fallback": "projected_least_squares"}
+        assert np.all(np.diff(model.splines[0].coefficients) >= -1e-4)
+
+        previous = model.splines[0].coefficients.copy()
+        with monkeypatch.context() as m:
+            m.setattr(osqp.OSQP, "solve", osqp_fail)
+            with pytest.raises(cp.error.SolverError):
+                model.fit(X, y, summary=False, engine="qp")
+            # the projection of the fallback is solved by OSQP too, leaving the previous fit
+            with pytest.warns(RuntimeWarning):
+                model.fit(X, y, summary=False, engine="qp", time_limit=1)
+        assert model.status == {"status": "solver_error", "fallback": "previous"}
+        assert np.allclose(model.splines[0].coefficients, previous)
+
+    @pytest.mark.parametrize("loss", ["huber", "quantile"])
+    def test_solver_error_other_losses(self, data, monkeypatch, loss):
+        X, y = data
+        model = LpRegressor([BSpline("x", knots=12).add_constraint(Monotonic())])
+        kwargs = {"loss": loss, "quantiles": (0.5,) if loss == "quantile" else None}
+        model.fit(X, y, summary=False, **kwargs)
+        previous = model.splines[0].coefficients.copy()
+
+        def fail(*args, **kwargs):
+            raise cp.error.SolverError("Solver 'CLARABEL' failed.")
+
+        with monkeypatch.context() as m:
+            m.setattr(cp.Problem, "solve", fail)
+            with pytest.raises(cp.error.SolverError):
+                model.fit(X, y, summary=False, **kwargs)
+            with pytest.warns(RuntimeWarning):
+                model.fit(X, y, summary=False, time_limit=1, **kwargs)
+        # least squares is not a fallback for other losses
+        assert model.status == {"status": "solver_error", "fallback": "previous"}
+        assert np.allclose(model.splines[0].coefficients, previous)
+
+    def test_optimal_has_no_fallback(self, data):
+        X, y = data
+        model = LpRegressor([Linear("x")])
+        model.fit(X, y, summary=False)
+        assert model.status["fallback"] is None
@@ -0,0 +1,44 @@
+import numpy as np
+import polars as pl
+from lpspline import LpRegressor
+from lpspline.spline import Linear, BSpline
+from lpspline.constraints import Monotonic
+from lpspline.penalties import Ridge
+
+
+class TestFitReport:
+    def _fit(self, **kwargs):
+        x = np.linspace(0, 1, 50)
+        df = pl.DataFrame({"x": x, "z": x ** 2})
+        model = LpRegressor([
+            Linear("x"),
+            BSpline("z", knots=5, tag="bs").add_constraint(Monotonic()).add_penalty(Ridge(0.1)),
+        ])
+        model.fit(df, pl.Series("y", 2 * x + x ** 2), summary=False, **kwargs)
+        return model
+
+    def test_stages_recorded(self):
+        model = self._fit()
+        report = model.fit_report
+        stages = {(e["stage"], e["spline"]) for e in report.stages}
+        for stage in ["init_spline", "build_basis", "build_expression", "build_constraints", "build_penalties"]:
+            assert (stage, "linear") in stages
+            assert (stage, "bs") in stages
+        assert ("solve", None) in stages
+        assert report.total_time >= sum(report.stage_totals().values()) - 1e-6
+        assert report.solver["num_variables"] == 9
+
+    def test_report_frame_and_memory(self):
+        model = self._fit(trace_memory=True)
+        frame = model.fit_report.to_frame()
+        assert frame.height == len(model.fit_report.stages)
+        assert frame.filter(pl.col("stage") == "build_basis")["size"].to_list() == [800, 2800]
+        assert frame["peak_memory"].null_count() == 0
+        assert set(model.fit_report.to_dict()) == {"stages", "solver", "convergence", "total_time"}
+
+    def test_summary_prints_report(self, capsys):
+        model = self._fit()
+        model.summary()
+        out = capsys.readouterr().out
+        assert "build_basis" in out
+        assert "Solver:" in out
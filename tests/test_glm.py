@@ -0,0 +1,109 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.link import Log, Sigmoid, Exp
+from lpspline.spline import BSpline
+from lpspline.constraints import Monotonic
+from lpspline.optimizer.glm import FAMILIES, resolve_family
+
+
+@pytest.fixture
+def x():
+    rng = np.random.default_rng(3)
+    return rng.uniform(0, 10, 4000)
+
+
+class TestIRLS:
+    def test_resolve_family(self):
+        family, link = resolve_family("poisson")
+        assert (family.name, link.name) == ("poisson", "log")
+        assert resolve_family("binomial")[1].name == "logit"
+        for bad in (("cauchy", None), ("poisson", "probit")):
+            with pytest.raises(ValueError):
+                resolve_family(*bad)
+
+    def test_poisson_monotonic(self, x):
+        rng = np.random.default_rng(4)
+        eta = np.log1p(x) - 0.5
+        y = rng.poisson(np.exp(eta)).astype(float)
+        X = pl.DataFrame({"x": x})
+        model = LpRegressor(BSpline("x", knots=8).add_constraint(Monotonic()))
+        model.fit(X, pl.Series("y", y), summary=False, family="poisson")
+
+        assert model.status["status"] == "optimal"
+        assert model.family == "poisson"
+        convergence = model.fit_report.convergence
+        assert convergence["converged"] and convergence["method"] == "irls"
+        assert np.all(np.diff(convergence["history"]) <= 1e-6)
+        assert model.fit_report.to_dict()["convergence"]["iterations"] == convergence["iterations"]
+
+        pred = model.predict(X[np.argsort(x)])
+        assert np.all(np.diff(pred) >= -1e-6)
+        assert np.abs(model.predict(X) - eta).mean() < 0.05
+        # total counts are matched by the canonical link
+        assert np.isclose(np.exp(model.predict(X)).sum(), y.sum(), rtol=1e-3)
+
+    def test_gaussian_identity_matches_least_squares(self, x):
+        rng = np.random.default_rng(5)
+        X, y = pl.DataFrame({"x": x}), pl.Series("y", np.sin(x) + rng.normal(0, 0.2, len(x)))
+        glm = LpRegressor(BSpline("x", knots=8))
+        glm.fit(X, y, summary=False, family="gaussian")
+        ls = LpRegressor(BSpline("x", knots=8))
+        ls.fit(X, y, summary=False, engine="qp")
+        assert np.allclose(glm.predict(X), ls.predict(X), atol=1e-3)
+
+    def test_sigmoid_binomial(self, x):
+        rng = np.random.default_rng(6)
+        p = 1 / (1 + np.exp(-(x - 5)))
+        y = (rng.uniform(size=len(x)) < p).astype(float)
+        X = pl.DataFrame({"x": x})
+        model = Sigmoid(LpRegressor(BSpline("x", knots=8)), family="binomial")
+        model.fit(X, pl.Series("y", y), summary=False)
+        assert model.fit_report.convergence["family"] == "binomial"
+        pred = model.predict(X)
+        assert np.all((pred > 0) & (pred < 1))
+        assert np.abs(pred - p).mean() < 0.03
+
+    def test_log_and_exp_links(self, x):
+        rng = np.random.default_rng(7)
+        eta = np.log1p(x)
+        X = pl.DataFrame({"x": x})
+        gamma = Log(LpRegressor(BSpline("x", knots=8)), family="gamma")
+        gamma.fit(X, pl.Series("y", rng.gamma(5, np.exp(eta) / 5)), summary=False)
+        assert np.abs(np.log(gamma.predict(X)) - eta).mean() < 0.05
+
+        exp = Exp(LpRegressor(BSpline("x", knots=8)), family="gaussian")
+        exp.fit(X, pl.Series("y", eta + rng.normal(0, 0.05, len(x))), summary=False)
+        assert np.abs(exp.predict(X) - eta).mean() < 0.01
+
+    def test_time_limit(self, x):
+        rng = np.random.default_rng(5)
+        y = pl.Series("y", rng.poisson(np.exp(np.sin(x))).astype(float))
+        X = pl.DataFrame({"x": x})
+        model = LpRegressor(BSpline("x", knots=8))
+        model.fit(X, y, summary=False, family="poisson", time_limit=60)
+        assert model.status["status"] == "optimal"
+
+        model.fit(X, y, summary=False, family="poisson", time_limit=1e-9)
+        assert model.status == {"status": "user_limit", "fallback": None}
+        assert not model.fit_report.convergence["converged"]
+        assert np.all(np.isfinite(model.predict(X)))
+
+    def test_invalid_settings(self, x):
+        X = pl.DataFrame({"x": x})
+        model = LpRegressor(BSpline("x", knots=8))
+        with pytest.raises(ValueError):
+            model.fit(X, pl.Series("y", -np.ones(len(x))), summary=False, family="poisson")
+        with pytest.raises(ValueError, match="requires the 'irls' engine"):
+            model.fit(X, pl.Series("y", np.ones(len(x))), summary=False, family="poisson", engine="cvxpy")
+        with pytest.raises(ValueError, match="huber loss"):
+            model.fit(X, pl.Series("y", np.ones(len(x))), summary=False, family="poisson", loss="huber")
+        with pytest.raises(ValueError, match="identifiable"):
+            LpRegressor(BSpline("x", knots=8), identifiable=True).fit(X, pl.Series("y", np.ones(len(x))),
+                                                                       summary=False, family="poisson")
+        with pytest.raises(ValueError):
+            model.fit(X, pl.Series("y", np.ones(len(x))), summary=False, link="log")
+        with pytest.raises(ValueError):
+            model.fit(X, pl.Series("y", np.ones(len(x))), summary=False, family="poisson", solver="HIGHS")
+        assert set(FAMILIES) == {"gaussian", "poisson", "binomial", "gamma"}
@@ -0,0 +1,95 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.spline import Constant, CyclicSpline, Factor, Linear, PiecewiseLinear, BSpline
+from lpspline.constraints import Bound, Monotonic
+from lpspline.penalties import Ridge
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    n = 500
+    x = rng.uniform(0, 10, n)
+    h = rng.uniform(0, 24, n)
+    g = rng.integers(0, 4, n)
+    y = 2.0 + np.log1p(x) + np.sin(2 * np.pi * h / 24) + 0.5 * g + rng.normal(0, 0.1, n)
+    return pl.DataFrame({"x": x, "h": h, "g": g}), pl.Series("y", y)
+
+
+def make_splines():
+    return [
+        PiecewiseLinear("x", knots=4, tag="x").add_constraint(Monotonic()),
+        CyclicSpline("h", order=2, period=24, tag="h"),
+        Factor("g", tag="g"),
+        BSpline("x", knots=5, tag="bs"),
+    ]
+
+
+class TestIdentifiable:
+    def test_matches_full_model(self, data):
+        X, y = data
+        ref = LpRegressor(make_splines())
+        ref.fit(X, y, summary=False, engine="qp")
+        model = LpRegressor(make_splines(), identifiable=True)
+        model.fit(X, y, summary=False)
+
+        reparam = model.reparameterization
+        assert model._engine == "qp"
+        assert model._status == "optimal"
+        assert reparam.intercept == "x"
+        assert reparam.centered == ["h", "g", "bs"]
+        assert reparam.n_removed == 3
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-2)
+
+        components = model.predict(X, return_components=True)
+        assert np.allclose(components[:, 1:].mean(axis=0), 0.0, atol=1e-8)
+        params = {item["Tag"]: item["Parameters"] for item in model._summary_data}
+        assert params["g"] == model.get_spline("g").n_basis - 1
+
+    def test_constant_carries_intercept(self, data):
+        X, y = data
+        model = LpRegressor([Constant("x"), Linear("x", tag="x"), Factor("g", tag="g")], identifiable=True)
+        model.fit(X, y, summary=False)
+        assert model.reparameterization.intercept == "constant"
+        assert model.reparameterization.centered == ["x", "g"]
+        assert np.isclose(model.get_spline("constant").coefficients[0], np.mean(model.predict(X)), atol=1e-4)
+
+    def test_level_constraints_keep_full_basis(self, data):
+        X, y = data
+        splines = [
+            PiecewiseLinear("x", knots=4, tag="x").add_constraint(Bound(upper=5.0)),
+            Linear("h", tag="h").add_penalty(Ridge(1.0)),
+            Factor("g", tag="g"),
+        ]
+        model = LpRegressor(splines, identifiable=True)
+        model.fit(X, y, summary=False)
+        assert model.reparameterization.intercept == "g"
+        assert model.reparameterization.centered == []
+
+    def test_requires_qp_engine(self, data):
+        X, y = data
+        with pytest.raises(ValueError):
+            LpRegressor(make_splines(), identifiable=True).fit(X, y, summary=False, engine="cvxpy")
+
+    def test_high_cardinality_factor(self, monkeypatch):
+        rng = np.random.default_rng(8)
+        n, levels = 30000, 5000
+        x = rng.uniform(0, 10, n)
+        g = rng.integers(0, levels, n)
+        X = pl.DataFrame({"x": x, "g": g})
+        y = pl.Series("y", np.log1p(x) + rng.normal(0, 0.5, levels)[g] + rng.normal(0, 0.1, n))
+        splines = lambda: [BSpline("x", knots=5, tag="bs"), Factor("g", tag="g")]
+        ref = LpRegressor(splines())
+        ref.fit(X, y, summary=False, engine="qp")
+
+        def dense(*args, **kwargs):
+            raise AssertionError("dense eigendecomposition")
+        # the constant of the 5000 level factor is found in closed form, not from its dense Gram matrix
+        monkeypatch.setattr(np.linalg, "eigh", dense)
+        model = LpRegressor(splines(), identifiable=True)
+        model.fit(X, y, summary=False)
+        assert model.reparameterization.centered == ["g"]
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-2)
+
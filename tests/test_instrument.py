@@ -0,0 +1,60 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor, instrument
+from lpspline.spline import Linear, BSpline
+from lpspline.constraints import Monotonic
+
+
+@pytest.fixture
+def data():
+    x = np.linspace(0, 1, 40)
+    return pl.DataFrame({"x": x}), pl.Series("y", 3 * x)
+
+
+@pytest.fixture(autouse=True)
+def reset_hooks():
+    yield
+    instrument.clear_hooks()
+
+
+class TestInstrument:
+    def test_noop_without_hooks(self):
+        assert not instrument.hooks_enabled()
+        assert instrument.span("fit") is instrument.span("predict")
+
+    def test_hooks_receive_spans(self, data):
+        X, y = data
+        started, ended = [], []
+        instrument.set_hooks(on_span_start=started.append, on_span_end=ended.append)
+        model = LpRegressor([Linear("x"), BSpline("x", knots=4).add_constraint(Monotonic())])
+        model.fit(X, y, summary=False)
+        model.predict(X)
+
+        names = [s.name for s in ended]
+        assert len(started) == len(ended)
+        for name in ["fit", "predict", "init_spline", "build_basis", "eval", "build_constraints", "solve"]:
+            assert name in names
+        fit_span = next(s for s in ended if s.name == "fit")
+        assert fit_span.tags["rows"] == 40
+        assert fit_span.tags["params"] == 8
+        assert fit_span.duration > 0
+        eval_tags = {s.tags["spline"] for s in ended if s.name == "eval"}
+        assert eval_tags == {"linear", "bspline"}
+
+    def test_histogram_collector(self, data):
+        X, y = data
+        collector = instrument.HistogramCollector().install()
+        model = LpRegressor([Linear("x")])
+        model.fit(X, y, summary=False)
+        for _ in range(3):
+            model.predict(X)
+
+        summary = collector.summary()
+        predict = summary.filter(pl.col("span") == "predict")
+        assert predict["count"].item() == 3
+        assert predict["rows"].item() == 120
+        assert collector.histogram("eval", "linear").sum() == 3
+        assert collector.quantile("predict", 0.5) >= 0
+        collector.reset()
+        assert collector.summary().height == 0
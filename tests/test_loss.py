@@ -0,0 +1,119 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.link import Log
+from lpspline.spline import BSpline
+from lpspline.constraints import Monotonic
+from lpspline.optimizer.loss import check_delta, check_quantiles
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(12)
+    n = 1500
+    x = rng.uniform(0, 10, n)
+    y = np.sqrt(x) + rng.normal(0, 1, n) * (0.2 + 0.1 * x)
+    return pl.DataFrame({"x": x}), pl.Series("y", y)
+
+
+class TestQuantileLoss:
+    def test_check_quantiles(self):
+        assert np.array_equal(check_quantiles([0.9, 0.1, 0.5]), [0.1, 0.5, 0.9])
+        for bad in (None, [0.0, 0.5], [1.2]):
+            with pytest.raises(ValueError):
+                check_quantiles(bad)
+
+    @pytest.mark.parametrize("non_crossing", [False, True])
+    def test_multi_quantile_fit(self, data, non_crossing):
+        X, y = data
+        model = LpRegressor(BSpline("x", knots=8).add_constraint(Monotonic()))
+        model.fit(X, y, summary=False, loss="quantile", quantiles=(0.1, 0.5, 0.9), non_crossing=non_crossing)
+        assert model.status["status"] == "optimal"
+        assert model.solver == "CLARABEL"
+        assert np.array_equal(model.quantiles, [0.1, 0.5, 0.9])
+
+        bands = model.predict_quantiles(X)
+        assert bands.shape == (len(X), 3)
+        coverage = (y.to_numpy()[:, None] < bands).mean(axis=0)
+        assert np.allclose(coverage, [0.1, 0.5, 0.9], atol=0.03)
+        # the splines hold the median curve
+        assert np.allclose(model.predict(X), bands[:, 1])
+        if non_crossing:
+            assert np.all(np.diff(bands, axis=1) >= -1e-6)
+
+    def test_single_quantile_matches_joint(self, data):
+        X, y = data
+        joint = LpRegressor(BSpline("x", knots=8))
+        joint.fit(X, y, summary=False, loss="quantile", quantiles=(0.25, 0.75))
+        single = LpRegressor(BSpline("x", knots=8))
+        single.fit(X, y, summary=False, loss="quantile", quantiles=[0.75])
+        assert np.allclose(joint.predict_quantiles(X)[:, 1], single.predict(X), atol=1e-4)
+
+    def test_invalid_settings(self, data):
+        X, y = data
+        model = LpRegressor(BSpline("x", knots=8))
+        with pytest.raises(ValueError):
+            model.fit(X, y, summary=False, loss="cauchy")
+        with pytest.raises(ValueError):
+            model.fit(X, y, summary=False, loss="quantile", quantiles=[0.5], engine="qp")
+        model.fit(X, y, summary=False)
+        assert model.quantiles is None
+        with pytest.raises(ValueError):
+            model.predict_quantiles(X)
+
+    def test_link_quantiles(self, data):
+        X, y = data
+        model = Log(LpRegressor(BSpline("x", knots=8)))
+        model.fit(X, pl.Series("y", np.exp(y.to_numpy())), summary=False, loss="quantile", quantiles=(0.1, 0.9))
+        bands = model.predict_quantiles(X)
+        assert np.all(bands > 0)
+        assert np.allclose(np.log(bands), model.regressor.predict_quantiles(X))
+
+
+@pytest.fixture
+def spiky():
+    rng = np.random.default_rng(13)
+    n = 3000
+    x = rng.uniform(0, 10, n)
+    y = np.sqrt(x) + rng.normal(0, 0.1, n)
+    spikes = rng.choice(n, n // 50, replace=False)
+    y[spikes] += rng.uniform(5, 20, len(spikes))
+    return pl.DataFrame({"x": x}), pl.Series("y", y), np.sqrt(x)
+
+
+class TestRobustLoss:
+    def test_check_delta(self):
+        assert check_delta(2) == 2.0
+        for bad in (None, 0, -1.0):
+            with pytest.raises(ValueError):
+                check_delta(bad)
+
+    @pytest.mark.parametrize("loss", ["huber", "l1"])
+    def test_spikes_do_not_drag_fit(self, spiky, loss):
+        X, y, truth = spiky
+        squared = LpRegressor(BSpline("x", knots=8))
+        squared.fit(X, y, summary=False)
+        model = LpRegressor(BSpline("x", knots=8).add_constraint(Monotonic()))
+        model.fit(X, y, summary=False, loss=loss, delta=0.3)
+        assert model.status["status"] == "optimal"
+        assert model.solver == ("OSQP" if loss == "huber" else "CLARABEL")
+        error = np.abs(model.predict(X) - truth).mean()
+        assert error < 0.03
+        assert error < np.abs(squared.predict(X) - truth).mean() / 5
+
+    def test_huber_large_delta_is_least_squares(self, data):
+        X, y = data
+        squared = LpRegressor(BSpline("x", knots=8))
+        squared.fit(X, y, summary=False, solver="CLARABEL")
+        huber = LpRegressor(BSpline("x", knots=8))
+        huber.fit(X, y, summary=False, loss="huber", delta=1e3, solver="CLARABEL")
+        assert np.allclose(huber.predict(X), squared.predict(X), atol=1e-4)
+
+    def test_invalid_settings(self, data):
+        X, y = data
+        model = LpRegressor(BSpline("x", knots=8))
+        with pytest.raises(ValueError):
+            model.fit(X, y, summary=False, loss="huber", delta=0)
+        with pytest.raises(ValueError, match="requires the 'cvxpy' engine"):
+            model.fit(X, y, summary=False, loss="l1", engine="suffstat")
@@ -0,0 +1,80 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.spline import Linear, BSpline, Factor
+from lpspline.constraints import Bound, Monotonic
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n = 300
+    x = rng.uniform(0, 1, n)
+    g = rng.integers(0, 4, n)
+    y = np.sin(3 * x) + 0.3 * g + rng.normal(0, 0.05, n)
+    return pl.DataFrame({"x": x, "g": g}), pl.Series("y", y)
+
+
+def _model():
+    return LpRegressor([
+        BSpline("x", knots=6, by="g").add_constraint(Bound(lower=-2, upper=2, n=50)),
+        Linear("x", bias=False).add_constraint(Monotonic()),
+        Factor("g"),
+    ])
+
+
+class TestPlan:
+    def test_plan_sizes(self, data):
+        X, _ = data
+        model = _model()
+        plan = model.plan(X)
+        assert plan["tag"].to_list() == ["bspline", "linear", "factor"]
+        assert plan["variables"].to_list() == [8 * 4, 1, 4]
+        assert plan["constraints"].to_list() == [50 * 2 * 4, 1, 0]
+        assert plan["design_nnz"].to_list() == [300 * 4, 300, 300]
+        assert (plan["memory_suffstat"] < plan["memory_cvxpy"]).all()
+        # The model itself is not initialized by planning
+        assert model.splines[0].knots == 6
+
+    def test_suffstat_matches_cvxpy(self, data):
+        X, y = data
+        ref = _model()
+        ref.fit(X, y, summary=False, engine="cvxpy")
+        model = _model()
+        model.fit(X, y, summary=False, engine="suffstat")
+        assert model._engine == "suffstat"
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-3)
+
+    def test_suffstat_high_cardinality_factor(self):
+        rng = np.random.default_rng(1)
+        n, levels = 40000, 10000
+        x = rng.uniform(0, 1, n)
+        g = rng.integers(0, levels, n)
+        X = pl.DataFrame({"x": x, "g": g})
+        y = pl.Series("y", np.sin(3 * x) + rng.normal(0, 0.3, levels)[g] + rng.normal(0, 0.1, n))
+        model = LpRegressor([BSpline("x", knots=6), Factor("g")])
+        model.fit(X, y, summary=False, engine="suffstat")
+        ref = LpRegressor([BSpline("x", knots=6), Factor("g")])
+        ref.fit(X, y, summary=False, engine="qp")
+
+        assert model.status["status"] == "optimal"
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-3)
+        # the Gram matrix stays sparse: far below the 800 MB of a dense one
+        stats = [e for e in model.fit_report.stages if e["stage"] == "build_statistics"]
+        assert stats[0]["size"] < 10 * 1024 ** 2
+
+    def test_memory_guard(self, data):
+        X, y = data
+        plan = _model().plan(X)
+        budget = (plan["memory_cvxpy"].sum() + plan["memory_suffstat"].sum()) / 2
+
+        model = _model()
+        model.fit(X, y, summary=False, max_memory=budget)
+        # cvxpy exceeds the budget, qp is the next engine in order and fits
+        assert model._engine == "qp"
+
+        with pytest.raises(MemoryError, match="bspline"):
+            _model().fit(X, y, summary=False, engine="cvxpy", max_memory=budget)
+        with pytest.raises(MemoryError, match="Estimated peak memory"):
+            _model().fit(X, y, summary=False, max_memory=1)
@@ -0,0 +1,91 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.spline import BSpline, CyclicSpline, Factor, Linear, PiecewiseLinear
+from lpspline.constraints import Bound, Monotonic
+from lpspline.optimizer.precondition import precondition
+
+
+@pytest.fixture
+def timestamps():
+    rng = np.random.default_rng(1)
+    n = 3000
+    t = 1.7e9 + rng.uniform(0, 3e7, n)
+    h = rng.uniform(0, 24, n)
+    y = (t - 1.7e9) / 1e7 + np.sin(2 * np.pi * h / 24) + rng.normal(0, 0.1, n)
+    return pl.DataFrame({"t": t, "h": h}), pl.Series("y", y)
+
+
+class TestPrecondition:
+    def test_centered_and_scaled_columns(self):
+        rng = np.random.default_rng(0)
+        x = rng.uniform(1e6, 2e6, 200)
+        s = Linear("x")
+        s.init_spline(x)
+        D = s._build_design(x)
+        pre = precondition([s], [D])
+
+        Z = (D @ pre.M).toarray()
+        assert np.allclose(Z[:, 0], 1.0)
+        assert np.isclose(Z[:, 1].mean(), 0.0, atol=1e-8)
+        assert np.isclose(np.sqrt(np.mean(Z[:, 1] ** 2)), 1.0)
+        assert pre.scalings["shift"].to_list()[1] == pytest.approx(x.mean())
+        assert pre.scalings["tag"].to_list() == ["linear", "linear"]
+
+    def test_timestamp_feature_converges(self, timestamps):
+        X, y = timestamps
+        splines = lambda: [PiecewiseLinear("t", knots=5).add_constraint(Monotonic()), CyclicSpline("h", order=2, period=24)]
+        ref = LpRegressor(splines())
+        ref.fit(X, y, summary=False, engine="cvxpy", solver="CLARABEL")
+        model = LpRegressor(splines())
+        model.fit(X, y, summary=False, engine="qp", solver="CLARABEL")
+
+        assert model._status == "optimal"
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-5)
+        assert model.preconditioning.filter(pl.col("tag") == "pwl")["scale"].max() > 1e5
+
+    def test_default_engine(self, timestamps):
+        X, y = timestamps
+        model = LpRegressor([PiecewiseLinear("t", knots=5).add_constraint(Monotonic()), CyclicSpline("h", order=2, period=24)])
+        model.fit(X, y, summary=False)
+
+        assert model._engine == "cvxpy" and model.problem is not None
+        assert model.status["status"] == "optimal"
+        assert model.preconditioning is not None
+
+    @pytest.mark.parametrize("engine", ["cvxpy", "suffstat"])
+    def test_cvxpy_engines(self, timestamps, engine):
+        X, y = timestamps
+        splines = lambda: [PiecewiseLinear("t", knots=5).add_constraint(Monotonic()), CyclicSpline("h", order=2, period=24)]
+        ref = LpRegressor(splines())
+        ref.fit(X, y, summary=False, engine="qp", solver="CLARABEL")
+        model = LpRegressor(splines())
+        model.fit(X, y, summary=False, engine=engine, solver="CLARABEL")
+
+        assert model._status == "optimal"
+        assert "precondition" in [s["stage"] for s in model.fit_report.stages]
+        assert model.preconditioning.equals(ref.preconditioning)
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-5)
+
+        model.fit(X, y, summary=False, engine=engine, solver="CLARABEL", precondition=False)
+        assert model.preconditioning is None
+        assert all(s._coef_map is None for s in model.splines)
+
+    @pytest.mark.parametrize("identifiable", [False, True])
+    def test_same_solution(self, identifiable):
+        rng = np.random.default_rng(2)
+        n = 400
+        X = pl.DataFrame({"x": rng.uniform(0, 10, n), "g": rng.integers(0, 3, n)})
+        y = pl.Series("y", np.sqrt(X["x"].to_numpy()) + 0.3 * X["g"].to_numpy() + rng.normal(0, 0.1, n))
+        splines = lambda: [BSpline("x", knots=6).add_constraint(Monotonic()), Factor("g"),
+                           PiecewiseLinear("x", knots=3, tag="p").add_constraint(Bound(lower=-1.0))]
+
+        plain = LpRegressor(splines(), identifiable=identifiable)
+        plain.fit(X, y, summary=False, engine="qp", solver="CLARABEL", precondition=False)
+        model = LpRegressor(splines(), identifiable=identifiable)
+        model.fit(X, y, summary=False, engine="qp", solver="CLARABEL")
+
+        assert plain.preconditioning is None
+        assert "precondition" in [s["stage"] for s in model.fit_report.stages]
+        assert np.allclose(model.predict(X), plain.predict(X), atol=1e-5)
@@ -0,0 +1,64 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, Factor
+from lpspline.constraints import Anchor, Bound, Concave, Convex, Monotonic
+from lpspline.penalties import Lasso, Ridge
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(3)
+    n = 400
+    x = rng.uniform(0, 10, n)
+    h = rng.uniform(0, 24, n)
+    g = rng.integers(0, 3, n)
+    y = np.log1p(x) + np.sin(2 * np.pi * h / 24) + 0.5 * g + rng.normal(0, 0.1, n)
+    return pl.DataFrame({"x": x, "h": h, "g": g}), pl.Series("y", y)
+
+
+MODELS = [
+    lambda: [BSpline("x", knots=8).add_constraint(Monotonic(), Concave()), CyclicSpline("h", order=3, period=24)],
+    lambda: [PiecewiseLinear("x", knots=5, by="g").add_constraint(Monotonic(), Bound(upper=4.0)), Factor("g")],
+    lambda: [Linear("x", by="g").add_penalty(Ridge(0.5)), BSpline("h", knots=6, degree=2).add_penalty(Lasso(0.2))],
+    lambda: [PiecewiseLinear("x", knots=4).add_constraint(Convex(start=2, end=8), Anchor((5.0, 2.0))),
+             CyclicSpline("h", order=2, period=24, by="g").add_penalty(Lasso(0.1, weights=[0, 1, 1, 1, 1]))],
+]
+
+
+class TestQPEngine:
+    @pytest.mark.parametrize("make_splines", MODELS)
+    def test_matches_cvxpy(self, data, make_splines):
+        X, y = data
+        ref = LpRegressor(make_splines())
+        ref.fit(X, y, summary=False, engine="cvxpy")
+        model = LpRegressor(make_splines())
+        model.fit(X, y, summary=False, engine="qp")
+
+        assert model._status == "optimal"
+        assert model.problem is None
+        assert np.allclose(model.predict(X), ref.predict(X), atol=1e-2)
+        for s_ref, s in zip(ref.splines, model.splines):
+            assert s.coefficients.shape == s_ref.coefficients.shape
+
+    def test_warm_start(self, data):
+        X, y = data
+        model = LpRegressor([BSpline("x", knots=8).add_constraint(Monotonic())])
+        model.fit(X, y, summary=False, engine="qp")
+        assert model.fit_report.solver["warm_start"] is False
+        cold_iters = model.fit_report.solver["num_iters"]
+        model.fit(X, y, summary=False, engine="qp")
+        assert model.fit_report.solver["warm_start"] is True
+        assert model.fit_report.solver["num_iters"] <= cold_iters
+
+    def test_quiet_without_verbose(self, data, capfd):
+        X, y = data
+        LpRegressor([BSpline("x", knots=8)]).fit(X, y, summary=False, engine="qp")
+        assert capfd.readouterr().out == ""
+
+    def test_infeasible_status(self, data):
+        X, y = data
+        model = LpRegressor([Linear("x").add_constraint(Anchor((0.0, 1.0)), Anchor((0.0, 2.0)))])
+        model.fit(X, y, summary=False, engine="qp")
+        assert model._status.startswith("infeasible")
@@ -0,0 +1,72 @@
+import numpy as np
+import polars as pl
+import pytest
+from lpspline import LpRegressor
+from lpspline.spline import BSpline, CyclicSpline, Linear
+from lpspline.constraints import Monotonic
+from lpspline.penalties import Lasso, Ridge
+from lpspline.optimizer.solver import problem_class, select_solver, solver_options, PRECISION_PRESETS
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(5)
+    n = 300
+    x = rng.uniform(0, 10, n)
+    h = rng.uniform(0, 24, n)
+    y = np.log1p(x) + np.sin(2 * np.pi * h / 24) + rng.normal(0, 0.1, n)
+    return pl.DataFrame({"x": x, "h": h}), pl.Series("y", y)
+
+
+def make_splines():
+    return [BSpline("x", knots=8).add_constraint(Monotonic()), CyclicSpline("h", order=2, period=24)]
+
+
+class TestSolverSelection:
+    def test_problem_class(self):
+        assert problem_class([Linear("x")]) == "QP"
+        assert problem_class([Linear("x").add_penalty(Lasso(0.1))], quadratic_loss=False) == "LP"
+        assert problem_class([Linear("x").add_penalty(Ridge(0.1))], quadratic_loss=False) == "QP"
+
+    def test_select_solver(self):
+        assert select_solver("QP") == "OSQP"
+        assert select_solver("QP", precision="accurate") == "CLARABEL"
+        assert select_solver("LP") == "CLARABEL"
+
+    def test_solver_options(self):
+        assert solver_options("OSQP") == {}
+        assert solver_options("OSQP", "fast") == PRECISION_PRESETS["OSQP"]["fast"]
+        opts = solver_options("osqp", "fast", {"eps_abs": 1e-6, "verbose": False})
+        assert opts["eps_abs"] == 1e-6 and opts["eps_rel"] == 1e-3 and opts["verbose"] is False
+        with pytest.raises(ValueError):
+            solver_options("OSQP", "ultra")
+
+
+class TestFitSolver:
+    @pytest.mark.parametrize("engine", ["cvxpy", "qp"])
+    @pytest.mark.parametrize("solver,precision", [(None, "fast"), ("CLARABEL", None), (None, "accurate")])
+    def test_fit_matches_default(self, data, engine, solver, precision):
+        X, y = data
+        ref = LpRegressor(make_splines())
+        ref.fit(X, y, summary=False, engine="cvxpy")
+        model = LpRegressor(make_splines())
+        model.fit(X, y, summary=False, engine=engine, solver=solver, precision=precision)
+
+        expected = solver or select_solver("QP", precision=precision)
+        assert model.solver == expected
+        assert model.fit_report.solver["solver_name"] == expected
+        assert model.fit_report.solver["precision"] == precision
+        assert np.allclose(model.predict(X), ref.predict(X), atol=5e-2)
+
+    def test_solver_opts_passthrough(self, data):
+        X, y = data
+        model = LpRegressor(make_splines())
+        model.fit(X, y, summary=False, engine="qp", solver_opts={"max_iter": 5})
+        assert model.fit_report.solver["num_iters"] <= 5
+
+    def test_unsupported_solver(self, data):
+        X, y = data
+        with pytest.raises(ValueError):
+            LpRegressor(make_splines()).fit(X, y, summary=False, engine="qp", solver="SCS")
+        with pytest.raises(ValueError):
+            LpRegressor(make_splines()).fit(X, y, summary=False, engine="cvxpy", solver="NOT_A_SOLVER")
@@ -2,8 +2,15 @@
 import pytest
 import numpy as np
 import cvxpy as cp
-from lpspline.spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, Factor
+import polars as pl
+import scipy.sparse as sp
+from lpspline.spline import Linear, PiecewiseLinear, BSpline, CyclicSpline, Factor, TensorSpline, StepSpline, CrossedFactor
+from lpspline.spline import tensor
+from lpspline.spline.factor import hash_bucket
+from lpspline.spline.tensor import row_kronecker
 from lpspline import LpRegressor
+from lpspline.constraints import Monotonic
+from lpspline.penalties import Fused, Smooth
 
 class TestSplines:
     
@@ -53,6 +60,76 @@ class TestSplines:
         vars = spline._build_variables()
         assert vars.shape == (3,)
 
+    def test_piecewise_linear_hat_basis(self):
+        spline = PiecewiseLinear(term="x", knots=[1.0, 3.0], basis="hat")
+        x = np.array([0.0, 0.5, 1.0, 2.0, 4.0, 5.0])
+        spline.init_spline(x)
+        assert np.allclose(spline.basis_knots, [0.0, 1.0, 3.0, 5.0])
+        assert np.allclose(spline.knots, [1.0, 3.0])
+        assert spline.n_basis == 4
+
+        basis = spline._build_basis(x)
+        assert basis.shape == (6, 4)
+        assert np.all(np.diff(basis.indptr) == 2)
+        assert np.allclose(basis.toarray()[[1, 3, 4]], [[0.5, 0.5, 0, 0], [0, 0.5, 0.5, 0], [0, 0, 0.5, 0.5]])
+        assert np.allclose(basis.sum(axis=1), 1.0)
+
+        # coefficients are knot values and convert back to intercept, slope and hinges
+        spline._coefficients = np.array([0.0, 1.0, 2.0, 5.0])
+        grid = np.linspace(-1, 6, 15)
+        truncated = PiecewiseLinear(term="x", knots=spline.basis_knots)
+        truncated.init_spline(x)
+        truncated._coefficients = spline.truncated_coefficients()
+        assert np.allclose(truncated.eval(grid), spline.eval(grid))
+
+        with pytest.raises(ValueError):
+            PiecewiseLinear(term="x", knots=3, basis="cubic")
+
+    def test_piecewise_linear_hat_refit_keeps_knots(self):
+        spline = PiecewiseLinear(term="x", knots=[1.0, 3.0], basis="hat")
+        for x in (np.array([0.0, 5.0]), np.array([-2.0, 2.0, 8.0]), np.array([0.5, 4.0])):
+            spline.init_spline(x)
+            assert np.allclose(spline.knots, [1.0, 3.0])
+            assert np.allclose(spline.basis_knots, [x.min(), 1.0, 3.0, x.max()])
+            assert spline.n_basis == 4
+
+    def test_fourier_basis_recurrence(self):
+        from lpspline.spline.cyclic_spline import fourier_basis
+        x = np.random.default_rng(0).uniform(-50, 50, 500)
+        basis = fourier_basis(x, period=7.0, order=25)
+        k = np.arange(1, 26)
+        theta = 2 * np.pi * np.outer(x, k) / 7.0
+        assert np.allclose(basis[:, 0], 1.0)
+        assert np.allclose(basis[:, 1::2], np.sin(theta), atol=1e-10)
+        assert np.allclose(basis[:, 2::2], np.cos(theta), atol=1e-10)
+        assert basis.flags.f_contiguous
+
+        single = fourier_basis(x, period=7.0, order=25, dtype=np.float32, layout="C")
+        assert single.dtype == np.float32 and single.flags.c_contiguous
+        assert np.allclose(single, basis, atol=1e-5)
+
+        out = np.empty((500, 51))
+        assert fourier_basis(x, period=7.0, order=25, out=out) is out
+
+        spline = CyclicSpline(term="h", period=7.0, order=25)
+        assert np.array_equal(spline._build_basis(x), basis)
+
+    def test_periodic_bspline_basis(self):
+        spline = CyclicSpline(term="h", period=24, basis="bspline", knots=12, degree=3)
+        x = np.linspace(-24, 48, 301)
+        basis = spline._build_basis(x)
+        assert basis.shape == (301, 12)
+        assert np.all(np.diff(basis.indptr) == 4)
+        assert np.allclose(basis.sum(axis=1), 1.0)
+        # the basis wraps modulo the period
+        assert np.allclose(spline._build_basis(x + 24).toarray(), basis.toarray())
+        assert np.allclose(basis[::25].toarray()[0, [9, 10, 11, 0]], [1 / 6, 2 / 3, 1 / 6, 0])
+
+        with pytest.raises(ValueError):
+            CyclicSpline(term="h", period=24, basis="bspline")
+        with pytest.raises(ValueError):
+            CyclicSpline(term="h", period=24, basis="bspline", knots=12).add_constraint(Monotonic())
+
     def test_bspline(self):
         # Knots: 0, 1, 2, 3, 4. Degree 1 (linear B-splines)
         knots = [0, 1, 2, 3, 4]
@@ -100,7 +177,8 @@ class TestSplines:
             [0, 0, 1],
             [1, 0, 0]
         ])
-        assert np.allclose(basis, expected)
+        assert sp.issparse(basis)
+        assert np.allclose(basis.toarray(), expected)
         
         vars = spline._build_variables()
         assert vars.shape == (3,)
@@ -112,3 +190,292 @@ class TestSplines:
         assert "LpRegressor(splines=[" in repr(opt)
         assert "Linear(term='a'" in repr(opt)
         assert "Factor(term='b'" in repr(opt)
+
+class TestTensorSpline:
+    @pytest.fixture
+    def data(self):
+        rng = np.random.default_rng(0)
+        n = 2000
+        t = rng.uniform(-5, 30, n)
+        h = rng.uniform(0, 24, n)
+        y = 0.1 * t * (1 + np.sin(2 * np.pi * h / 24)) + rng.normal(0, 0.1, n)
+        return pl.DataFrame({"t": t, "h": h}), pl.Series("y", y)
+
+    def test_row_kronecker(self):
+        A = sp.random(50, 4, density=0.5, format='csr', random_state=1)
+        B = sp.random(50, 3, density=0.6, format='csr', random_state=2)
+        expected = np.stack([np.kron(A[i].toarray().ravel(), B[i].toarray().ravel()) for i in range(50)])
+        assert np.allclose(row_kronecker(A, B).toarray(), expected)
+
+    def test_sparse_basis(self, data):
+        X, _ = data
+        s = TensorSpline(BSpline("t", knots=8), CyclicSpline("h", period=24, basis="bspline", knots=12))
+        s.init_spline(X[s.term].to_numpy())
+        basis = s._build_basis(X[s.term].to_numpy())
+        assert sp.issparse(basis)
+        assert basis.shape == (len(X), 10 * 12)
+        assert basis.getnnz(axis=1).max() == 16
+        assert np.allclose(basis.sum(axis=1), 1.0)
+
+    @pytest.mark.parametrize("engine", ["cvxpy", "qp"])
+    def test_fit_monotonic_axis(self, data, engine):
+        X, y = data
+        s = TensorSpline(BSpline("t", knots=8), CyclicSpline("h", period=24, basis="bspline", knots=12), tag="th")
+        s.add_constraint(Monotonic(axis=0)).add_penalty(Smooth(0.1))
+        model = LpRegressor(s)
+        model.fit(X, y, summary=False, engine=engine)
+        assert np.sqrt(np.mean((model.predict(X) - y.to_numpy()) ** 2)) < 0.15
+        assert model._summary_data[0]["Term"] == "t x h"
+
+        t_grid = np.linspace(-5, 30, 50)
+        for h in (3.0, 18.0):
+            values = s.eval(np.column_stack([t_grid, np.full(50, h)]))
+            assert np.all(np.diff(values) >= -1e-6)
+
+    def test_chunked_eval(self, data, monkeypatch):
+        X, y = data
+        s = TensorSpline(PiecewiseLinear("t", knots=5, basis="hat"), BSpline("h", knots=6))
+        model = LpRegressor(s)
+        model.fit(X, y, summary=False)
+        expected = s.eval(X[s.term].to_numpy())
+        monkeypatch.setattr(tensor, "EVAL_CHUNK", 300)
+        assert np.allclose(s.eval(X[s.term].to_numpy()), expected)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            TensorSpline(Linear("t"), BSpline("h", knots=5))
+        with pytest.raises(ValueError):
+            TensorSpline(BSpline("t", knots=5).add_constraint(Monotonic()), BSpline("h", knots=5))
+        s = TensorSpline(BSpline("t", knots=5), CyclicSpline("h", order=2, period=24))
+        with pytest.raises(ValueError):
+            s.add_constraint(Monotonic())
+        with pytest.raises(ValueError):
+            s.add_constraint(Monotonic(axis=1))
+        s.add_constraint(Monotonic(axis=0))
+        s.init_spline(np.column_stack([np.linspace(0, 1, 20), np.linspace(0, 24, 20)]))
+        with pytest.raises(ValueError):
+            s.constraints[0].build_matrix(s)
+
+
+class TestStepSpline:
+    @pytest.fixture
+    def data(self):
+        rng = np.random.default_rng(3)
+        x = rng.uniform(0, 10, 3000)
+        y = np.floor(x / 2) + rng.normal(0, 0.3, len(x))
+        return pl.DataFrame({"x": x}), pl.Series("y", y)
+
+    def test_indicator_basis(self, data):
+        X, _ = data
+        x = X["x"].to_numpy()
+        s = StepSpline("x", bins=8)
+        s.init_spline(x)
+        basis = s._build_basis(np.array([-1.0, 5.0, 11.0]))
+        assert sp.issparse(basis) and basis.nnz == 3
+        assert basis.indices.tolist() == [0, s.bin_index(np.array([5.0]))[0], 7]
+        counts = np.bincount(s.bin_index(x), minlength=8)
+        assert counts.min() >= 0.9 * len(x) / 8
+
+        u = StepSpline("x", bins=5, binning="uniform")
+        u.init_spline(x)
+        assert np.allclose(np.diff(u.edges), np.diff(u.edges)[0])
+        with pytest.raises(ValueError):
+            StepSpline("x", binning="kmeans")
+
+    def test_fit_gather_and_monotonic(self, data):
+        X, y = data
+        s = StepSpline("x", bins=np.arange(0, 11, 2.0)).add_constraint(Monotonic()).add_penalty(Fused(1.0))
+        model = LpRegressor(s)
+        model.fit(X, y, summary=False, engine="qp")
+        values = s.coefficients
+        assert np.all(np.diff(values) >= -1e-6)
+        assert np.allclose(values, np.arange(5), atol=0.1)
+        assert np.allclose(model.predict(X), s._build_basis(X["x"].to_numpy()) @ values)
+
+    def test_by_gather(self):
+        x = np.tile(np.linspace(0, 1, 50), 2)
+        g = np.repeat([0, 1], 50)
+        s = StepSpline("x", bins=4, by="g")
+        model = LpRegressor(s)
+        X = pl.DataFrame({"x": x, "g": g})
+        model.fit(X, pl.Series("y", g * 2.0 + x), summary=False)
+        expected = np.asarray(s._build_design(x, by=g) @ np.ravel(s.coefficients, order='F')).ravel()
+        assert np.allclose(model.predict(X), expected)
+        assert np.allclose(s.eval(x[:3], by=np.array([5, 5, 5])), 0.0)
+
+
+class TestHighCardinalityFactor:
+    def test_min_count_pools_rare_classes(self):
+        x = np.array(["a"] * 5 + ["b"] * 4 + ["c", "d"])
+        s = Factor("id", min_count=3)
+        s.init_spline(x)
+        assert s.n_basis == 3
+        assert s.levels == ["a", "b", "other"]
+        assert s.encode(np.array(["a", "b", "c", "zzz"])).tolist() == [0, 1, 2, 2]
+        assert repr(s) == "Factor(term='id', n_classes=2, min_count=3)"
+
+    def test_hash_buckets(self):
+        rng = np.random.default_rng(0)
+        ids = rng.integers(0, 100_000, 50_000)
+        s = Factor("id", hash_buckets=64, min_count=20)
+        s.init_spline(ids)
+        basis = s._build_basis(ids)
+        assert sp.issparse(basis) and basis.shape == (len(ids), 64) and basis.nnz == len(ids)
+        # deterministic, and unseen classes share the buckets of the long tail
+        assert np.array_equal(s.encode(ids), s.encode(ids.copy()))
+        assert np.array_equal(hash_bucket(np.array(["x", "y"]), 7), hash_bucket(np.array(["x", "y"]), 7))
+        assert np.all(s.encode(np.array([10 ** 9, 10 ** 9 + 1])) < 64)
+
+    def test_fit_and_predict(self):
+        rng = np.random.default_rng(1)
+        g = rng.integers(0, 5, 2000)
+        y = g * 1.0 + rng.normal(0, 0.05, len(g))
+        X = pl.DataFrame({"g": g})
+        s = Factor("g", hash_buckets=3, min_count=100)
+        model = LpRegressor(s)
+        model.fit(X, pl.Series("y", y), summary=False)
+        assert np.allclose(s.coefficients[:5], np.arange(5), atol=0.05)
+        pred = model.predict(pl.DataFrame({"g": np.array([0, 4, 99])}))
+        assert np.allclose(pred[:2], [0.0, 4.0], atol=0.05)
+        assert pred[2] == s.coefficients[5 + hash_bucket(np.array([99]), 3)[0]]
+
+
+class TestCrossedFactor:
+    @pytest.fixture
+    def data(self):
+        rng = np.random.default_rng(5)
+        n = 4000
+        store = rng.choice(["s1", "s2", "s3", "s4"], n)
+        weekday = rng.integers(0, 7, n)
+        keep = ~((store == "s4") & (weekday == 6))  # one combination never observed
+        store, weekday = store[keep], weekday[keep]
+        effect = {"s1": 0.0, "s2": 1.0, "s3": 2.0, "s4": 3.0}
+        y = np.array([effect[s] for s in store]) + 0.5 * weekday + np.where((store == "s2") & (weekday == 3), 2.0, 0.0)
+        y = y + rng.normal(0, 0.05, len(y))
+        return pl.DataFrame({"store": store, "weekday": weekday}), pl.Series("y", y)
+
+    def test_observed_combinations(self, data):
+        X, _ = data
+        s = CrossedFactor(["store", "weekday"])
+        s.init_spline(X[s.term].to_numpy())
+        assert s.n_basis == 4 * 7 - 1
+        codes = s.encode(np.array([["s1", 0], ["s4", 6], ["s9", 0]], dtype=object))
+        assert codes.shape == (3, 1)
+        assert codes[0, 0] >= 0 and codes[1, 0] == -1 and codes[2, 0] == -1
+        basis = s._build_basis(X[s.term].to_numpy())
+        assert sp.issparse(basis) and basis.nnz == len(X)
+        with pytest.raises(ValueError):
+            CrossedFactor(["store"])
+
+    @pytest.mark.parametrize("engine", ["cvxpy", "qp"])
+    def test_fit_with_shrinkage(self, data, engine):
+        X, y = data
+        s = CrossedFactor(["store", "weekday"], shrinkage=1.0)
+        model = LpRegressor(s)
+        model.fit(X, y, summary=False, engine=engine)
+        assert s.n_main == 4 + 7
+        assert s._basis_nnz_per_row() == 3
+        assert np.sqrt(np.mean((model.predict(X) - y.to_numpy()) ** 2)) < 0.1
+
+        # the unseen combination falls back on its main effects
+        new = pl.DataFrame({"store": ["s4", "s1"], "weekday": [6, 6]})
+        pred = model.predict(new)
+        assert pred[0] - pred[1] == pytest.approx(3.0, abs=0.3)
+        assert np.allclose(s.eval(new.to_numpy()), s._build_basis(new.to_numpy()) @ s.coefficients)
+
+
+class TestDerivatives:
+    @staticmethod
+    def _dense(basis):
+        return basis.toarray() if sp.issparse(basis) else np.asarray(basis)
+
+    @pytest.mark.parametrize("spline", [
+        BSpline("x", knots=8, degree=3),
+        PiecewiseLinear("x", knots=5),
+        PiecewiseLinear("x", knots=5, basis="hat"),
+        CyclicSpline("x", order=3, period=10),
+        CyclicSpline("x", period=10, basis="bspline", knots=8),
+        Linear("x"),
+    ])
+    def test_derivative_basis_matches_finite_differences(self, spline):
+        rng = np.random.default_rng(0)
+        spline.init_spline(rng.uniform(0, 10, 200))
+        x = rng.uniform(-2, 12, 100)
+        h = 1e-5
+        for d in (1, 2):
+            analytic = self._dense(spline._evaluate_basis(x, d))
+            numeric = (self._dense(spline._evaluate_basis(x + h, d - 1)) - self._dense(spline._evaluate_basis(x - h, d - 1))) / (2 * h)
+            assert analytic.shape == (len(x), spline.n_basis)
+            assert np.allclose(analytic, numeric, atol=1e-4)
+
+    def test_predict_derivative(self):
+        rng = np.random.default_rng(1)
+        n = 500
+        X = pl.DataFrame({"a": rng.uniform(0, 10, n), "b": rng.uniform(0, 1, n), "g": rng.choice(["u", "v"], n)})
+        y = pl.Series("y", np.sin(X["a"].to_numpy()) + X["b"].to_numpy() ** 2)
+        model = LpRegressor([BSpline("a", knots=15, tag="a"), BSpline("b", knots=5, tag="b"), Factor("g")])
+        model.fit(X, y, summary=False)
+
+        grid = X.head(50)
+        a = grid["a"].to_numpy()
+        h = 1e-5
+        shifted = [model.predict(grid.with_columns(pl.Series("a", a + s * h))) for s in (1, -1)]
+        assert np.allclose(model.predict_derivative(grid, term="a"), (shifted[0] - shifted[1]) / (2 * h), atol=1e-4)
+        assert np.corrcoef(model.predict_derivative(grid, term="a"), np.cos(a))[0, 1] > 0.95
+        with pytest.raises(ValueError):
+            model.predict_derivative(grid, term="g")
+
+    def test_tensor_and_step_derivatives(self):
+        x = np.column_stack([np.linspace(0.1, 0.9, 20), np.linspace(0.2, 0.8, 20)])
+        s = TensorSpline(BSpline("a", knots=5), CyclicSpline("b", period=1, basis="bspline", knots=6))
+        s.init_spline(x)
+        s._coefficients = np.random.default_rng(2).normal(size=s.n_basis)
+        h = 1e-6
+        for axis in (0, 1):
+            step = np.zeros(2)
+            step[axis] = h
+            numeric = (s.eval(x + step) - s.eval(x - step)) / (2 * h)
+            assert np.allclose(s.eval(x, derivative=(1 - axis, axis)), numeric, atol=1e-4)
+        with pytest.raises(ValueError):
+            s.eval(x, derivative=1)
+
+        step = StepSpline("x", bins=4)
+        step.init_spline(np.linspace(0, 1, 100))
+        step._coefficients = np.arange(4.0)
+        assert np.all(step.eval(np.linspace(0, 1, 10), derivative=1) == 0)
+
+
+class TestPredictGrid:
+    @pytest.fixture
+    def model(self):
+        rng = np.random.default_rng(3)
+        n = 600
+        X = pl.DataFrame({
+            "temp": rng.uniform(0, 30, n),
+            "hour": rng.uniform(0, 24, n),
+            "store": rng.choice(["a", "b", "c"], n),
+        })
+        y = pl.Series("y", np.sin(X["temp"].to_numpy() / 5) + np.cos(X["hour"].to_numpy() / 4) + (X["store"] == "b").to_numpy())
+        model = LpRegressor([
+            BSpline("temp", knots=8, tag="temp"),
+            CyclicSpline("hour", order=2, period=24, by="store", tag="hour"),
+            Factor("store"),
+        ])
+        model.fit(X, y, summary=False)
+        return model
+
+    def test_grid_matches_predict(self, model):
+        axes = {"temp": np.linspace(0, 30, 7), "hour": np.arange(24.0), "store": np.array(["a", "b", "c"])}
+        grid = model.predict_grid(axes)
+        assert grid.shape == (7, 24, 3)
+
+        frame = model.predict_grid(axes, as_frame=True)
+        assert isinstance(frame, pl.LazyFrame)
+        frame = frame.collect()
+        assert frame.height == 7 * 24 * 3
+        assert np.allclose(frame["prediction"].to_numpy(), model.predict(frame.drop("prediction")))
+        assert np.allclose(grid.ravel(), frame["prediction"].to_numpy())
+
+    def test_missing_axis(self, model):
+        with pytest.raises(ValueError):
+            model.predict_grid({"temp": np.linspace(0, 30, 7), "hour": np.arange(24.0)})